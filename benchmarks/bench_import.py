@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+
+"""
+Measures what importing the plugin adds to hatch's startup time.
+
+Hatch imports `hatch_semver.plugin.hooks` whenever it loads its plugins,
+even for commands which never compute a version. The script runs
+`python -X importtime` in fresh interpreters, takes the cumulative import time
+of everything imported after `hatchling.plugin` (which hatch has loaded anyway)
+and reports the median.
+
+Run with `python benchmarks/bench_import.py [--budget-ms MS] [--runs N]`.
+Exits with status 1 if the median exceeds the budget.
+"""
+
+import re
+import subprocess
+import sys
+from argparse import ArgumentParser
+from statistics import median
+
+BASELINE_MODULE = "hatchling.plugin"
+PLUGIN_MODULE = "hatch_semver.plugin.hooks"
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (?P<indent> *)(\S+)$")
+
+
+def added_import_time(module: str = PLUGIN_MODULE) -> tuple[int, list[str]]:
+    """
+    Returns the cumulative import time in microseconds of *module*
+    and the names of the modules it imported.
+    """
+    completed = subprocess.run(
+        (sys.executable, "-X", "importtime", "-c", f"import {BASELINE_MODULE}; import {module}"),
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    lines = [match for match in map(LINE.match, completed.stderr.splitlines()) if match]
+    start = max(i for i, match in enumerate(lines) if match.group(4) == BASELINE_MODULE) + 1
+    # only top level imports, their cumulative time includes the nested ones
+    total = sum(int(match.group(2)) for match in lines[start:] if not match.group("indent"))
+    return total, [match.group(4) for match in lines[start:]]
+
+
+def main() -> int:
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--budget-ms", type=float, default=10.0)
+    parser.add_argument("--runs", type=int, default=15)
+    args = parser.parse_args()
+    samples = []
+    for _ in range(args.runs):
+        total, modules = added_import_time()
+        samples.append(total)
+    result = median(samples) / 1000
+    print(f"modules imported by the plugin: {', '.join(modules)}")
+    print(f"median added import time: {result:.2f} ms (budget {args.budget_ms:.2f} ms)")
+    if result > args.budget_ms:
+        print("budget exceeded")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
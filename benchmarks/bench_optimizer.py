@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+
+"""
+Measures how `hatch_semver.optimizer.optimize` scales with the length of the chain
+and how much the optimized plans save on execution.
+
+Run with `python benchmarks/bench_optimizer.py`. The time per step should stay
+roughly constant as the chain grows, i.e. the cost is linear.
+"""
+
+import random
+from timeit import timeit
+
+from semver import Version
+
+from hatch_semver.bump_instruction import BumpInstruction
+from hatch_semver.bump_plan import BumpPlan
+from hatch_semver.optimizer import optimize
+
+VOCABULARY = ("major", "minor", "patch", "rc", "build", "dev", "release", "1.2.3")
+LENGTHS = (1250, 2500, 5000, 10000)
+REPEATS = 5
+
+
+def chain(length: int) -> str:
+    rng = random.Random(length)
+    return ",".join(rng.choices(VOCABULARY, k=length))
+
+
+def main() -> None:
+    original = Version.parse("1.0.0")
+    print(f"{'steps':>8} {'optimize [ms]':>14} {'per step [us]':>14} {'kept':>6}", end="")
+    print(f" {'execute [ms]':>13} {'optimized [ms]':>15}")
+    for length in LENGTHS:
+        instructions = chain(length)
+        steps = tuple(BumpInstruction(instruction) for instruction in instructions.split(","))
+        optimize_time = timeit(lambda: optimize(steps), number=REPEATS) / REPEATS
+        plain = BumpPlan.compile(instructions, optimize=False)
+        optimized = BumpPlan.compile(instructions)
+        plain_time = timeit(lambda: plain.execute(original), number=REPEATS) / REPEATS
+        optimized_time = timeit(lambda: optimized.execute(original), number=REPEATS) / REPEATS
+        print(
+            f"{length:>8} {optimize_time * 1e3:>14.3f} {optimize_time / length * 1e6:>14.3f}",
+            f"{len(optimized.steps):>6} {plain_time * 1e3:>13.3f} {optimized_time * 1e3:>15.3f}",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+
+"""
+Measures how the throughput of `SemverScheme.update` and `SemverScheme.validate_bump`
+scales with the number of threads sharing one scheme.
+
+Run with `python benchmarks/bench_threads.py [--threads 1,2,4,8] [--calls N]`.
+On a free-threaded build (e.g. `python3.13t`) the speedup should grow nearly linearly
+up to the number of CPUs, because cache hits take no lock. With the GIL, the threads
+take turns and the speedup stays around 1.
+"""
+
+import os
+import sys
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+from time import perf_counter
+from typing import Callable
+
+from semver import Version
+
+from hatch_semver.semver_scheme import SemverScheme
+
+BUMPS = (
+    ("minor,rc", "1.2.3"),
+    ("patch", "1.3.0-rc.1"),
+    ("major,alpha,build=ci", "0.9.9"),
+    ("rc", "2.0.0-alpha.1+ci.1"),
+    ("release", "1.3.0-rc.1"),
+)
+SUCCESSORS = (("1.2.4", "1.2.3"), ("1.3.0-rc.2", "1.3.0-rc.1"), ("2.0.0", "1.9.9"))
+
+
+def workloads(scheme: SemverScheme) -> dict[str, Callable[[int], None]]:
+    pairs = [(Version.parse(new), Version.parse(old)) for new, old in SUCCESSORS]
+
+    def update(calls: int) -> None:
+        for i in range(calls):
+            scheme.update(*BUMPS[i % len(BUMPS)], {})
+
+    def validate(calls: int) -> None:
+        for i in range(calls):
+            new, old = pairs[i % len(pairs)]
+            scheme.validate_bump(new, old, bumped_build=False)
+
+    return {"update": update, "validate_bump": validate}
+
+
+def throughput(work: Callable[[int], None], threads: int, calls: int) -> float:
+    """
+    Returns the calls per second of *threads* threads, each making *calls* calls.
+    """
+    barrier = Barrier(threads + 1)
+
+    def run() -> None:
+        barrier.wait()
+        work(calls)
+
+    with ThreadPoolExecutor(threads) as executor:
+        futures = [executor.submit(run) for _ in range(threads)]
+        barrier.wait()
+        start = perf_counter()
+        for future in futures:
+            future.result()
+        elapsed = perf_counter() - start
+    return threads * calls / elapsed
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", default="1,2,4,8", help="comma separated thread counts")
+    parser.add_argument("--calls", type=int, default=20_000, help="calls per thread")
+    args = parser.parse_args()
+    counts = [int(count) for count in args.threads.split(",")]
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    version = sys.version.split()[0]
+    print(f"Python {version}, GIL {'enabled' if gil else 'disabled'}, {os.cpu_count()} CPUs")
+    scheme = SemverScheme(".", {"policy": {"forbid-skipping": True}})
+    print(f"{'workload':<14} {'threads':>7} {'calls/s':>12} {'speedup':>8}")
+    for name, work in workloads(scheme).items():
+        work(1000)  # warm the caches
+        single = None
+        for threads in counts:
+            rate = throughput(work, threads, args.calls)
+            single = single or rate
+            print(f"{name:<14} {threads:>7} {rate:>12,.0f} {rate / single:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+#!/usr/bin/env python
+
+"""
+Benchmark suite of hatch-semver.
+
+Measures `BumpInstruction` parsing, `SemverScheme.update` on representative and
+pathological chains with both engines and with tracing, cached version parsing,
+range matching (also on a batch of a million versions if NumPy is installed),
+`SemverScheme.validate_bump` with both comparators, a cascade through a large
+dependency graph, a release history audit, the columnar engine on a batch of
+100 000 versions (if NumPy is installed) and hatchling's `standard` scheme for comparison.
+
+Usage:
+
+- `python benchmarks/suite.py run [--output results.json] [--filter TEXT]`
+  runs the benchmarks and writes the results as JSON. With `--filter` only the benchmarks
+  whose name contains *TEXT* run, and only their fixtures are built.
+- `python benchmarks/suite.py compare baseline.json results.json [--threshold 1.1]`
+  flags every benchmark which got slower than *threshold* times its baseline
+  and exits with status 1 if there is any.
+"""
+
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+from argparse import ArgumentParser
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from tempfile import TemporaryDirectory, gettempdir
+from timeit import Timer
+from typing import Callable, Iterator
+
+import semver
+from hatchling.version.scheme.standard import StandardScheme
+from semver import Version
+
+import hatch_semver
+from hatch_semver.bump_instruction import BumpInstruction
+from hatch_semver.bump_plan import BumpPlan, plan_cache
+from hatch_semver.cascade import Node, plan_cascade
+from hatch_semver.commits import infer as infer_commits
+from hatch_semver.fragments import infer
+from hatch_semver.history import check_history
+from hatch_semver.ledger import ReleaseLedger
+from hatch_semver.lockfiles import audit, parse_pin
+from hatch_semver.parse_cache import VersionCache
+from hatch_semver.pep440 import cache_clear, from_pep440, to_pep440
+from hatch_semver.precedence import precedence_key
+from hatch_semver.ranges import Range
+from hatch_semver.semver_scheme import SemverScheme
+
+ROOT = gettempdir()
+
+INSTRUCTIONS = (
+    "major",
+    "minor",
+    "patch",
+    "fix",
+    "micro",
+    "release",
+    "pre",
+    "prerelease",
+    "pre-release",
+    "rc",
+    "rc=preview",
+    "alpha",
+    "beta",
+    "build",
+    "build=nightly",
+    "dev",
+    "1.2.3-rc.4+build.5",
+)
+
+CHAINS = {
+    "minor": ("minor", "1.2.3"),
+    "minor,rc": ("minor,rc", "1.2.3"),
+    "patch,build=dev": ("patch,build=dev", "1.2.3"),
+    "release": ("release", "1.2.3-rc.4"),
+    "specific": ("2.0.0", "1.2.3"),
+    "long-chain": (",".join(("minor", "rc", "rc", "build", "patch") * 200), "1.2.3"),
+    "big-prerelease-counter": ("rc", "1.2.3-rc." + "9" * 60),
+    "long-build-metadata": ("build", "1.2.3+" + ".".join(("meta",) * 200) + ".1"),
+}
+
+STANDARD_CHAINS = {
+    "minor": ("minor", "1.2.3"),
+    "minor,rc": ("minor,rc", "1.2.3"),
+    "release": ("release", "1.2.3rc4"),
+    "specific": ("2.0.0", "1.2.3"),
+}
+
+
+@dataclass
+class Result:
+    """
+    Timing of a single benchmark in microseconds per call.
+    """
+
+    name: str
+    best_us: float
+    mean_us: float
+    calls: int
+
+
+def measure(name: str, function: Callable[[], object], repeat: int = 5) -> Result:
+    timer = Timer(function)
+    calls, _ = timer.autorange()
+    times = [time / calls * 1e6 for time in timer.repeat(repeat=repeat, number=calls)]
+    return Result(name=name, best_us=min(times), mean_us=sum(times) / len(times), calls=calls)
+
+
+def benchmarks(scratch: str, name_filter: str = "") -> Iterator[tuple[str, Callable[[], object]]]:
+    """
+    Yields the name and function of every benchmark. The large fixtures are only built
+    if a benchmark using them contains *name_filter*, their files are written to *scratch*.
+    """
+
+    def selected(*names: str) -> bool:
+        return any(name_filter in name for name in names)
+
+    for instruction in INSTRUCTIONS:
+        yield f"bump-instruction/{instruction}", lambda i=instruction: BumpInstruction(i)
+    for engine in SemverScheme.ENGINES:
+        scheme = SemverScheme(ROOT, {"validate-bump": True, "engine": engine})
+        for name, (instructions, original) in CHAINS.items():
+            yield (
+                f"update/{engine}/{name}",
+                lambda s=scheme, i=instructions, o=original: s.update(i, o, {}),
+            )
+    scheme = SemverScheme(ROOT, {"validate-bump": True})
+    yield (
+        "update/reparse/minor,rc,build",
+        lambda: [
+            Version.parse(scheme.update(i, "1.2.3", {}))
+            for i in ("minor", "minor,rc", "minor,rc,build")
+        ],
+    )
+    yield (
+        "update/detailed/minor,rc,build",
+        lambda: scheme.update_detailed("minor,rc,build", "1.2.3").steps,
+    )
+    # with tracing off these must match update/semver/*, see hatch_semver.tracing
+    scheme = SemverScheme(ROOT, {"validate-bump": True, "trace": os.devnull})
+    for name, (instructions, original) in CHAINS.items():
+        yield (
+            f"update/traced/{name}",
+            lambda s=scheme, i=instructions, o=original: s.update(i, o, {}),
+        )
+    scheme = SemverScheme(ROOT, {})
+    for name, (instructions, original) in CHAINS.items():
+        yield (
+            f"update/uncached/{name}",
+            lambda i=instructions, o=original: (plan_cache.clear(), scheme.update(i, o, {})),
+        )
+    cache = VersionCache()
+    yield "parse/semver", lambda: Version.parse("1.2.3-rc.4+build.5")
+    yield "parse/cached", lambda: cache.parse("1.2.3-rc.4+build.5")
+    new, old = Version.parse("1.2.4"), Version.parse("1.2.3")
+    yield "validate-bump/gt", lambda: scheme.validate_bump(new, old, bumped_build=False)
+    new, old = Version.parse("1.2.3+build.2"), Version.parse("1.2.3+build.1")
+    yield "validate-bump/ge", lambda: scheme.validate_bump(new, old, bumped_build=True)
+    policy = {
+        "forbid-skipping": True,
+        "prerelease-tokens": ["alpha", "beta", "rc"],
+        "no-major-on-zero": True,
+        "release-before-major": True,
+    }
+    governed = SemverScheme(ROOT, {"policy": policy})
+    new, old = Version.parse("2.0.0-rc.1"), Version.parse("1.4.2")
+    yield "validate-bump/policy", lambda: governed.validate_bump(new, old, bumped_build=False)
+    if selected("cascade/2000-nodes"):
+        graph = {f"p{i}": Node("1.0.0", (f"p{i - 1}", f"p{i // 2}")) for i in range(1, 2000)}
+        graph["p0"] = Node("1.0.0")
+        yield "cascade/2000-nodes", lambda: plan_cascade(graph, {"p0": "major"})
+    if selected("history/100k"):
+        history = [f"{i // 1000}.{i % 1000}.0-rc.{i % 3}" for i in range(100_000)]
+        yield "history/100k", lambda: check_history(history)
+    if selected("ledger/100k/json-load", "ledger/100k/lookup", "ledger/100k/open-lookup"):
+        releases = [(f"project-{i % 100}", f"{i // 1000}.{i % 1000}.0") for i in range(100_000)]
+        directory = os.path.join(scratch, "ledger")
+        os.mkdir(directory)
+        with open(os.path.join(directory, "releases.json"), "w", encoding="utf-8") as file:
+            json.dump(releases, file)
+        ledger = ReleaseLedger(os.path.join(directory, "releases.ledger"))
+        ledger.add_many(releases)
+
+        def json_lookup() -> bool:
+            with open(os.path.join(directory, "releases.json"), encoding="utf-8") as file:
+                return ["project-7", "99.7.0"] in json.load(file)
+
+        yield "ledger/100k/json-load", json_lookup
+        yield "ledger/100k/lookup", lambda: ledger.released("project-7", "99.7.0")
+        path = ledger.path
+        yield "ledger/100k/open-lookup", lambda: ReleaseLedger(path).released("project-7", "9.7.0")
+    if selected("auto/5000-fragments"):
+        news = os.path.join(scratch, "fragments")
+        os.mkdir(news)
+        for i in range(5000):
+            with open(os.path.join(news, f"{i}.{('fixed', 'doc', 'feature')[i % 3]}.md"), "w"):
+                pass
+        yield "auto/5000-fragments", lambda: infer(news)
+    if shutil.which("git") and selected("auto/5000-commits", "auto/5000-commits-checkpoint"):
+        history = os.path.join(scratch, "commits")
+        subprocess.run(("git", "init", "-q", history), check=True)
+        commands = []
+        for i in range(5000):
+            message = f"{('fix', 'docs', 'chore')[i % 3]}: change {i}\n".encode()
+            commands += [
+                b"commit refs/heads/main",
+                f"committer Foo <foo@bar.baz> {i} +0000".encode(),
+                b"data %d" % len(message),
+                message,
+            ]
+        subprocess.run(
+            ("git", "-C", history, "fast-import", "--quiet"), input=b"\n".join(commands), check=True
+        )
+        subprocess.run(("git", "-C", history, "symbolic-ref", "HEAD", "refs/heads/main"), check=True)
+        yield "auto/5000-commits", lambda: infer_commits(history, use_checkpoint=False)
+        infer_commits(history)
+        yield "auto/5000-commits-checkpoint", lambda: infer_commits(history)
+    if selected("audit/100k"):
+        pinned = [f"package-{i}=={i % 7}.{i % 11}.{i % 13}" for i in range(100_000)]
+        upgraded = [f"package-{i}=={i % 7}.{i * 3 % 11}.{(i + 1) % 13}" for i in range(100_000)]
+        yield "audit/100k", lambda: (parse_pin.cache_clear(), audit(pinned, upgraded))
+    if selected("sort/10k/semver", "sort/10k/key"):
+        tagged = [Version.parse(f"{i % 5}.{i % 17}.{i % 31}-rc.{i % 3}") for i in range(10_000)]
+        yield "sort/10k/semver", lambda: sorted(tagged)
+        yield "sort/10k/key", lambda: sorted(tagged, key=precedence_key)
+    if selected("pep440/to/10k-cold", "pep440/from/10k-cold", "pep440/to/10k", "pep440/from/10k"):
+        semvers = [f"{i % 5}.{i % 17}.{i % 31}-rc.{i % 3}+build.{i % 7}" for i in range(10_000)]
+        pep440s = to_pep440(semvers)
+
+        def translate_cold(translate: Callable, versions: list[str]) -> Callable[[], list]:
+            def run() -> list:
+                cache_clear()
+                return translate(versions)
+
+            return run
+
+        yield "pep440/to/10k-cold", translate_cold(to_pep440, semvers)
+        yield "pep440/from/10k-cold", translate_cold(from_pep440, pep440s)
+        yield "pep440/to/10k", lambda: to_pep440(semvers)
+        yield "pep440/from/10k", lambda: from_pep440(pep440s)
+    expression = ">=2.0.0-rc.1 <3 || ^1.2"
+    compiled = Range.compile(expression)
+    key = precedence_key("2.4.1")
+    yield "range/compile", lambda: Range.compile(expression)
+    yield "range/match-string", lambda: compiled.match("2.4.1")
+    yield "range/match-key", lambda: compiled.match_key(key)
+    try:
+        from hatch_semver import columnar
+    except ImportError:
+        pass
+    else:
+        if selected("range/batch/1M"):
+            million = columnar.VersionBatch.from_strings(
+                [
+                    f"{i % 4}.{i % 13}.{i % 29}" + (f"-rc.{i % 5}" if i % 7 == 0 else "")
+                    for i in range(10**6)
+                ]
+            )
+            yield "range/batch/1M", lambda: compiled.match_batch(million)
+        names = ("minor,rc", "release")
+        if selected(*(f"columnar/100k{kind}/{name}" for kind in ("", "-scalar") for name in names)):
+            originals = [
+                f"{i % 7}.{i % 13}.{i % 29}" + (f"-rc.{i % 5}" if i % 3 else "")
+                for i in range(100_000)
+            ]
+            batch = columnar.VersionBatch.from_strings(originals)
+            for name in names:
+                plan = BumpPlan.compile(name)
+                yield (
+                    f"columnar/100k/{name}",
+                    lambda p=plan: columnar.apply(p, batch),
+                )
+                yield (
+                    f"columnar/100k-scalar/{name}",
+                    lambda p=plan: [p.execute(Version.parse(o)) for o in originals],
+                )
+    standard = StandardScheme(ROOT, {"validate-bump": True})
+    for name, (instructions, original) in STANDARD_CHAINS.items():
+        yield (
+            f"standard/{name}",
+            lambda i=instructions, o=original: standard.update(i, o, {}),
+        )
+
+
+def run(output: str, name_filter: str) -> None:
+    results = []
+    with TemporaryDirectory() as scratch:
+        for name, function in benchmarks(scratch, name_filter):
+            if name_filter not in name:
+                continue
+            result = measure(name, function)
+            results.append(result)
+            print(f"{result.name:<45} {result.best_us:>12.2f} us")
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "hatch-semver": hatch_semver.__version__,
+        "semver": semver.__version__,
+        "results": [asdict(result) for result in results],
+    }
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"results written to {output}")
+
+
+def compare(baseline: str, current: str, threshold: float) -> int:
+    with open(baseline, encoding="utf-8") as file:
+        old = {result["name"]: result for result in json.load(file)["results"]}
+    with open(current, encoding="utf-8") as file:
+        new = {result["name"]: result for result in json.load(file)["results"]}
+    regressions = 0
+    for name in sorted(old.keys() & new.keys()):
+        ratio = new[name]["best_us"] / old[name]["best_us"]
+        flag = ""
+        if ratio > threshold:
+            flag = "REGRESSION"
+            regressions += 1
+        timings = f"{old[name]['best_us']:>10.2f} {new[name]['best_us']:>10.2f}"
+        print(f"{name:<45} {timings} {ratio:>6.2f}x {flag}")
+    for name in sorted(old.keys() - new.keys()):
+        print(f"{name:<45} missing in {current}")
+    print(f"{regressions} regression(s) above {threshold:.2f}x")
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = ArgumentParser(description="Benchmark suite of hatch-semver")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--output", default="benchmark-results.json")
+    run_parser.add_argument("--filter", default="", help="only run benchmarks containing this text")
+    compare_parser = commands.add_parser("compare", help="compare results with a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=1.1)
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args.output, args.filter)
+        return 0
+    return compare(args.baseline, args.current, args.threshold)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
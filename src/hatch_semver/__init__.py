@@ -6,5 +6,29 @@
 Plugin for hatch to support semantic versioning scheme
 """
 
+from importlib import import_module
+
 # towncrier is looking for the version number in here
 from .__about__ import __version__
+
+_lazy_attributes = {
+    "BumpInstruction": "bump_instruction",
+    "BumpPlan": "bump_plan",
+    "HatchSemverError": "errors",
+    "SemverScheme": "semver_scheme",
+    "ValidationError": "errors",
+}
+"""
+Public names which are imported from their modules only when first accessed,
+so that importing the package stays cheap.
+"""
+
+
+def __getattr__(name: str):
+    if name in _lazy_attributes:
+        return getattr(import_module(f".{_lazy_attributes[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted((*globals(), *_lazy_attributes))
@@ -29,6 +29,7 @@ class BumpInstruction:
         "prerelease",
         "build",
         "release",
+        "auto",
     )
     """
     Used to decide whether the user wants to set a specific version or not
@@ -55,6 +56,13 @@ class BumpInstruction:
     Information whether the user intends to set a specific version value,
     rather than bump any of the version segments.
     """
+    repeat: int = field(default=1, init=False)
+    """
+    How many times in a row this instruction is to be executed. Always `1` for
+    instructions parsed from the user's input. Only
+    `hatch_semver.optimizer.optimize` merges consecutive `build` instructions
+    into one with a higher count.
+    """
     instruction: InitVar[str]
     """
     Only available in the init phase of the instance. This is the raw
@@ -130,7 +138,7 @@ class BumpInstruction:
             token = part
             part = "build"
         if token:
-            if part in ("major", "minor", "patch", "release"):
+            if part in ("major", "minor", "patch", "release", "auto"):
                 raise ValueError(
                     f"{part} version cannot be set to {token} specifically. Use {part} alone"
                 )
@@ -0,0 +1,301 @@
+#!/usr/bin/env python
+
+"""
+Compiled chains of bump instructions.
+
+A chain of bump instructions (the *desired_version* argument of
+`hatch_semver.semver_scheme.SemverScheme.update`) is parsed once into
+an immutable `BumpPlan` which can be executed any number of times
+on different original versions. Compiled plans are kept in a bounded
+LRU cache keyed by the raw instruction string.
+"""
+
+from copy import copy
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, ClassVar, Optional
+
+from semver import Version
+
+from . import optimizer
+from .bump_instruction import BumpInstruction
+from .concurrency import ThreadCounter, evict
+from .parse_cache import parse_version
+
+StepCallback = Callable[[int, BumpInstruction, Any], None]
+"""
+Signature of the *on_step* argument of `BumpPlan.execute`.
+"""
+
+
+def increment_string(string: str, increment: int) -> str:
+    """
+    Increments the last number in *string* by *increment*, keeping its zero padding.
+    Does the same as calling `semver.Version`'s private `_increment_string`
+    *increment* times, but in a single step.
+    Strings without any digits are returned unchanged.
+    """
+    match = Version._LAST_NUMBER.search(string)
+    if match:
+        next_ = str(int(match.group(1)) + increment)
+        start, end = match.span(1)
+        string = string[: max(end - len(next_), start)] + next_ + string[end:]
+    return string
+
+
+@dataclass(frozen=True)
+class BumpPlan:
+    """
+    An immutable, compiled chain of bump instructions.
+
+    Use `BumpPlan.compile` to create one from the raw instruction string
+    and `BumpPlan.execute` to apply it to a version.
+    """
+
+    separator: ClassVar[str] = ","
+    """
+    Value: `,` (comma).
+    Separator of the bump instructions in the raw instruction string.
+    """
+    source: str
+    """
+    The raw instruction string this plan was compiled from.
+    """
+    steps: tuple[BumpInstruction, ...]
+    """
+    The parsed bump instructions in the order of their execution.
+    """
+
+    @classmethod
+    def compile(cls, instructions: str, optimize: bool = True) -> "BumpPlan":
+        """
+        Parses a chain of bump instructions into a `BumpPlan`.
+
+        ### Parameters
+        - *instructions*: bump instructions separated by `BumpPlan.separator`,
+                e.g. `minor,rc`.
+        - *optimize*: if *True*, steps whose result would be thrown away are removed
+                by `hatch_semver.optimizer.optimize`.
+
+        ### Return
+        The compiled `BumpPlan`.
+
+        ### Raises
+        `ValueError` if any of the instructions is malformed
+        (see `hatch_semver.bump_instruction.BumpInstruction.normalize_version_part`).
+        """
+        steps = tuple(
+            BumpInstruction(instruction) for instruction in instructions.split(cls.separator)
+        )
+        if optimize:
+            steps = optimizer.optimize(steps)
+        return cls(source=instructions, steps=steps)
+
+    @property
+    def has_build_templates(self) -> bool:
+        """
+        Information whether a `build` step's token is a template with placeholders,
+        e.g. `build={sha7}` (see `hatch_semver.vcs`).
+        """
+        return any(bi.version_part == "build" and bi.token and "{" in bi.token for bi in self.steps)
+
+    def render_build_tokens(self, render: Callable[[str], str]) -> "BumpPlan":
+        """
+        Returns a new plan in which the tokens of `build` steps are replaced
+        by *render* (token).
+        """
+        steps = []
+        for bi in self.steps:
+            if bi.version_part == "build" and bi.token:
+                bi = copy(bi)
+                bi.token = render(bi.token)
+            steps.append(bi)
+        return BumpPlan(source=self.source, steps=tuple(steps))
+
+    @property
+    def has_auto(self) -> bool:
+        """
+        Information whether the plan has an `auto` step, whose bump is inferred from
+        the project's news fragments (see `hatch_semver.fragments`).
+        """
+        return any(bi.version_part == "auto" for bi in self.steps)
+
+    def resolve_auto(self, part: str) -> "BumpPlan":
+        """
+        Returns a new plan in which the `auto` steps are replaced by bumps of *part*,
+        e.g. `minor`.
+        """
+        resolved = BumpInstruction(part)
+        steps = tuple(resolved if bi.version_part == "auto" else bi for bi in self.steps)
+        return BumpPlan(source=self.source, steps=steps)
+
+    def execute(
+        self, original_version: Version, on_step: Optional[StepCallback] = None
+    ) -> tuple[Version, bool]:
+        """
+        Applies the plan's steps to a version.
+
+        ### Parameters
+        - *original_version*: the version to bump.
+        - *on_step*: called after each step with the step's index, its bump instruction
+                and the resulting version, e.g. by `hatch_semver.tracing.Tracer.step`.
+
+        ### Return
+        a tuple of:
+
+        - *version*: the new version
+        - *last_bump_was_build*: information whether the last step bumped
+                nothing but the build identifier. This is what
+                `hatch_semver.semver_scheme.SemverScheme.validate_bump`
+                expects as its *bumped_build* argument.
+        """
+        current_version = original_version
+        rc_bumps_patch = True
+        last_bump_was_build = False
+        for index, bi in enumerate(self.steps):
+            last_bump_was_build = False
+            if bi.version_part == "build":
+                current_version = current_version.bump_build(token=bi.token)
+                if bi.repeat > 1:
+                    current_version = current_version.replace(
+                        build=increment_string(current_version.build, bi.repeat - 1)
+                    )
+                last_bump_was_build = True
+            elif bi.version_part == "release":
+                current_version = current_version.finalize_version()
+                rc_bumps_patch = True
+            elif bi.is_specific:
+                # Users may enter a specific version string to change nothing but
+                # the metadata.
+                # This would result in an unnecessary ValidationError if such an instruction
+                # comes last in the instruction iterable.
+                # To avoid this, we check if nothing but the metadata changed.
+                # if so, we will pretend that last_bump_was_build
+                previous_version = current_version
+                current_version = parse_version(bi.version_part)
+                if previous_version == current_version:
+                    last_bump_was_build = True
+                rc_bumps_patch = False
+            else:
+                if not rc_bumps_patch and bi.version_part == "prerelease":
+                    current_version = current_version.bump_prerelease(token=bi.token)
+                    rc_bumps_patch = True
+                else:
+                    current_version = current_version.next_version(
+                        bi.version_part, prerelease_token=bi.token
+                    )
+                    rc_bumps_patch = False
+            if on_step is not None:
+                on_step(index, bi, current_version)
+        return current_version, last_bump_was_build
+
+
+@dataclass(frozen=True)
+class CacheInfo:
+    """
+    Statistics of a `BumpPlanCache`.
+    """
+
+    hits: int
+    """
+    Number of lookups answered from the cache.
+    """
+    misses: int
+    """
+    Number of lookups which had to compile a new plan.
+    """
+    evictions: int
+    """
+    Number of plans dropped because the cache was full.
+    """
+    maxsize: int
+    """
+    Maximum number of plans the cache holds.
+    """
+    currsize: int
+    """
+    Number of plans currently in the cache.
+    """
+
+
+class BumpPlanCache:
+    """
+    A bounded, thread-safe cache of compiled `BumpPlan`s keyed by the raw instruction string,
+    evicting approximately the least recently used plans.
+    Hits do not take a lock, see `hatch_semver.concurrency`.
+
+    Instruction strings which fail to compile are not cached,
+    the `ValueError` is raised on every lookup.
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be a positive number, got {maxsize}")
+        self.maxsize = maxsize
+        # instructions -> [plan, referenced since inserted or spared by the eviction]
+        self._plans: dict[str, list] = {}
+        self._lock = Lock()
+        self._hits = ThreadCounter()
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, instructions: str) -> BumpPlan:
+        """
+        Returns the compiled plan for *instructions*, compiling and caching it if necessary.
+        """
+        entry = self._plans.get(instructions)
+        if entry is not None:
+            entry[1] = True
+            self._hits.increment()
+            return entry[0]
+        with self._lock:
+            # the entry may have been added, or moved by an eviction, in the meantime
+            entry = self._plans.get(instructions)
+            if entry is None:
+                self._misses += 1
+        if entry is not None:
+            self._hits.increment()
+            return entry[0]
+        plan = BumpPlan.compile(instructions)
+        with self._lock:
+            if instructions not in self._plans:
+                self._plans[instructions] = [plan, False]
+                self._evictions += len(evict(self._plans, self.maxsize, 1))
+        return plan
+
+    def info(self) -> CacheInfo:
+        """
+        Returns the cache statistics.
+        """
+        hits = self._hits.value
+        with self._lock:
+            return CacheInfo(
+                hits=hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                maxsize=self.maxsize,
+                currsize=len(self._plans),
+            )
+
+    def clear(self) -> None:
+        """
+        Empties the cache and resets its statistics.
+        """
+        with self._lock:
+            self._plans.clear()
+            self._hits.reset()
+            self._misses = 0
+            self._evictions = 0
+
+
+plan_cache = BumpPlanCache()
+"""
+The process-wide cache used by `hatch_semver.semver_scheme.SemverScheme.update`.
+"""
+
+
+def compile_plan(instructions: str) -> BumpPlan:
+    """
+    Returns the compiled `BumpPlan` for *instructions* from the process-wide `plan_cache`.
+    """
+    return plan_cache.get(instructions)
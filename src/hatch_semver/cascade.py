@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+
+"""
+Cascading bumps through the dependency graph of a workspace.
+
+When a project is bumped, every project which depends on it gets a bump too,
+according to a policy which maps the dependency's bump level to the dependent's
+bump instruction (e.g. a *major* bump of a dependency causes a *minor* bump
+of the dependent). The bumps propagate level by level through the dependency graph
+and the complete plan is computed in one pass.
+"""
+
+import re
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .errors import DependencyCycleError, ValidationError
+from .names import normalize_name
+from .precedence import LEVELS, bump_level
+from .semver_scheme import SemverScheme
+from .workspace import find_projects, read_project, read_version, skip_reason
+
+DEFAULT_POLICY: Mapping[str, Optional[str]] = {
+    "major": "minor",
+    "minor": "patch",
+    "patch": "patch",
+    "prerelease": None,
+    "build": None,
+}
+"""
+Maps the bump level of a dependency to the bump instruction of its dependents.
+*None* means that such a bump does not propagate.
+"""
+
+REQUIREMENT_NAME = re.compile(r"\s*([A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)")
+
+
+def requirement_name(requirement: str) -> Optional[str]:
+    """
+    Returns the normalized project name of a PEP 508 requirement string, e.g. `foo`
+    for `Foo[bar]>=1.0; python_version < '3.11'`.
+    """
+    match = REQUIREMENT_NAME.match(requirement)
+    return normalize_name(match.group(1)) if match else None
+
+
+@dataclass(frozen=True)
+class Node:
+    """
+    A project in the dependency graph.
+    """
+
+    version: str
+    """
+    The project's current version.
+    """
+    dependencies: tuple[str, ...] = ()
+    """
+    PEP 508 requirement strings. Requirements on projects outside the graph are ignored.
+    """
+    config: Mapping = field(default_factory=dict)
+    """
+    The project's `[tool.hatch.version]` table, passed to `hatch_semver.semver_scheme.SemverScheme`.
+    """
+    root: str = "."
+    """
+    Directory of the project.
+    """
+
+
+@dataclass(frozen=True)
+class CascadeBump:
+    """
+    A bump in the cascade plan.
+    """
+
+    name: str
+    """
+    Normalized name of the bumped project.
+    """
+    old_version: str
+    """
+    The version before the bump.
+    """
+    new_version: str
+    """
+    The version after the bump.
+    """
+    instructions: str
+    """
+    The bump instructions which were applied.
+    """
+    triggered_by: tuple[str, ...]
+    """
+    Names of the bumped dependencies which caused this bump.
+    Empty for bumps requested explicitly.
+    """
+
+
+def topological_levels(graph: Mapping[str, Iterable[str]]) -> list[list[str]]:
+    """
+    Groups the nodes of *graph* (node → its dependencies) into levels.
+    All dependencies of a node are in lower levels, so the nodes
+    within one level are independent of each other.
+
+    ### Raises
+    `hatch_semver.errors.DependencyCycleError` if the graph contains a cycle.
+    """
+    pending = {node: 0 for node in graph}
+    dependents: dict[str, list[str]] = {node: [] for node in graph}
+    for node, dependencies in graph.items():
+        for dependency in dependencies:
+            pending[node] += 1
+            dependents[dependency].append(node)
+    level = sorted(node for node, count in pending.items() if not count)
+    levels = []
+    while level:
+        levels.append(level)
+        following = []
+        for node in level:
+            for dependent in dependents[node]:
+                pending[dependent] -= 1
+                if not pending[dependent]:
+                    following.append(dependent)
+        level = sorted(following)
+    if sum(map(len, levels)) < len(graph):
+        cycle = sorted(node for node, count in pending.items() if count)
+        raise DependencyCycleError(f"Dependency cycle among {', '.join(cycle)}")
+    return levels
+
+
+def plan_cascade(
+    nodes: Mapping[str, Node],
+    seeds: Mapping[str, str],
+    policy: Mapping[str, Optional[str]] = DEFAULT_POLICY,
+    workers: int = 1,
+) -> list[CascadeBump]:
+    """
+    Computes all bumps caused by the requested ones.
+
+    ### Parameters
+    - *nodes*: the projects by name.
+    - *seeds*: bump instructions of the explicitly bumped projects by name.
+    - *policy*: maps a dependency's bump level to the dependents' bump instruction,
+            see `DEFAULT_POLICY`. A dependent bumped for several reasons gets the most
+            significant of the instructions. Explicit instructions take precedence.
+    - *workers*: number of threads computing the projects of one graph level.
+            Only worth it on free-threaded Python builds.
+
+    ### Return
+    The bumps in topological order (dependencies before dependents).
+    Projects which are not bumped are omitted.
+
+    ### Raises
+    - `hatch_semver.errors.DependencyCycleError` if the dependencies form a cycle.
+    - `hatch_semver.errors.ValidationError` if a new version is not higher than the old one.
+    - `ValueError` on unknown project names, invalid versions or instructions.
+    """
+    nodes = {normalize_name(name): node for name, node in nodes.items()}
+    seeds = {normalize_name(name): instructions for name, instructions in seeds.items()}
+    unknown = seeds.keys() - nodes.keys()
+    if unknown:
+        raise ValueError(f"Unknown projects: {', '.join(sorted(unknown))}")
+    invalid = set(policy.values()) - set(LEVELS) - {None}
+    if invalid:
+        raise ValueError(f"Invalid policy instructions {sorted(invalid)}, use one of {LEVELS}")
+    graph = {
+        name: {
+            dependency
+            for dependency in map(requirement_name, node.dependencies)
+            if dependency in nodes and dependency != name
+        }
+        for name, node in nodes.items()
+    }
+    # bump levels of the projects bumped so far
+    levels: dict[str, Optional[str]] = {}
+
+    def compute(name: str) -> Optional[tuple[CascadeBump, Optional[str]]]:
+        instructions = seeds.get(name)
+        triggered_by: tuple[str, ...] = ()
+        if instructions is None:
+            strongest = -1
+            for dependency in sorted(graph[name]):
+                instruction = policy.get(levels.get(dependency))
+                if instruction is None:
+                    continue
+                triggered_by += (dependency,)
+                strongest = max(strongest, LEVELS.index(instruction))
+            if strongest < 0:
+                return None
+            instructions = LEVELS[strongest]
+        node = nodes[name]
+        scheme = SemverScheme(node.root, {**node.config, "validate-bump": True})
+        try:
+            result = scheme.update_detailed(instructions, node.version, record_steps=False)
+        except ValidationError as e:
+            raise ValidationError(f"{name}: {e}") from e
+        bump = CascadeBump(name, node.version, str(result.version), instructions, triggered_by)
+        return bump, bump_level(result.original, result.version)
+
+    plan = []
+    with ThreadPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as executor:
+        for level in topological_levels(graph):
+            results = executor.map(compute, level) if executor else map(compute, level)
+            for computed in results:
+                if computed is not None:
+                    bump, level = computed
+                    levels[bump.name] = level
+                    plan.append(bump)
+    return plan
+
+
+def cascade_workspace(
+    root: str,
+    seeds: Mapping[str, str],
+    policy: Mapping[str, Optional[str]] = DEFAULT_POLICY,
+    dry_run: bool = False,
+    workers: int = 1,
+) -> list[CascadeBump]:
+    """
+    Plans the cascade for all semver projects under *root*
+    (see `hatch_semver.workspace.find_projects`) and writes the new versions.
+
+    ### Parameters
+    - *root*: the directory to search for projects.
+    - *seeds*, *policy*, *workers*: see `plan_cascade`.
+    - *dry_run*: if *True*, the plan is computed but no version file is written.
+
+    ### Return
+    The cascade plan. Version files are only written if the whole plan is valid.
+    """
+    nodes = {}
+    version_files = {}
+    for project_root in find_projects(root):
+        project = read_project(project_root)
+        if skip_reason(project):
+            continue
+        version_file, version = read_version(project)
+        name = normalize_name(project.name)
+        version_files[name] = version_file
+        nodes[name] = Node(version, project.dependencies, project.version_config, project_root)
+    plan = plan_cascade(nodes, seeds, policy, workers)
+    if not dry_run:
+        for bump in plan:
+            version_files[bump.name].set_version(bump.new_version)
+    return plan
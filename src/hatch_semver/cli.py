@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+
+"""
+The `hatch-semver` command line tool.
+"""
+
+import sys
+from argparse import ArgumentParser, Namespace
+from typing import Optional, Sequence
+
+
+def bump(args: Namespace) -> int:
+    from .workspace import bump_workspace
+
+    results = bump_workspace(args.root, args.instructions, jobs=args.jobs, dry_run=args.dry_run)
+    failed = 0
+    for result in results:
+        if result.error:
+            failed += 1
+            print(f"{result.name}: error: {result.error}", file=sys.stderr)
+        elif result.skipped:
+            if args.verbose:
+                print(f"{result.name}: skipped, {result.skipped}")
+        else:
+            print(f"{result.name}: {result.old_version} -> {result.new_version}")
+    if args.dry_run:
+        print("dry run, no files were changed")
+    return 1 if failed else 0
+
+
+def parse_pairs(pairs: Sequence[str], separator: str) -> dict[str, str]:
+    parsed = {}
+    for pair in pairs:
+        key, found, value = pair.partition(separator)
+        if not found:
+            raise SystemExit(f"`{pair}` is not in the format KEY{separator}VALUE")
+        parsed[key] = value
+    return parsed
+
+
+def cascade(args: Namespace) -> int:
+    from .cascade import DEFAULT_POLICY, cascade_workspace
+    from .errors import HatchSemverError
+
+    policy = dict(DEFAULT_POLICY)
+    if args.policy:
+        policy.update(
+            {
+                level: instruction or None
+                for level, instruction in parse_pairs(args.policy.split(","), "=").items()
+            }
+        )
+    seeds = parse_pairs(args.bumps, ":")
+    try:
+        plan = cascade_workspace(args.root, seeds, policy, dry_run=args.dry_run, workers=args.jobs)
+    except (OSError, ValueError, HatchSemverError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    for bump in plan:
+        reason = f" (because of {', '.join(bump.triggered_by)})" if bump.triggered_by else ""
+        print(f"{bump.name}: {bump.old_version} -> {bump.new_version}{reason}")
+    if args.dry_run:
+        print("dry run, no files were changed")
+    return 0
+
+
+def latest(args: Namespace) -> int:
+    from .git_tags import latest_version
+
+    try:
+        version = latest_version(args.root, args.prefix, not args.no_prereleases)
+    except FileNotFoundError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    if version is None:
+        print(f"error: no tag with a semantic version (prefix `{args.prefix}`)", file=sys.stderr)
+        return 1
+    print(version)
+    return 0
+
+
+def history(args: Namespace) -> int:
+    from .history import check_history
+
+    if args.file == "-":
+        report = check_history(sys.stdin)
+    else:
+        with open(args.file, encoding="utf-8") as file:
+            report = check_history(file)
+    for index in report.invalid:
+        print(f"line {index + 1}: not a semantic version", file=sys.stderr)
+    for violation in report.violations:
+        print(
+            f"line {violation.index + 1}: {violation.version} is not higher than"
+            f" {violation.previous} ({violation.relation})",
+            file=sys.stderr,
+        )
+    print(f"{report.count} versions, {len(report.violations)} violation(s)")
+    return 0 if report.ok else 1
+
+
+def daemon(args: Namespace) -> int:
+    if args.stop:
+        from .client import Client
+
+        if not Client(args.socket).shutdown():
+            print("error: no daemon is running", file=sys.stderr)
+            return 1
+        return 0
+    from .daemon import serve
+
+    try:
+        serve(args.socket, args.idle_timeout)
+    except RuntimeError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def update(args: Namespace) -> int:
+    import json
+
+    from .client import Client
+    from .errors import HatchSemverError
+
+    config = {}
+    for key, value in parse_pairs(args.config, "=").items():
+        try:
+            config[key] = json.loads(value)
+        except ValueError:
+            config[key] = value
+    with Client(args.socket) as client:
+        try:
+            print(client.update(args.instructions, args.version, config, args.root))
+        except (ValueError, HatchSemverError) as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 1
+    return 0
+
+
+def ledger(args: Namespace) -> int:
+    from .ledger import ReleaseLedger
+
+    releases = ReleaseLedger(args.file)
+    if args.project is None:
+        for project, version in releases:
+            print(f"{project} {version}")
+        return 0
+    if args.add:
+        added = releases.add_many((args.project, version) for version in args.versions)
+        print(f"{added} release(s) added, {len(releases)} in the ledger")
+        return 0
+    released = [version for version in args.versions if releases.released(args.project, version)]
+    for version in released:
+        print(f"{args.project} {version} was already released", file=sys.stderr)
+    return 1 if released else 0
+
+
+def audit(args: Namespace) -> int:
+    import json
+
+    from .lockfiles import Change, audit
+
+    def text(change: Change) -> str:
+        if change.change == "added":
+            return f"{change.name}: added {change.new}"
+        if change.change == "removed":
+            return f"{change.name}: removed {change.old}"
+        return f"{change.name}: {change.old} -> {change.new} ({change.change})"
+
+    def write(change: Change) -> None:
+        print(json.dumps(change._asdict()) if args.json else text(change))
+
+    with open(args.old, encoding="utf-8") as old, open(args.new, encoding="utf-8") as new:
+        summary = audit(old, new, write)
+    if args.json:
+        print(json.dumps({"old": summary.old, "new": summary.new, "counts": summary.counts}))
+    else:
+        counts = ", ".join(f"{count} {change}" for change, count in summary.counts.items() if count)
+        print(f"{summary.old} -> {summary.new} pins: {counts or 'no changes'}")
+    return 1 if summary.downgrades else 0
+
+
+def build_parser() -> ArgumentParser:
+    parser = ArgumentParser(prog="hatch-semver", description="Semantic versioning tools for hatch")
+    commands = parser.add_subparsers(dest="command", required=True)
+    bump_parser = commands.add_parser(
+        "bump", help="bump the version of every semver project under a directory"
+    )
+    bump_parser.add_argument("instructions", help="bump instructions, e.g. `minor,rc`")
+    bump_parser.add_argument("--root", default=".", help="directory to search for projects")
+    bump_parser.add_argument(
+        "-j", "--jobs", type=int, default=None, help="number of worker processes (default: CPUs)"
+    )
+    bump_parser.add_argument(
+        "-n", "--dry-run", action="store_true", help="print the new versions without writing them"
+    )
+    bump_parser.add_argument("-v", "--verbose", action="store_true", help="list skipped projects")
+    bump_parser.set_defaults(handler=bump)
+    cascade_parser = commands.add_parser(
+        "cascade", help="bump projects and everything which depends on them"
+    )
+    cascade_parser.add_argument(
+        "bumps", nargs="+", metavar="NAME:COMMAND", help="project and its bump instructions"
+    )
+    cascade_parser.add_argument("--root", default=".", help="directory to search for projects")
+    cascade_parser.add_argument(
+        "--policy",
+        help="bumps of dependents, e.g. `major=minor,minor=patch,patch=` (empty: no bump)",
+    )
+    cascade_parser.add_argument(
+        "-j", "--jobs", type=int, default=1, help="threads per dependency level (default: 1)"
+    )
+    cascade_parser.add_argument(
+        "-n", "--dry-run", action="store_true", help="print the new versions without writing them"
+    )
+    cascade_parser.set_defaults(handler=cascade)
+    latest_parser = commands.add_parser(
+        "latest", help="print the highest version found in the git tags"
+    )
+    latest_parser.add_argument("--root", default=".", help="a path inside the git repository")
+    latest_parser.add_argument("--prefix", default="", help="tag prefix, e.g. `v`")
+    latest_parser.add_argument(
+        "--no-prereleases", action="store_true", help="ignore pre-release versions"
+    )
+    latest_parser.set_defaults(handler=latest)
+    history_parser = commands.add_parser(
+        "history", help="check that every version in a release history is higher than the last"
+    )
+    history_parser.add_argument(
+        "file", nargs="?", default="-", help="file with one version per line (default: stdin)"
+    )
+    history_parser.set_defaults(handler=history)
+    daemon_parser = commands.add_parser(
+        "daemon", help="answer `update` requests from a warm process over a Unix socket"
+    )
+    daemon_parser.add_argument("--socket", help="socket path (default: in $XDG_RUNTIME_DIR)")
+    daemon_parser.add_argument(
+        "--idle-timeout", type=float, default=600, help="seconds until an idle daemon exits"
+    )
+    daemon_parser.add_argument("--stop", action="store_true", help="stop the running daemon")
+    daemon_parser.set_defaults(handler=daemon)
+    update_parser = commands.add_parser(
+        "update", help="print the bumped version, computed by the daemon if it is running"
+    )
+    update_parser.add_argument("instructions", help="bump instructions, e.g. `minor,rc`")
+    update_parser.add_argument("version", help="the current version")
+    update_parser.add_argument("--root", default=".", help="the project root")
+    update_parser.add_argument("--socket", help="socket path of the daemon")
+    update_parser.add_argument(
+        "-c",
+        "--config",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="a [tool.hatch.version] option, e.g. `validate-bump=false`",
+    )
+    update_parser.set_defaults(handler=update)
+    ledger_parser = commands.add_parser(
+        "ledger", help="check or record released versions in a release ledger"
+    )
+    ledger_parser.add_argument("file", help="the ledger file")
+    ledger_parser.add_argument("project", nargs="?", help="project name (default: list all)")
+    ledger_parser.add_argument("versions", nargs="*", metavar="version", help="versions")
+    ledger_parser.add_argument(
+        "--add", action="store_true", help="record the versions instead of checking them"
+    )
+    ledger_parser.set_defaults(handler=ledger)
+    audit_parser = commands.add_parser(
+        "audit", help="classify the version changes between two lockfiles or requirement lists"
+    )
+    audit_parser.add_argument("old", help="the old lockfile or requirement list")
+    audit_parser.add_argument("new", help="the new lockfile or requirement list")
+    audit_parser.add_argument(
+        "--json", action="store_true", help="write JSON lines, the summary last"
+    )
+    audit_parser.set_defaults(handler=audit)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Entry point of the `hatch-semver` console script.
+    """
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
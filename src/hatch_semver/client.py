@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+
+"""
+A thin client of the version daemon (see `hatch_semver.daemon`).
+
+The client only needs the standard library to talk to a running daemon.
+If no daemon is running, or the platform has no Unix domain sockets, the request is
+computed in-process by `hatch_semver.semver_scheme.SemverScheme`, which is imported
+only then. Errors are raised as the same exception types either way.
+"""
+
+import json
+import os
+import socket
+import tempfile
+from typing import Any, Mapping, Optional
+
+from .errors import DependencyCycleError, HatchSemverError, ValidationError
+
+SOCKET_ENVIRONMENT_VARIABLE = "HATCH_SEMVER_SOCKET"
+"""
+Environment variable naming the socket of the daemon.
+"""
+
+ERRORS = {
+    error.__name__: error
+    for error in (ValueError, HatchSemverError, ValidationError, DependencyCycleError)
+}
+
+
+def default_socket_path() -> str:
+    """
+    Returns `HATCH_SEMVER_SOCKET`, or `hatch-semver-<uid>.sock` in `$XDG_RUNTIME_DIR`
+    or in the temporary directory.
+    """
+    path = os.environ.get(SOCKET_ENVIRONMENT_VARIABLE)
+    if path:
+        return path
+    directory = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(directory, f"hatch-semver-{uid}.sock")
+
+
+class Client:
+    """
+    Sends requests to the version daemon over one connection,
+    or computes them in-process if the daemon is not running.
+
+    ### Parameters
+    - *path*: the daemon's socket, default: `default_socket_path`.
+    - *timeout*: socket timeout in seconds.
+    - *fallback*: if *False*, raise `ConnectionError` instead of computing in-process.
+    """
+
+    def __init__(
+        self, path: Optional[str] = None, timeout: float = 10, fallback: bool = True
+    ) -> None:
+        self.path = path or default_socket_path()
+        self.timeout = timeout
+        self.fallback = fallback
+        self.used_daemon = False
+        """
+        Information whether the last request was answered by the daemon.
+        """
+        self._socket: Optional[socket.socket] = None
+        self._file: Any = None
+
+    def close(self) -> None:
+        """
+        Closes the connection to the daemon.
+        """
+        if self._socket is not None:
+            self._file.close()
+            self._socket.close()
+            self._socket = self._file = None
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _connect(self) -> bool:
+        if self._socket is not None:
+            return True
+        if not hasattr(socket, "AF_UNIX"):
+            return False
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(self.timeout)
+        try:
+            connection.connect(self.path)
+        except OSError:
+            connection.close()
+            return False
+        self._socket = connection
+        self._file = connection.makefile("rwb")
+        return True
+
+    def request(self, request: Mapping[str, Any]) -> Optional[dict[str, Any]]:
+        """
+        Sends *request* to the daemon and returns its response,
+        or *None* if the daemon is not reachable.
+        """
+        for _ in range(2):
+            if not self._connect():
+                return None
+            try:
+                self._file.write(json.dumps(request).encode() + b"\n")
+                self._file.flush()
+                line = self._file.readline()
+            except OSError:
+                line = b""
+            if line:
+                return json.loads(line)
+            # the daemon went away (e.g. idle timeout), try a new connection once
+            self.close()
+        return None
+
+    def _answer(self, request: Mapping[str, Any]) -> dict[str, Any]:
+        response = self.request(request)
+        self.used_daemon = response is not None
+        if response is None:
+            if not self.fallback:
+                raise ConnectionError(f"No version daemon listens on {self.path}")
+            response = compute(request)
+        if not response["ok"]:
+            raise ERRORS.get(response.get("type", ""), HatchSemverError)(response["error"])
+        return response
+
+    def update(
+        self,
+        instructions: str,
+        version: str,
+        config: Optional[Mapping] = None,
+        root: str = ".",
+    ) -> str:
+        """
+        Returns the new version like `hatch_semver.semver_scheme.SemverScheme.update`.
+        """
+        request = {
+            "op": "update",
+            "instructions": instructions,
+            "version": version,
+            "config": dict(config or {}),
+            "root": os.path.abspath(root),
+        }
+        return self._answer(request)["version"]
+
+    def validate(self, new: str, old: str, bumped_build: bool = False) -> Optional[str]:
+        """
+        Checks *new* as a successor of *old* like
+        `hatch_semver.semver_scheme.SemverScheme.validate_bump`.
+
+        ### Return
+        *None* if it is valid, otherwise the reason why not.
+        """
+        request = {"op": "validate", "new": new, "old": old, "bumped_build": bumped_build}
+        response = self._answer(request)
+        return None if response["valid"] else response["error"]
+
+    def shutdown(self) -> bool:
+        """
+        Asks the daemon to exit. Returns whether a daemon was running.
+        """
+        running = self.request({"op": "shutdown"}) is not None
+        self.close()
+        return running
+
+
+_local: Any = None
+
+
+def compute(request: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Computes the response to *request* in-process, like the daemon would.
+    """
+    global _local
+    if _local is None:
+        from .daemon import VersionDaemon
+
+        _local = VersionDaemon("")
+    return _local.answer(dict(request))
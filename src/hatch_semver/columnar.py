@@ -0,0 +1,404 @@
+#!/usr/bin/env python
+
+"""
+Applies one `hatch_semver.bump_plan.BumpPlan` to very many versions at once.
+
+The versions are encoded into NumPy columns: *major*, *minor* and *patch* as integers,
+the pre-release and build identifiers each as three columns. An identifier is split
+at its last number into a head, the number and a tail, e.g. `rc.4` into `rc.`, `4` and ``.
+Heads and tails are stored as codes into a shared vocabulary. All versions get the same
+bump instructions, so every step of the plan becomes a few array operations,
+and so does the `validate_bump` check.
+
+Identifiers whose last number has leading zeros or more than 18 digits cannot be encoded.
+Such rows, and comparisons of pre-releases which are not decided by a number,
+fall back to the scalar path, i.e. `semver.Version`.
+
+Requires NumPy (`pip install hatch-semver[numpy]`).
+"""
+
+import re
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from typing import Optional
+
+from semver import Version
+
+from .bump_plan import BumpPlan, increment_string
+
+try:
+    import numpy as np
+except ImportError as e:  # no cov
+    raise ImportError(
+        "hatch_semver.columnar requires NumPy, install it with `pip install hatch-semver[numpy]`"
+    ) from e
+
+NONE = -1
+"""
+Head code of a missing identifier, number of an identifier without digits.
+"""
+LAST_NUMBER = re.compile(r"^(.*?)(\d+)(\D*)$")
+MAX_DIGITS = 18
+
+
+class Vocabulary:
+    """
+    Maps the heads and tails of identifiers to integer codes and back.
+    """
+
+    def __init__(self) -> None:
+        self.strings: list[str] = []
+        self.codes: dict[str, int] = {}
+
+    def code(self, string: str) -> int:
+        code = self.codes.get(string)
+        if code is None:
+            code = self.codes[string] = len(self.strings)
+            self.strings.append(string)
+        return code
+
+    def encode(self, identifier: Optional[str]) -> Optional[tuple[int, int, int]]:
+        """
+        Encodes an identifier into head code, number and tail code.
+        Returns *None* if the identifier cannot be encoded.
+        """
+        if identifier is None:
+            return NONE, NONE, NONE
+        match = LAST_NUMBER.match(identifier)
+        if match is None:
+            return self.code(identifier), NONE, self.code("")
+        head, number, tail = match.groups()
+        if (number.startswith("0") and number != "0") or len(number) > MAX_DIGITS:
+            return None
+        return self.code(head), int(number), self.code(tail)
+
+    def decode(self, head: int, number: int, tail: int) -> Optional[str]:
+        if head == NONE:
+            return None
+        return f"{self.strings[head]}{'' if number == NONE else number}{self.strings[tail]}"
+
+    def numeric_safe(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns for each code whether it is a head (resp. tail) which leaves the number
+        a separate numeric identifier, so that precedence is decided by the number alone.
+        """
+        heads = np.array([s == "" or s.endswith(".") for s in self.strings], dtype=bool)
+        tails = np.array([s == "" or s.startswith(".") for s in self.strings], dtype=bool)
+        return heads, tails
+
+
+COLUMNS = (
+    "major",
+    "minor",
+    "patch",
+    "pre_head",
+    "pre_number",
+    "pre_tail",
+    "build_head",
+    "build_number",
+    "build_tail",
+)
+
+
+SCALAR_ROW = (0, 0, 0, NONE, NONE, NONE, NONE, NONE, NONE)
+"""
+Placeholder columns of a row which takes the scalar path: version `0.0.0`.
+"""
+
+
+class VersionBatch:
+    """
+    A batch of versions encoded as NumPy columns.
+    Use `VersionBatch.from_strings` to create one.
+
+    The columns of the rows in `VersionBatch.scalar` are placeholders which
+    the bump steps may change, but which are never decoded or compared.
+    """
+
+    def __init__(self, columns: dict[str, np.ndarray], vocabulary: Vocabulary) -> None:
+        self.columns = columns
+        self.vocabulary = vocabulary
+        self.scalar: dict[int, Version] = {}
+        """
+        Versions of the rows which could not be encoded, by row index.
+        """
+
+    @classmethod
+    def from_strings(
+        cls, versions: Sequence[str], vocabulary: Optional[Vocabulary] = None
+    ) -> "VersionBatch":
+        """
+        Parses and encodes *versions*.
+
+        ### Raises
+        `ValueError` naming the first invalid version and its index.
+        """
+        vocabulary = vocabulary or Vocabulary()
+        rows = np.empty((len(versions), len(COLUMNS)), dtype=np.int64)
+        scalar = {}
+        regex = Version._REGEX
+        for index, string in enumerate(versions):
+            match = regex.match(string)
+            if match is None:
+                raise ValueError(f"{string} (at index {index}) is not valid SemVer string")
+            major, minor, patch, prerelease, build = match.groups()
+            pre = vocabulary.encode(prerelease)
+            meta = vocabulary.encode(build)
+            if pre is None or meta is None or max(map(len, (major, minor, patch))) > MAX_DIGITS:
+                scalar[index] = Version.parse(string)
+                rows[index] = SCALAR_ROW
+                continue
+            rows[index] = (int(major), int(minor), int(patch), *pre, *meta)
+        batch = cls({name: rows[:, i].copy() for i, name in enumerate(COLUMNS)}, vocabulary)
+        batch.scalar = scalar
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.columns["major"])
+
+    def copy(self) -> "VersionBatch":
+        batch = VersionBatch(
+            {name: column.copy() for name, column in self.columns.items()}, self.vocabulary
+        )
+        batch.scalar = dict(self.scalar)
+        return batch
+
+    def to_strings(self) -> list[str]:
+        """
+        Decodes the batch into version strings.
+        """
+        c = self.columns
+        decode = self.vocabulary.decode
+        scalar = self.scalar
+        strings = []
+        for index, row in enumerate(zip(*(c[name].tolist() for name in COLUMNS))):
+            if index in scalar:
+                strings.append(str(scalar[index]))
+                continue
+            version = f"{row[0]}.{row[1]}.{row[2]}"
+            prerelease = decode(*row[3:6])
+            if prerelease is not None:
+                version += f"-{prerelease}"
+            build = decode(*row[6:9])
+            if build is not None:
+                version += f"+{build}"
+            strings.append(version)
+        return strings
+
+    def _set(self, part: str, mask, identifier: Optional[str]) -> None:
+        encoded = self.vocabulary.encode(identifier)
+        for suffix, value in zip(("_head", "_number", "_tail"), encoded):
+            self.columns[part + suffix][mask] = value
+
+    def _increment(self, part: str, mask, increment: int) -> None:
+        number = self.columns[part + "_number"]
+        number[mask & (number != NONE)] += increment
+
+
+@dataclass
+class BatchResult:
+    """
+    The outcome of `apply`.
+    """
+
+    versions: VersionBatch
+    """
+    The new versions.
+    """
+    bumped_build: np.ndarray
+    """
+    Per row: whether the last step bumped nothing but the build identifier.
+    """
+    valid: Optional[np.ndarray]
+    """
+    Per row: whether the new version passes `validate_bump` against the original one.
+    *None* if validation was not requested.
+    """
+    scalar_rows: np.ndarray
+    """
+    Indices of the rows which were computed by the scalar path.
+    """
+
+    def to_strings(self) -> list[str]:
+        return self.versions.to_strings()
+
+
+def _constant_identifiers(plan: BumpPlan) -> Iterator[Optional[str]]:
+    """
+    Yields the identifiers which *plan* sets regardless of the original version.
+    """
+    for bi in plan.steps:
+        if bi.version_part == "build":
+            base = "0" if bi.token == "" else ("build" if bi.token is None else bi.token) + ".0"
+            yield increment_string(base, bi.repeat)
+        elif bi.version_part == "prerelease":
+            base = "0" if bi.token == "" else ("rc" if bi.token is None else bi.token) + ".0"
+            yield increment_string(base, 1)
+        elif bi.is_specific:
+            version = Version.parse(bi.version_part)
+            yield version.prerelease
+            yield version.build
+
+
+def _run(plan: BumpPlan, batch: VersionBatch) -> np.ndarray:
+    """
+    Executes *plan* on the encoded rows of *batch* in place. Returns the bumped_build column.
+    """
+    c = batch.columns
+    everything = np.ones(len(batch), dtype=bool)
+    last_bump_was_build = np.zeros(len(batch), dtype=bool)
+    rc_bumps_patch = True
+    constants = _constant_identifiers(plan)
+    for bi in plan.steps:
+        last_bump_was_build[:] = False
+        if bi.version_part == "build":
+            missing = c["build_head"] == NONE
+            batch._increment("build", ~missing, bi.repeat)
+            batch._set("build", missing, next(constants))
+            last_bump_was_build[:] = True
+        elif bi.version_part == "release":
+            batch._set("pre", everything, None)
+            batch._set("build", everything, None)
+            rc_bumps_patch = True
+        elif bi.is_specific:
+            version = Version.parse(bi.version_part)
+            prerelease, build = next(constants), next(constants)
+            pre = batch.vocabulary.encode(prerelease)
+            last_bump_was_build[:] = (
+                (c["major"] == version.major)
+                & (c["minor"] == version.minor)
+                & (c["patch"] == version.patch)
+                & (c["pre_head"] == pre[0])
+                & (c["pre_number"] == pre[1])
+                & (c["pre_tail"] == pre[2])
+            )
+            c["major"][:] = version.major
+            c["minor"][:] = version.minor
+            c["patch"][:] = version.patch
+            batch._set("pre", everything, prerelease)
+            batch._set("build", everything, build)
+            rc_bumps_patch = False
+        elif bi.version_part == "prerelease":
+            missing = c["pre_head"] == NONE
+            if rc_bumps_patch:
+                c["patch"][missing] += 1
+            batch._increment("pre", ~missing, 1)
+            batch._set("pre", missing, next(constants))
+            batch._set("build", everything, None)
+            rc_bumps_patch = not rc_bumps_patch
+        else:
+            has_identifiers = (c["pre_head"] != NONE) | (c["build_head"] != NONE)
+            if bi.version_part == "patch":
+                finalize_only = has_identifiers
+            elif bi.version_part == "minor":
+                finalize_only = has_identifiers & (c["patch"] == 0)
+            else:
+                finalize_only = has_identifiers & (c["minor"] == 0) & (c["patch"] == 0)
+            bump = ~finalize_only
+            c[bi.version_part][bump] += 1
+            if bi.version_part == "major":
+                c["minor"][bump] = 0
+            if bi.version_part in ("major", "minor"):
+                c["patch"][bump] = 0
+            batch._set("pre", everything, None)
+            batch._set("build", everything, None)
+            rc_bumps_patch = False
+    return last_bump_was_build
+
+
+def compare(new: VersionBatch, old: VersionBatch) -> np.ndarray:
+    """
+    Compares the precedence of the rows of two batches sharing a vocabulary.
+    Returns -1, 0 or 1 per row like `semver.Version.compare`.
+    Rows which take the scalar path in either batch, and rows which cannot be decided
+    on the encoded columns, are compared as `semver.Version`s.
+    """
+    n, o = new.columns, old.columns
+    result = np.sign(n["major"] - o["major"])
+    for part in ("minor", "patch"):
+        undecided = result == 0
+        result[undecided] = np.sign(n[part] - o[part])[undecided]
+    new_none, old_none = n["pre_head"] == NONE, o["pre_head"] == NONE
+    core_equal = result == 0
+    result[core_equal & new_none & ~old_none] = 1
+    result[core_equal & ~new_none & old_none] = -1
+    both = core_equal & ~new_none & ~old_none
+    identical = (
+        (n["pre_head"] == o["pre_head"])
+        & (n["pre_tail"] == o["pre_tail"])
+        & (n["pre_number"] == o["pre_number"])
+    )
+    numeric = (
+        both
+        & (n["pre_head"] == o["pre_head"])
+        & (n["pre_tail"] == o["pre_tail"])
+        & (n["pre_number"] != NONE)
+        & (o["pre_number"] != NONE)
+    )
+    candidates = np.flatnonzero(numeric)
+    if len(candidates):
+        # the numbers decide only if they are whole dot-separated identifiers
+        heads, tails = new.vocabulary.numeric_safe()
+        numeric[candidates] = heads[n["pre_head"][candidates]] & tails[n["pre_tail"][candidates]]
+    result[numeric] = np.sign(n["pre_number"] - o["pre_number"])[numeric]
+    result[both & identical] = 0
+    undecided = both & ~identical & ~numeric
+    for index in new.scalar.keys() | old.scalar.keys():
+        undecided[index] = True
+    if undecided.any():
+        new_strings, old_strings = new.to_strings(), old.to_strings()
+        for index in np.flatnonzero(undecided).tolist():
+            result[index] = Version.parse(new_strings[index]).compare(old_strings[index])
+    return result
+
+
+def apply(plan: BumpPlan, batch: VersionBatch, validate: bool = True) -> BatchResult:
+    """
+    Applies *plan* to every version in *batch*.
+
+    ### Parameters
+    - *plan*: the compiled bump instructions. Build token templates must be rendered
+            beforehand (see `hatch_semver.bump_plan.BumpPlan.render_build_tokens`),
+            and `auto` steps resolved (see `hatch_semver.bump_plan.BumpPlan.resolve_auto`).
+    - *batch*: the original versions. It is not modified.
+    - *validate*: whether to check each new version like
+            `hatch_semver.semver_scheme.SemverScheme.validate_bump`, i.e. it must be higher
+            than the original one, or at least as high if the last step bumped the build.
+
+    ### Return
+    A `BatchResult`. Validation failures are reported in its *valid* column,
+    no `hatch_semver.errors.ValidationError` is raised.
+
+    ### Raises
+    `ValueError` if a specific version in the plan is invalid.
+    """
+    if plan.has_build_templates:
+        raise ValueError("render the build token templates of the plan first")
+    if plan.has_auto:
+        raise ValueError("resolve the auto steps of the plan first")
+    result = batch.copy()
+    valid = None
+    if any(batch.vocabulary.encode(i) is None for i in _constant_identifiers(plan)):
+        # the plan sets identifiers the columns cannot hold, so every row takes the scalar path
+        strings = batch.to_strings()
+        batch = batch.copy()
+        batch.scalar = {index: Version.parse(string) for index, string in enumerate(strings)}
+        bumped_build = np.zeros(len(batch), dtype=bool)
+        if validate:
+            valid = np.zeros(len(batch), dtype=bool)
+    else:
+        bumped_build = _run(plan, result)
+        if validate:
+            relation = compare(result, batch)
+            valid = (relation > 0) | (bumped_build & (relation == 0))
+    scalar_rows = np.fromiter(sorted(batch.scalar), dtype=np.int64, count=len(batch.scalar))
+    for index in scalar_rows.tolist():
+        original = batch.scalar[index]
+        version, last_bump_was_build = plan.execute(original)
+        result.scalar[index] = version
+        bumped_build[index] = last_bump_was_build
+        if valid is not None:
+            valid[index] = version > original or (last_bump_was_build and version >= original)
+    return BatchResult(
+        versions=result, bumped_build=bumped_build, valid=valid, scalar_rows=scalar_rows
+    )
@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+
+"""
+Infers the bump of the `auto` instruction from the
+[conventional commits](https://www.conventionalcommits.org) since the last release tag.
+
+A commit whose header is `feat: ...` or `feat(scope): ...` bumps the minor version,
+`fix:` and `perf:` bump the patch version. A `!` before the colon (`feat!: ...`) or a
+`BREAKING CHANGE:` (or `BREAKING-CHANGE:`) footer bumps the major version, whatever the type.
+Other types and messages bump nothing. The most significant bump of all commits wins.
+
+The commits are streamed from `git log` line by line, and `git` is stopped as soon as
+a breaking change decides the result. The last release tag is the highest tag with
+a release version, found without running git (see `hatch_semver.git_tags.TagIndex`).
+
+A checkpoint in the git directory remembers the newest commit examined and the strongest
+bump found up to it, so a later run on the same branch only reads the commits added since,
+and no commit at all if `HEAD` did not move or the checkpoint already holds a major bump.
+The checkpoint is ignored if the release tag, the tag prefix or the types changed,
+or if its commit is no ancestor of `HEAD` anymore, e.g. after a rebase.
+
+Configure it in the `auto` table of `[tool.hatch.version]`:
+
+```toml
+[tool.hatch.version.auto]
+source = "commits"
+tag-prefix = "v"  # default: none
+types = { refactor = "patch", perf = "" }  # merged into `TYPES`
+```
+"""
+
+import json
+import os
+import re
+import subprocess
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from .fragments import RANKS, auto_table, types_for
+from .git_tags import TagIndex, common_dir, find_git_dir
+from .vcs import read_head, resolve_ref
+
+CHECKPOINT_FILE = "hatch-semver-commits.json"
+"""
+Name of the checkpoint file in the git directory.
+"""
+TYPES = {"feat": "minor", "fix": "patch", "perf": "patch"}
+"""
+Default bump of each commit type, an empty string means no bump.
+"""
+SEPARATOR = "\x1e"
+"""
+Starts the first line of every commit in the `git log` output, followed by the hash and subject.
+"""
+LOG_FORMAT = f"--format={SEPARATOR}%H %s%n%b"
+HEADER = re.compile(r"^(?P<type>[A-Za-z][\w-]*)(?:\([^()\r\n]*\))?(?P<breaking>!)?: ")
+BREAKING_FOOTERS = ("BREAKING CHANGE:", "BREAKING-CHANGE:")
+
+
+@dataclass(frozen=True)
+class Inference:
+    """
+    The result of scanning the commits since the last release tag.
+    """
+
+    part: Optional[str]
+    """
+    The inferred bump: `major`, `minor`, `patch`, or *None* if no commit calls for one.
+    """
+    commit: Optional[str]
+    """
+    Hash of the newest commit which called for *part*, *None* if it was found in an earlier run.
+    """
+    scanned: int
+    """
+    Number of commits read from `git log`, fewer than since the tag if the scan stopped early
+    or started at the checkpoint.
+    """
+    since: Optional[str]
+    """
+    Hash of the checkpoint commit the scan started from, *None* if all commits since
+    the tag were scanned.
+    """
+
+
+def classify(subject: str, types: Mapping[str, str]) -> str:
+    """
+    Returns the bump a commit *subject* (the first line of its message) calls for:
+    `major`, `minor`, `patch`, or an empty string for no bump.
+    """
+    match = HEADER.match(subject)
+    if match is None:
+        return ""
+    if match.group("breaking"):
+        return "major"
+    return types.get(match.group("type").lower(), "")
+
+
+def scan(lines: Iterable[str], types: Mapping[str, str] = TYPES) -> tuple[str, Optional[str], int]:
+    """
+    Reads `git log` output in the `LOG_FORMAT` and returns the most significant bump,
+    the hash of the newest commit calling for it and the number of commits read.
+    Stops reading at the first breaking change.
+    """
+    best, commit, scanned = "", None, 0
+    sha = None
+    for line in lines:
+        if line.startswith(SEPARATOR):
+            scanned += 1
+            sha, _, subject = line[1:].rstrip("\n").partition(" ")
+            bump = classify(subject, types)
+        elif line.startswith(BREAKING_FOOTERS):
+            bump = "major"
+        else:
+            continue
+        if bump and RANKS[bump] > RANKS[best]:
+            best, commit = bump, sha
+            if bump == "major":
+                break
+    return best, commit, scanned
+
+
+def git(root: str, *args: str) -> subprocess.Popen:
+    """
+    Starts `git` in *root* with its output piped.
+
+    ### Raises
+    `ValueError` if git is not installed.
+    """
+    try:
+        return subprocess.Popen(
+            ("git", "-C", root, *args),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            encoding="utf-8",
+            errors="replace",
+        )
+    except FileNotFoundError as e:
+        raise ValueError("inferring the bump from commits needs git") from e
+
+
+def is_ancestor(root: str, ancestor: str, commit: str) -> bool:
+    """
+    Information whether *ancestor* is *commit* or one of its ancestors.
+    """
+    process = git(root, "merge-base", "--is-ancestor", ancestor, commit)
+    process.communicate()
+    return process.returncode == 0
+
+
+def stream(
+    root: str, revisions: list[str], types: Mapping[str, str]
+) -> tuple[str, Optional[str], int]:
+    """
+    Runs `git log` on *revisions* and `scan`s its output as it arrives.
+    `git` is killed if the scan stops before the end of the output.
+
+    ### Raises
+    `ValueError` if `git log` fails.
+    """
+    process = git(root, "log", "--no-color", "--no-show-signature", LOG_FORMAT, *revisions)
+    assert process.stdout is not None and process.stderr is not None
+    try:
+        result = scan(process.stdout, types)
+    finally:
+        if process.poll() is None:
+            process.kill()
+        process.stdout.close()
+        error = process.stderr.read()
+        process.stderr.close()
+        process.wait()
+    if result[0] != "major" and process.returncode:
+        raise ValueError(f"git log failed: {error.strip()}")
+    return result
+
+
+class Checkpoints:
+    """
+    The checkpoint file of a git directory, with one checkpoint per tag prefix.
+    """
+
+    def __init__(self, git_dir: str) -> None:
+        self.path = os.path.join(git_dir, CHECKPOINT_FILE)
+
+    def load(self) -> dict[str, Any]:
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                checkpoints = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        return checkpoints if isinstance(checkpoints, dict) else {}
+
+    def get(self, prefix: str) -> Optional[dict[str, Any]]:
+        checkpoint = self.load().get(prefix)
+        return checkpoint if isinstance(checkpoint, dict) else None
+
+    def save(self, prefix: str, checkpoint: dict[str, Any]) -> None:
+        checkpoints = self.load()
+        checkpoints[prefix] = checkpoint
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary, "w", encoding="utf-8") as file:
+                json.dump(checkpoints, file)
+            os.replace(temporary, self.path)
+        except OSError:
+            # a read-only repository just does not get a checkpoint
+            pass
+
+
+def infer(
+    root: str,
+    prefix: str = "",
+    types: Mapping[str, str] = TYPES,
+    use_checkpoint: bool = True,
+) -> Inference:
+    """
+    Scans the commits of the repository containing *root* since its last release tag
+    and returns the most significant bump they call for.
+
+    ### Parameters
+    - *root*: a path inside the repository.
+    - *prefix*: only tags starting with this prefix are release tags, e.g. `v` for `v1.2.3`.
+    - *types*: the bump of each commit type.
+    - *use_checkpoint*: whether to start from and update the checkpoint in the git directory.
+
+    ### Raises
+    `ValueError` if *root* is not inside a git repository, it has no commits,
+    or `git log` fails.
+    """
+    try:
+        git_dir = find_git_dir(root)
+    except FileNotFoundError as e:
+        raise ValueError(f"inferring the bump from commits needs a git repository: {e}") from e
+    head, _ = read_head(git_dir)
+    tags = TagIndex(root, prefix)
+    release = tags.latest(include_prereleases=False)
+    tag = None if release is None else tags.tag(release)
+    base = None if tag is None else resolve_ref(common_dir(git_dir), f"refs/tags/{tag}")
+    key = {"base": base, "types": dict(sorted(types.items()))}
+    checkpoints = Checkpoints(git_dir)
+    checkpoint = checkpoints.get(prefix) if use_checkpoint else None
+    since = None
+    best, commit, scanned = "", None, 0
+    if checkpoint is not None and all(checkpoint.get(k) == v for k, v in key.items()):
+        if checkpoint.get("head") == head or is_ancestor(root, str(checkpoint["head"]), head):
+            since, best = checkpoint["head"], checkpoint.get("part", "")
+            if best not in RANKS:
+                since, best = None, ""
+    if since != head and best != "major":
+        revisions = [head] + ([f"^{since}"] if since else []) + ([f"^{base}"] if base else [])
+        found, commit, scanned = stream(root, revisions, types)
+        if RANKS[found] > RANKS[best]:
+            best = found
+        else:
+            commit = None
+    if use_checkpoint:
+        checkpoints.save(prefix, {**key, "head": head, "part": best})
+    return Inference(best or None, commit, scanned, since)
+
+
+def infer_part(root: str, config: Mapping[str, Any]) -> str:
+    """
+    Returns the bump of the `auto` instruction for the project in *root* with
+    the `[tool.hatch.version]` table *config*.
+
+    ### Raises
+    `ValueError` if no commit since the last release tag calls for a bump,
+    or the `auto` table is invalid.
+    """
+    prefix = auto_table(config).get("tag-prefix", "")
+    inference = infer(root, prefix, types_for(config, TYPES))
+    if inference.part is None:
+        raise ValueError(f"No commit since the last release tag (prefix `{prefix}`) calls for a bump")
+    return inference.part
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+
+"""
+Building blocks for state shared between threads.
+
+`hatch_semver.semver_scheme.SemverScheme` is safe to use from many threads at once,
+also on free-threaded CPython builds. Its process-wide caches
+(`hatch_semver.bump_plan.plan_cache` and `hatch_semver.parse_cache.version_cache`)
+answer hits without taking a lock: a hit is a dictionary lookup, a store into the
+entry's *referenced* flag and an increment of a per-thread counter. Only misses take the
+cache's lock, to insert the new entry and evict old ones.
+
+Eviction approximates LRU with the CLOCK (second chance) algorithm: the oldest entry is
+evicted unless it was used since it was inserted or last spared, in which case it moves
+to the back of the queue.
+"""
+
+import weakref
+from threading import RLock, local
+
+
+class _Owner:
+    """
+    Lives in a thread's local storage as long as the thread does,
+    see `ThreadCounter`.
+    """
+
+    __slots__ = ("__weakref__",)
+
+
+def _retire(lock: RLock, cells: dict[int, list[int]], base: list[int], cell: list[int]) -> None:
+    with lock:
+        base[0] += cell[0]
+        del cells[id(cell)]
+
+
+class ThreadCounter:
+    """
+    A counter which threads increment without contending for a lock or a shared memory location:
+    every thread counts in its own cell, `value` adds them up.
+    When a thread ends, its count is added to a base count and its cell is dropped,
+    so a process starting many threads holds one cell per live thread only.
+    """
+
+    def __init__(self) -> None:
+        self._local = local()
+        self._cells: dict[int, list[int]] = {}
+        self._base = [0]
+        # reentrant: a cell may be retired by the thread holding the lock
+        self._lock = RLock()
+
+    def increment(self) -> None:
+        """
+        Adds one to the calling thread's count.
+        """
+        try:
+            self._local.cell[0] += 1
+        except AttributeError:
+            cell = [1]
+            owner = _Owner()
+            with self._lock:
+                self._cells[id(cell)] = cell
+            # no reference to self, the counter may be dropped before its threads end
+            weakref.finalize(owner, _retire, self._lock, self._cells, self._base, cell)
+            self._local.owner = owner
+            self._local.cell = cell
+
+    @property
+    def value(self) -> int:
+        """
+        The sum of all threads' counts.
+        """
+        with self._lock:
+            return self._base[0] + sum(cell[0] for cell in list(self._cells.values()))
+
+    def reset(self) -> None:
+        """
+        Sets all threads' counts to 0.
+        """
+        with self._lock:
+            self._base[0] = 0
+            for cell in self._cells.values():
+                cell[0] = 0
+
+
+def evict(entries: dict, maxsize: int, referenced: int) -> list:
+    """
+    Evicts entries of the dictionary *entries* (oldest first) until it has at most *maxsize*,
+    giving entries which were used since they were inserted a second chance.
+    The caller must hold the lock of the cache.
+
+    ### Parameters
+    - *entries*: maps keys to mutable entries (lists), in insertion order.
+    - *maxsize*: the maximum number of entries.
+    - *referenced*: index of the entries' flag which is set on every hit.
+
+    ### Return
+    The evicted entries.
+    """
+    evicted = []
+    while len(entries) > maxsize:
+        key = next(iter(entries))
+        entry = entries.pop(key)
+        if entry[referenced]:
+            entry[referenced] = False
+            entries[key] = entry
+        else:
+            evicted.append(entry)
+    return evicted
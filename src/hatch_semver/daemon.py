@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+
+"""
+A long-running process answering version requests over a Unix domain socket.
+
+Starting Python and importing hatchling and semver takes far longer than a bump.
+The daemon pays for it once and keeps a warm `hatch_semver.semver_scheme.SemverScheme`
+per project configuration, for up to `MAX_SCHEMES` configurations. Clients (see `hatch_semver.client`) send one JSON object per line
+and get one JSON object per line back; a connection can carry any number of requests.
+
+Requests:
+
+| `op`       | Fields                                                 | Response fields           |
+| ---------- | ------------------------------------------------------ | ------------------------- |
+| `update`   | *instructions*, *version*, *config* (opt.), *root* (opt.) | *version*               |
+| `validate` | *new*, *old*, *bumped_build* (opt.)                    | *valid*, *error* if not   |
+| `ping`     |                                                        |                           |
+| `shutdown` |                                                        |                           |
+
+Every response has *ok*. If it is *false*, *error* holds the message and *type* the name
+of the exception, e.g. `ValidationError` or `ValueError`.
+
+Requests are answered one at a time on the event loop, as a bump takes microseconds;
+the `index-url` option (see `hatch_semver.index`) blocks it for the index request.
+The daemon exits after no client was connected for the idle timeout.
+Build metadata from the git repository (see `hatch_semver.vcs`) is read anew for every
+`update` request, as commits and checkouts happen while the daemon runs.
+"""
+
+import asyncio
+import json
+import os
+import socket
+from typing import Any, Optional
+
+from . import vcs
+from .client import default_socket_path
+from .concurrency import evict
+from .errors import ValidationError
+from .parse_cache import parse_version
+from .semver_scheme import SemverScheme
+
+IDLE_TIMEOUT = 600.0
+"""
+Seconds without any connected client after which the daemon exits.
+"""
+MAX_SCHEMES = 64
+"""
+Number of warm schemes kept, evicting approximately the least recently used ones.
+"""
+REQUIRED_FIELDS = {"update": ("instructions", "version"), "validate": ("new", "old")}
+
+
+class VersionDaemon:
+    """
+    The request handling state of the daemon.
+
+    ### Parameters
+    - *path*: the Unix domain socket to listen on.
+    - *idle_timeout*: seconds without connected clients after which `serve` returns.
+    """
+
+    def __init__(self, path: str, idle_timeout: float = IDLE_TIMEOUT) -> None:
+        self.path = path
+        self.idle_timeout = idle_timeout
+        self.requests = 0
+        """
+        Number of requests answered.
+        """
+        # (root, config) -> [scheme, referenced since inserted or spared by the eviction]
+        self._schemes: dict[tuple[str, str], list] = {}
+        self._writers: set[asyncio.StreamWriter] = set()
+        self._handlers: set[asyncio.Task] = set()
+        self._last_activity = 0.0
+        self._stopped: Optional[asyncio.Event] = None
+
+    def scheme(self, root: str, config: dict) -> SemverScheme:
+        """
+        Returns the warm `SemverScheme` for a project root and configuration.
+        """
+        key = root, json.dumps(config, sort_keys=True)
+        entry = self._schemes.get(key)
+        if entry is not None:
+            entry[1] = True
+            return entry[0]
+        scheme = SemverScheme(root, config)
+        # requests are answered one at a time, so no lock is needed
+        self._schemes[key] = [scheme, False]
+        evict(self._schemes, MAX_SCHEMES, 1)
+        return scheme
+
+    def answer(self, request: dict[str, Any]) -> dict[str, Any]:
+        """
+        Computes the response to a single request.
+        """
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "A request must be a JSON object", "type": "ValueError"}
+        op = request.get("op")
+        try:
+            # read the fields first, a KeyError raised by the scheme is no missing field
+            fields = [request[name] for name in REQUIRED_FIELDS.get(op, ())]
+        except KeyError as e:
+            return {"ok": False, "error": f"Missing field {e}", "type": "ValueError"}
+        try:
+            if op == "update":
+                vcs.read_vcs_info.cache_clear()
+                scheme = self.scheme(request.get("root", "."), request.get("config", {}))
+                instructions, version = fields
+                return {"ok": True, "version": scheme.update(instructions, version, {})}
+            if op == "validate":
+                scheme = self.scheme(request.get("root", "."), request.get("config", {}))
+                new, old = map(parse_version, fields)
+                try:
+                    scheme.validate_bump(new, old, request.get("bumped_build", False))
+                except ValidationError as e:
+                    return {"ok": True, "valid": False, "error": str(e)}
+                return {"ok": True, "valid": True}
+            if op == "ping":
+                return {"ok": True}
+            if op == "shutdown":
+                assert self._stopped is not None
+                self._stopped.set()
+                return {"ok": True}
+            raise ValueError(f"Unknown op `{op}`")
+        except Exception as e:
+            return {"ok": False, "error": str(e), "type": type(e).__name__}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._writers.add(writer)
+        self._handlers.add(asyncio.current_task())  # type: ignore[arg-type]
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError as e:
+                    response = {"ok": False, "error": f"Invalid JSON: {e}", "type": "ValueError"}
+                else:
+                    response = self.answer(request)
+                self.requests += 1
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._writers.discard(writer)
+            self._handlers.discard(asyncio.current_task())  # type: ignore[arg-type]
+            self._last_activity = asyncio.get_running_loop().time()
+            writer.close()
+
+    async def _watch_idle(self) -> None:
+        loop = asyncio.get_running_loop()
+        assert self._stopped is not None
+        while not self._stopped.is_set():
+            remaining = self._last_activity + self.idle_timeout - loop.time()
+            if not self._writers and remaining <= 0:
+                self._stopped.set()
+                return
+            await asyncio.sleep(max(min(remaining, 1.0), 0.01))
+
+    async def serve(self) -> None:
+        """
+        Listens on the socket until shut down or idle for `idle_timeout` seconds.
+        """
+        remove_stale_socket(self.path)
+        self._stopped = asyncio.Event()
+        self._last_activity = asyncio.get_running_loop().time()
+        server = await asyncio.start_unix_server(self.handle, path=self.path)
+        watcher = asyncio.ensure_future(self._watch_idle())
+        try:
+            await self._stopped.wait()
+        finally:
+            watcher.cancel()
+            server.close()
+            # closing the connections lets the handlers read EOF and return
+            for writer in list(self._writers):
+                writer.close()
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+            await server.wait_closed()
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+
+def remove_stale_socket(path: str) -> None:
+    """
+    Removes the socket file *path* if no daemon listens on it.
+
+    ### Raises
+    `RuntimeError` if a daemon is already listening on *path*.
+    """
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+    else:
+        raise RuntimeError(f"A daemon is already listening on {path}")
+    finally:
+        probe.close()
+
+
+def serve(path: Optional[str] = None, idle_timeout: float = IDLE_TIMEOUT) -> None:
+    """
+    Runs a `VersionDaemon` on *path* (default: `hatch_semver.client.default_socket_path`)
+    until it is shut down or idle.
+    """
+    asyncio.run(VersionDaemon(path or default_socket_path(), idle_timeout).serve())
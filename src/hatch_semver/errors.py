@@ -20,3 +20,12 @@ class ValidationError(HatchSemverError):
     """
 
     pass
+
+
+class DependencyCycleError(HatchSemverError):
+    """
+    Raised if the dependencies between projects form a cycle,
+    so their bumps cannot be ordered.
+    """
+
+    pass
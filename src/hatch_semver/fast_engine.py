@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+
+"""
+An alternative engine for executing a `hatch_semver.bump_plan.BumpPlan`.
+
+The default engine calls `semver.Version` methods which create a new `semver.Version`
+object on every step. This engine converts the original version once into a mutable
+`CompactVersion` and updates it in place, mirroring the semantics of python-semver's
+`next_version`, `bump_prerelease`, `bump_build` and `finalize_version`.
+A `semver.Version` is only created for specific versions given in the chain and for
+the result.
+
+Enable it with `engine = "fast"` in the `[tool.hatch.version]` table.
+"""
+
+from typing import Optional
+
+from semver import Version
+
+from .bump_plan import BumpPlan, StepCallback, increment_string
+from .parse_cache import parse_version
+
+
+class CompactVersion:
+    """
+    A mutable, memory-compact representation of a semantic version.
+    """
+
+    __slots__ = ("major", "minor", "patch", "prerelease", "build")
+
+    def __init__(
+        self,
+        major: int,
+        minor: int,
+        patch: int,
+        prerelease: Optional[str] = None,
+        build: Optional[str] = None,
+    ) -> None:
+        self.major = major
+        self.minor = minor
+        self.patch = patch
+        self.prerelease = prerelease
+        self.build = build
+
+    @classmethod
+    def from_version(cls, version: Version) -> "CompactVersion":
+        """
+        Creates a `CompactVersion` from a `semver.Version`.
+        """
+        return cls(version.major, version.minor, version.patch, version.prerelease, version.build)
+
+    def to_version(self) -> Version:
+        """
+        Creates a `semver.Version` from this `CompactVersion`.
+        """
+        return Version(self.major, self.minor, self.patch, self.prerelease, self.build)
+
+    def __str__(self) -> str:
+        version = f"{self.major}.{self.minor}.{self.patch}"
+        if self.prerelease:
+            version += f"-{self.prerelease}"
+        if self.build:
+            version += f"+{self.build}"
+        return version
+
+    def assign(self, version: Version) -> None:
+        """
+        Overwrites all parts with the ones of *version*.
+        """
+        self.major = version.major
+        self.minor = version.minor
+        self.patch = version.patch
+        self.prerelease = version.prerelease
+        self.build = version.build
+
+    def same_precedence(self, version: Version) -> bool:
+        """
+        Information whether *version* has the same precedence, i.e. whether
+        it differs in nothing but the build identifier.
+        """
+        return (
+            self.major == version.major
+            and self.minor == version.minor
+            and self.patch == version.patch
+            and self.prerelease == version.prerelease
+        )
+
+    def finalize(self) -> None:
+        """
+        Removes the prerelease and build identifiers.
+        """
+        self.prerelease = None
+        self.build = None
+
+    def bump_prerelease(self, token: Optional[str]) -> None:
+        """
+        Increments the prerelease identifier and removes the build identifier.
+        Mirrors `semver.Version.bump_prerelease`.
+        """
+        if self.prerelease is not None:
+            prerelease = self.prerelease
+        elif token == "":
+            prerelease = "0"
+        elif token is None:
+            prerelease = "rc.0"
+        else:
+            prerelease = token + ".0"
+        self.prerelease = increment_string(prerelease, 1)
+        self.build = None
+
+    def bump_build(self, token: Optional[str], increment: int = 1) -> None:
+        """
+        Increments the build identifier *increment* times.
+        Mirrors `semver.Version.bump_build`.
+        """
+        if self.build is not None:
+            build = self.build
+        elif token == "":
+            build = "0"
+        elif token is None:
+            build = "build.0"
+        else:
+            build = token + ".0"
+        self.build = increment_string(build, increment)
+
+    def next_version(self, part: str, token: Optional[str]) -> None:
+        """
+        Bumps *part* preserving the natural order. Mirrors `semver.Version.next_version`.
+        """
+        if (self.prerelease or self.build) and (
+            part == "patch"
+            or (part == "minor" and self.patch == 0)
+            or (part == "major" and self.minor == self.patch == 0)
+        ):
+            self.finalize()
+            return
+        if part == "major":
+            self.major += 1
+            self.minor = 0
+            self.patch = 0
+            self.finalize()
+        elif part == "minor":
+            self.minor += 1
+            self.patch = 0
+            self.finalize()
+        elif part == "patch":
+            self.patch += 1
+            self.finalize()
+        else:
+            if not self.prerelease:
+                self.patch += 1
+                self.finalize()
+            self.bump_prerelease(token)
+
+
+def execute(
+    plan: BumpPlan, original_version: Version, on_step: Optional[StepCallback] = None
+) -> tuple[Version, bool]:
+    """
+    Applies *plan* to *original_version*. Gives the same results as
+    `hatch_semver.bump_plan.BumpPlan.execute`, *on_step* gets the `CompactVersion`.
+    """
+    current = CompactVersion.from_version(original_version)
+    rc_bumps_patch = True
+    last_bump_was_build = False
+    for index, bi in enumerate(plan.steps):
+        last_bump_was_build = False
+        if bi.version_part == "build":
+            current.bump_build(bi.token, bi.repeat)
+            last_bump_was_build = True
+        elif bi.version_part == "release":
+            current.finalize()
+            rc_bumps_patch = True
+        elif bi.is_specific:
+            specific_version = parse_version(bi.version_part)
+            if current.same_precedence(specific_version):
+                last_bump_was_build = True
+            current.assign(specific_version)
+            rc_bumps_patch = False
+        else:
+            if not rc_bumps_patch and bi.version_part == "prerelease":
+                current.bump_prerelease(bi.token)
+                rc_bumps_patch = True
+            else:
+                current.next_version(bi.version_part, bi.token)
+                rc_bumps_patch = False
+        if on_step is not None:
+            on_step(index, bi, current)
+    return current.to_version(), last_bump_was_build
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+
+"""
+Infers the bump of the `auto` instruction from pending [towncrier](https://towncrier.readthedocs.io)
+news fragments.
+
+Fragments are classified by their file name alone, e.g. `123.feature.md` or `+cache.fixed.md`:
+the last dot-separated part of the name (after the first one) which is a known fragment
+type decides the bump. A name whose part before the type ends with `!`, e.g. `123!.feature.md`,
+marks a breaking change, which bumps the major version. The most significant bump of all
+fragments wins.
+
+The fragment directory is read in one `os.scandir` pass without opening any file, and the
+pass stops at the first fragment which calls for a major bump.
+
+Configure it in the `auto` table of `[tool.hatch.version]`:
+
+```toml
+[tool.hatch.version.auto]
+directory = "changelog.d"  # default: `directory` of [tool.towncrier], or changelog.d
+types = { feature = "minor", improved = "minor", doc = "" }  # merged into `TYPES`
+```
+"""
+
+import os
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Optional
+
+CONFIG_KEY = "auto"
+"""
+Name of the table in `[tool.hatch.version]` which configures the `auto` instruction.
+"""
+DEFAULT_DIRECTORY = "changelog.d"
+TYPES = {
+    "breaking": "major",
+    "removal": "major",
+    "feature": "minor",
+    "improved": "patch",
+    "fixed": "patch",
+    "doc": "",
+    "unimportant": "",
+}
+"""
+Default bump of each fragment type, an empty string means no bump.
+"""
+BREAKING_MARKER = "!"
+RANKS = {"": 0, "patch": 1, "minor": 2, "major": 3}
+
+
+@dataclass(frozen=True)
+class Inference:
+    """
+    The result of scanning a fragment directory.
+    """
+
+    part: Optional[str]
+    """
+    The inferred bump: `major`, `minor`, `patch`, or *None* if no fragment calls for one.
+    """
+    fragment: Optional[str]
+    """
+    Name of the first fragment which called for *part*.
+    """
+    scanned: int
+    """
+    Number of directory entries read, fewer than in the directory if the scan stopped early.
+    """
+
+
+def classify(name: str, types: Mapping[str, str]) -> Optional[str]:
+    """
+    Returns the bump a fragment file *name* calls for: `major`, `minor`, `patch`, an empty
+    string for no bump, or *None* if *name* is no fragment of one of the *types*.
+    """
+    parts = name.split(".")
+    for index in range(len(parts) - 1, 0, -1):
+        bump = types.get(parts[index])
+        if bump is not None:
+            if bump and parts[index - 1].endswith(BREAKING_MARKER):
+                return "major"
+            return bump
+    return None
+
+
+def infer(directory: str, types: Mapping[str, str] = TYPES) -> Inference:
+    """
+    Scans the fragment *directory* and returns the most significant bump its fragments call for.
+    A missing directory has no fragments.
+    """
+    best, fragment, scanned = "", None, 0
+    try:
+        entries = os.scandir(directory)
+    except FileNotFoundError:
+        return Inference(None, None, 0)
+    with entries:
+        for entry in entries:
+            scanned += 1
+            if entry.name.startswith(".") or not entry.is_file():
+                continue
+            bump = classify(entry.name, types)
+            if bump and RANKS[bump] > RANKS[best]:
+                best, fragment = bump, entry.name
+                if bump == "major":
+                    break
+    return Inference(best or None, fragment, scanned)
+
+
+def auto_table(config: Mapping[str, Any]) -> Mapping[str, Any]:
+    """
+    Returns the `auto` table of *config*, empty if there is none.
+
+    ### Raises
+    `ValueError` if `auto` is no table, e.g. `auto = true`.
+    """
+    auto = config.get(CONFIG_KEY, {})
+    if not isinstance(auto, Mapping):
+        raise ValueError(f"`{CONFIG_KEY}` must be a table, got {auto!r}")
+    return auto
+
+
+def types_for(config: Mapping[str, Any], defaults: Mapping[str, str] = TYPES) -> dict[str, str]:
+    """
+    Returns the *defaults* (the fragment `TYPES`) updated with the `types` of
+    the `auto` table of *config*.
+
+    ### Raises
+    `ValueError` if the `auto` table or its `types` are no table, or a type maps to
+    anything but `major`, `minor`, `patch` or an empty string.
+    """
+    configured = auto_table(config).get("types", {})
+    if not isinstance(configured, Mapping):
+        raise ValueError(f"`{CONFIG_KEY}.types` must be a table, got {configured!r}")
+    types = {**defaults, **configured}
+    for name, bump in types.items():
+        if bump not in RANKS:
+            raise ValueError(
+                f"Type `{name}` must bump `major`, `minor`, `patch` or nothing (``), not {bump!r}"
+            )
+    return types
+
+
+def directory_for(root: str, config: Mapping[str, Any]) -> str:
+    """
+    Returns the fragment directory of the project in *root*: the `directory` of the `auto`
+    table of *config*, otherwise the `directory` of `[tool.towncrier]` in `pyproject.toml`,
+    otherwise `changelog.d`.
+
+    ### Raises
+    `ValueError` if the `auto` table is no table.
+    """
+    directory = auto_table(config).get("directory")
+    if directory is None:
+        try:
+            from .workspace import PROJECT_FILE, tomllib
+
+            with open(os.path.join(root, PROJECT_FILE), "rb") as file:
+                towncrier = tomllib.load(file).get("tool", {}).get("towncrier", {})
+        except (OSError, ValueError):
+            towncrier = {}
+        directory = towncrier.get("directory", DEFAULT_DIRECTORY)
+    return os.path.join(root, directory)
+
+
+def infer_part(root: str, config: Mapping[str, Any]) -> str:
+    """
+    Returns the bump of the `auto` instruction for the project in *root* with
+    the `[tool.hatch.version]` table *config*.
+
+    ### Raises
+    `ValueError` if no fragment calls for a bump, or the `auto` table is invalid.
+    """
+    directory = directory_for(root, config)
+    inference = infer(directory, types_for(config))
+    if inference.part is None:
+        raise ValueError(f"No news fragment in {directory} calls for a bump")
+    return inference.part
@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+
+"""
+Finds the current version from the git tags of a repository.
+
+Instead of running `git tag | sort -V | tail -1`, the tags are read directly from
+`.git/packed-refs` and `.git/refs/tags` without starting any process.
+Tags are parsed into precedence keys (see `hatch_semver.precedence.VersionKey`) and kept
+in a sorted index, so sorting and lookups compare plain tuples. A `semver.Version` is only
+made for a version which is returned. The parts of the keys are cached in the git directory,
+keyed by the modification time and size of `packed-refs`, so later runs only parse tags
+they have not seen yet.
+"""
+
+import json
+import os
+from bisect import bisect_left, insort
+from typing import Optional
+
+from semver import Version
+
+from .precedence import VersionKey, key_from_parts, precedence_key
+
+CACHE_FILE = "hatch-semver-tags.json"
+"""
+Name of the cache file in the git directory.
+"""
+CACHE_FORMAT = 2
+"""
+Version of the cache file layout, caches of other layouts are ignored.
+"""
+TAGS_REF = "refs/tags/"
+
+
+def find_git_dir(path: str = ".") -> str:
+    """
+    Returns the git directory of the repository containing *path*.
+    Follows `.git` files of worktrees and submodules.
+
+    ### Raises
+    `FileNotFoundError` if *path* is not inside a git repository.
+    """
+    directory = os.path.abspath(path)
+    while True:
+        candidate = os.path.join(directory, ".git")
+        if os.path.isdir(candidate):
+            return candidate
+        if os.path.isfile(candidate):
+            with open(candidate, encoding="utf-8") as file:
+                content = file.read().strip()
+            if content.startswith("gitdir:"):
+                return os.path.normpath(os.path.join(directory, content[len("gitdir:") :].strip()))
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            raise FileNotFoundError(f"{path} is not inside a git repository")
+        directory = parent
+
+
+def common_dir(git_dir: str) -> str:
+    """
+    Returns the directory holding the refs shared by all worktrees of *git_dir*.
+    """
+    try:
+        with open(os.path.join(git_dir, "commondir"), encoding="utf-8") as file:
+            return os.path.normpath(os.path.join(git_dir, file.read().strip()))
+    except FileNotFoundError:
+        return git_dir
+
+
+def read_packed_tags(path: str) -> list[str]:
+    """
+    Returns the names of the tags listed in a `packed-refs` file.
+    """
+    names = []
+    try:
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                # skip the header and the peeled object ids (`^<sha>`) of annotated tags
+                if line.startswith(("#", "^")):
+                    continue
+                _, _, ref = line.rstrip("\n").partition(" ")
+                if ref.startswith(TAGS_REF):
+                    names.append(ref[len(TAGS_REF) :])
+    except FileNotFoundError:
+        pass
+    return names
+
+
+def read_loose_tags(refs_dir: str) -> list[str]:
+    """
+    Returns the names of the tags stored as files under `refs/tags`.
+    """
+    tags_dir = os.path.join(refs_dir, "refs", "tags")
+    names = []
+    for directory, _, files in os.walk(tags_dir):
+        prefix = os.path.relpath(directory, tags_dir).replace(os.sep, "/")
+        for file in files:
+            names.append(file if prefix == "." else f"{prefix}/{file}")
+    return names
+
+
+class TagIndex:
+    """
+    A sorted index of the versions found in the tags of a git repository.
+
+    ### Parameters
+    - *path*: a path inside the repository.
+    - *prefix*: only tags starting with this prefix are considered, the prefix is
+            stripped before parsing, e.g. `v` for tags like `v1.2.3`.
+    - *use_cache*: whether to read and write the cache file in the git directory.
+    """
+
+    def __init__(self, path: str = ".", prefix: str = "", use_cache: bool = True) -> None:
+        self.prefix = prefix
+        self.refs_dir = common_dir(find_git_dir(path))
+        self.cache_path: Optional[str] = (
+            os.path.join(self.refs_dir, CACHE_FILE) if use_cache else None
+        )
+        self.parsed_tags = 0
+        """
+        How many tags had to be parsed (i.e. were not found in the cache) while building the index
+        or by `TagIndex.add`.
+        """
+        self._entries: list[tuple[VersionKey, str]] = []
+        self._versions: dict[str, Version] = {}
+        self._build()
+
+    def _load_cache(self) -> dict:
+        if self.cache_path is None:
+            return {}
+        try:
+            with open(self.cache_path, encoding="utf-8") as file:
+                cache = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        if cache.get("format") != CACHE_FORMAT or cache.get("prefix") != self.prefix:
+            return {}
+        return cache
+
+    def _save_cache(self, cache: dict) -> None:
+        if self.cache_path is None:
+            return
+        temporary = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary, "w", encoding="utf-8") as file:
+                json.dump(cache, file)
+            os.replace(temporary, self.cache_path)
+        except OSError:
+            # a read-only repository just does not get a cache
+            pass
+
+    def _parse(self, name: str) -> Optional[list]:
+        """
+        Returns the major, minor and patch numbers and the pre-release of the version
+        in the tag *name*, *None* if it has none.
+        """
+        if not name.startswith(self.prefix):
+            return None
+        self.parsed_tags += 1
+        match = Version._REGEX.match(name[len(self.prefix) :])
+        if match is None:
+            return None
+        major, minor, patch, prerelease = match.group("major", "minor", "patch", "prerelease")
+        return [int(major), int(minor), int(patch), prerelease]
+
+    def _build(self) -> None:
+        cache = self._load_cache()
+        known: dict[str, Optional[list]] = cache.get("tags", {})
+        packed_refs = os.path.join(self.refs_dir, "packed-refs")
+        try:
+            status = os.stat(packed_refs)
+            stamp = [status.st_mtime_ns, status.st_size]
+        except FileNotFoundError:
+            stamp = None
+        if stamp is not None and stamp == cache.get("packed_refs"):
+            packed = cache.get("packed", [])
+        else:
+            packed = read_packed_tags(packed_refs)
+        names = set(packed) | set(read_loose_tags(self.refs_dir))
+        tags = {name: known[name] if name in known else self._parse(name) for name in names}
+        self._entries = sorted(
+            (key_from_parts(*parts), name) for name, parts in tags.items() if parts
+        )
+        if self.parsed_tags or stamp != cache.get("packed_refs") or len(tags) != len(known):
+            self._save_cache(
+                {
+                    "format": CACHE_FORMAT,
+                    "prefix": self.prefix,
+                    "packed_refs": stamp,
+                    "packed": packed,
+                    "tags": tags,
+                }
+            )
+
+    def _version(self, name: str) -> Version:
+        version = self._versions.get(name)
+        if version is None:
+            version = self._versions[name] = Version.parse(name[len(self.prefix) :])
+        return version
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def versions(self) -> list[Version]:
+        """
+        All versions found in the tags, in ascending order of precedence.
+        """
+        return [self._version(name) for _, name in self._entries]
+
+    def add(self, name: str) -> None:
+        """
+        Adds a tag to the index (but not to the repository), keeping the index sorted.
+        """
+        parts = self._parse(name)
+        if parts:
+            insort(self._entries, (key_from_parts(*parts), name))
+
+    def latest(self, include_prereleases: bool = True) -> Optional[Version]:
+        """
+        Returns the highest version, or *None* if there is no tag with a valid version.
+        """
+        if include_prereleases:
+            return self._version(self._entries[-1][1]) if self._entries else None
+        for key, name in reversed(self._entries):
+            if key.prerelease[0]:
+                return self._version(name)
+        return None
+
+    def latest_below(self, bound: Version) -> Optional[Version]:
+        """
+        Returns the highest version lower than *bound*, found by bisection.
+        """
+        position = bisect_left(self._entries, (precedence_key(bound),))
+        return self._version(self._entries[position - 1][1]) if position else None
+
+    def tag(self, version: Version) -> Optional[str]:
+        """
+        Returns the name of a tag with the same precedence as *version*.
+        """
+        key = precedence_key(version)
+        position = bisect_left(self._entries, (key,))
+        if position < len(self._entries) and self._entries[position][0] == key:
+            return self._entries[position][1]
+        return None
+
+
+def latest_version(
+    path: str = ".", prefix: str = "", include_prereleases: bool = True
+) -> Optional[str]:
+    """
+    Returns the highest version found in the tags of the repository containing *path*,
+    e.g. to be passed as *original_version* to
+    `hatch_semver.semver_scheme.SemverScheme.update`.
+    *None* if no tag holds a valid semantic version.
+    """
+    version = TagIndex(path, prefix).latest(include_prereleases)
+    return None if version is None else str(version)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+
+"""
+Audits release histories.
+
+A release history is valid if every version is higher than the one before it,
+by the same rules as `hatch_semver.semver_scheme.SemverScheme.validate_bump`:
+a version of equal precedence is only accepted if its build metadata changed,
+i.e. if it was a build bump.
+
+The versions are read in chunks. Each version is parsed once into a precedence key
+(see `hatch_semver.precedence.precedence_key`) and the keys of a chunk are compared
+with their predecessors in one pass, so a history of any length can be streamed
+and no exception is raised for a violation.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from itertools import compress, islice
+from operator import eq, lt, ne
+from typing import Optional
+
+from semver import Version
+
+from .precedence import key_from_parts
+
+CHUNK_SIZE = 8192
+"""
+Number of versions compared in one pass.
+"""
+
+
+@dataclass(frozen=True)
+class Violation:
+    """
+    A version which is not a valid successor of the version before it.
+    """
+
+    index: int
+    """
+    Position of the version in the history.
+    """
+    version: str
+    """
+    The offending version.
+    """
+    previous: str
+    """
+    The version before it (invalid entries are skipped).
+    """
+    relation: str
+    """
+    `lower` if the version has a lower precedence than the previous one,
+    `equal` if it has the same precedence and the same build metadata.
+    """
+
+
+@dataclass(frozen=True)
+class HistoryReport:
+    """
+    The outcome of `check_history`.
+    """
+
+    count: int
+    """
+    Number of versions in the history.
+    """
+    violations: tuple[Violation, ...]
+    """
+    The versions which are not higher than their predecessors, in the order of the history.
+    """
+    invalid: tuple[int, ...]
+    """
+    Indices of the entries which are not valid semantic versions.
+    They are skipped, the entry after one is compared with the last valid version.
+    """
+
+    @property
+    def ok(self) -> bool:
+        """
+        Information whether the history is valid.
+        """
+        return not self.violations and not self.invalid
+
+
+def check_history(versions: Iterable[str], chunk_size: int = CHUNK_SIZE) -> HistoryReport:
+    """
+    Checks that every version in *versions* (oldest first) is higher than the one before it.
+
+    ### Parameters
+    - *versions*: the released versions in the order of their release.
+            Any iterable, e.g. the lines of a file, which is consumed in chunks.
+    - *chunk_size*: number of versions compared in one pass.
+
+    ### Return
+    A `HistoryReport` with every violation.
+    """
+    regex = Version._REGEX
+    violations: list[Violation] = []
+    invalid: list[int] = []
+    # index, string, precedence key and build of the last valid version
+    previous: Optional[tuple[int, str, tuple, Optional[str]]] = None
+    count = 0
+    iterator = iter(versions)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            break
+        indices, strings, keys, builds = [], [], [], []
+        for index, string in enumerate(chunk, count):
+            string = string.strip()
+            match = regex.match(string)
+            if match is None:
+                invalid.append(index)
+                continue
+            major, minor, patch, prerelease, build = match.groups()
+            indices.append(index)
+            strings.append(string)
+            keys.append(key_from_parts(major, minor, patch, prerelease))
+            builds.append(build)
+        count += len(chunk)
+        if not keys:
+            continue
+        if previous is not None:
+            indices.insert(0, previous[0])
+            strings.insert(0, previous[1])
+            keys.insert(0, previous[2])
+            builds.insert(0, previous[3])
+        new_keys, old_keys = keys[1:], keys[:-1]
+        lower = list(map(lt, new_keys, old_keys))
+        equal = list(map(eq, new_keys, old_keys))
+        build_changed = map(ne, builds[1:], builds[:-1])
+        failed = [
+            low or (same and not changed) for low, same, changed in zip(lower, equal, build_changed)
+        ]
+        for position in compress(range(len(failed)), failed):
+            violations.append(
+                Violation(
+                    index=indices[position + 1],
+                    version=strings[position + 1],
+                    previous=strings[position],
+                    relation="lower" if lower[position] else "equal",
+                )
+            )
+        previous = indices[-1], strings[-1], keys[-1], builds[-1]
+    return HistoryReport(count=count, violations=tuple(violations), invalid=tuple(invalid))
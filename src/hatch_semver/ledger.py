@@ -0,0 +1,302 @@
+#!/usr/bin/env python
+
+"""
+An append-only ledger of every version ever released, for checking that no version is reused.
+
+The ledger is a single binary file which is memory-mapped, so a lookup reads a few pages
+instead of loading all records:
+
+| Section | Content                                                                |
+| ------- | ---------------------------------------------------------------------- |
+| header  | magic `HSLEDG01`, number of slots, number of records, size of the heap |
+| slots   | open-addressing hash table of fixed-width slots: hash, offset, length |
+| heap    | the records `<project>\\0<version>` as UTF-8, one after the other     |
+
+Records are only ever added. A new record is appended to the heap, then its slot is written,
+then the header, under an exclusive lock of `<ledger>.lock`, so concurrent writers do not
+lose records. When the table is half full, it is rewritten with twice the slots into a new
+file which replaces the old one; readers pick it up on their next `ReleaseLedger.reload`.
+
+Enable the check with the `ledger` option in the `[tool.hatch.version]` table,
+see `hatch_semver.semver_scheme.SemverScheme.validate_bump`.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from threading import Lock
+from typing import NamedTuple, Optional
+
+from .names import normalize_name
+
+MAGIC = b"HSLEDG01"
+HEADER = struct.Struct("<8sIIQ")
+"""
+Magic, number of slots, number of records, size of the heap in bytes.
+"""
+SLOT = struct.Struct("<QQI4x")
+"""
+Hash of the record, offset of the record in the heap, length of the record (0: empty slot).
+"""
+INITIAL_SLOTS = 1024
+
+
+def record(project: str, version: str) -> bytes:
+    """
+    Returns the ledger record of *version* of *project*.
+    The project name is normalized like on a package index (PEP 503).
+    """
+    return f"{normalize_name(project)}\0{version}".encode()
+
+
+def record_hash(data: bytes) -> int:
+    """
+    Returns the 64-bit hash of a record, which is stable across processes.
+    """
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """
+    Holds an exclusive lock of the file *path*, creating it if necessary.
+    """
+    with open(path, "a+b") as file:
+        try:
+            import fcntl
+        except ImportError:  # no cov
+            import msvcrt
+
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+class Snapshot(NamedTuple):
+    """
+    The content of a ledger file at one point in time.
+    """
+
+    map: mmap.mmap
+    slots: int
+    count: int
+    heap_size: int
+
+    def find(self, data: bytes) -> tuple[bool, int]:
+        """
+        Returns whether the record *data* is in the ledger, and its slot or the empty slot
+        to put it in.
+        """
+        wanted = record_hash(data)
+        heap = HEADER.size + self.slots * SLOT.size
+        slot = wanted % self.slots
+        while True:
+            hashed, offset, length = SLOT.unpack_from(self.map, HEADER.size + slot * SLOT.size)
+            if not length:
+                return False, slot
+            if hashed == wanted and self.map[heap + offset : heap + offset + length] == data:
+                return True, slot
+            slot = (slot + 1) % self.slots
+
+
+class ReleaseLedger:
+    """
+    Reads and appends to the ledger file *path*. A missing or empty file is an empty ledger.
+
+    Lookups see the ledger as it was when it was opened or last reloaded;
+    `add` always reloads first, so it never adds a record twice.
+    A ledger can be shared by threads: `reload` and `add` swap in a new `Snapshot`
+    while lookups keep using the one they started with.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._snapshot: Optional[Snapshot] = None
+        self._lock = Lock()
+        self.reload()
+
+    def reload(self) -> None:
+        """
+        Maps the current content of the ledger file.
+        """
+        try:
+            with open(self.path, "rb") as file:
+                if not os.fstat(file.fileno()).st_size:
+                    # e.g. touched, or its first write was interrupted
+                    self._snapshot = None
+                    return
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            self._snapshot = None
+            return
+        magic, slots, count, heap_size = HEADER.unpack_from(mapped)
+        if magic != MAGIC:
+            mapped.close()
+            raise ValueError(f"{self.path} is not a release ledger")
+        # the previous map is unmapped when the last lookup using it is done
+        self._snapshot = Snapshot(mapped, slots, count, heap_size)
+
+    def close(self) -> None:
+        """
+        Unmaps the ledger file. No other thread may use the ledger at the same time.
+        """
+        if self._snapshot is not None:
+            self._snapshot.map.close()
+        self._snapshot = None
+
+    def __enter__(self) -> "ReleaseLedger":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        snapshot = self._snapshot
+        return 0 if snapshot is None else snapshot.count
+
+    def released(self, project: str, version: str) -> bool:
+        """
+        Returns whether *version* of *project* is in the ledger.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or not snapshot.count:
+            return False
+        return snapshot.find(record(project, version))[0]
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        """
+        Yields the (normalized project name, version) of every record, in the order they were added.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return
+        start = HEADER.size + snapshot.slots * SLOT.size
+        records = []
+        for slot in range(snapshot.slots):
+            _, offset, length = SLOT.unpack_from(snapshot.map, HEADER.size + slot * SLOT.size)
+            if length:
+                records.append((offset, length))
+        for offset, length in sorted(records):
+            data = snapshot.map[start + offset : start + offset + length]
+            name, _, version = data.partition(b"\0")
+            yield name.decode(), version.decode()
+
+    def add(self, project: str, version: str) -> bool:
+        """
+        Records *version* of *project*.
+
+        ### Return
+        *False* if it was already recorded, otherwise *True*.
+        """
+        return self.add_many(((project, version),)) == 1
+
+    def add_many(self, releases: Iterable[tuple[str, str]]) -> int:
+        """
+        Records many (project, version) pairs under a single lock.
+
+        ### Return
+        The number of records which were not recorded before.
+        """
+        # the file lock excludes other processes, the lock other threads of this one
+        with self._lock, file_lock(self.path + ".lock"):
+            self.reload()
+            snapshot = self._snapshot
+            new: dict[bytes, None] = {}
+            for project, version in releases:
+                data = record(project, version)
+                if data in new or (snapshot is not None and snapshot.find(data)[0]):
+                    continue
+                new[data] = None
+            if not new:
+                return 0
+            if snapshot is None or (snapshot.count + len(new)) * 2 > snapshot.slots:
+                count = len(new) if snapshot is None else snapshot.count + len(new)
+                slots = INITIAL_SLOTS if snapshot is None else max(INITIAL_SLOTS, snapshot.slots)
+                while count * 2 > slots:
+                    slots *= 2
+                self._rewrite(slots, list(new))
+            else:
+                self._append(snapshot, list(new))
+        return len(new)
+
+    def _append(self, snapshot: "Snapshot", records: list[bytes]) -> None:
+        start = HEADER.size + snapshot.slots * SLOT.size
+        slots = bytearray(snapshot.map[HEADER.size : start])
+        changed = []
+        offset = snapshot.heap_size
+        for data in records:
+            slot = self._place(slots, snapshot.slots, data, offset)
+            changed.append(slot)
+            offset += len(data)
+        with open(self.path, "r+b") as file:
+            # the data is written before the slots which make it visible, the header last
+            file.seek(start + snapshot.heap_size)
+            file.write(b"".join(records))
+            for slot in changed:
+                file.seek(HEADER.size + slot * SLOT.size)
+                file.write(slots[slot * SLOT.size : (slot + 1) * SLOT.size])
+            file.seek(0)
+            file.write(HEADER.pack(MAGIC, snapshot.slots, snapshot.count + len(records), offset))
+        self.reload()
+
+    @staticmethod
+    def _place(slots: bytearray, count: int, data: bytes, offset: int) -> int:
+        """
+        Puts *data* at heap *offset* into the first free slot of the table *slots*.
+        """
+        hashed = record_hash(data)
+        slot = hashed % count
+        while SLOT.unpack_from(slots, slot * SLOT.size)[2]:
+            slot = (slot + 1) % count
+        SLOT.pack_into(slots, slot * SLOT.size, hashed, offset, len(data))
+        return slot
+
+    def _rewrite(self, slots: int, new: list[bytes]) -> None:
+        """
+        Rewrites the ledger with *slots* slots and the *new* records into a new file
+        which replaces the old one.
+        """
+        records = [record(project, version) for project, version in self] + new
+        table = bytearray(slots * SLOT.size)
+        offset = 0
+        for data in records:
+            self._place(table, slots, data, offset)
+            offset += len(data)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(HEADER.pack(MAGIC, slots, len(records), offset))
+            file.write(table)
+            file.write(b"".join(records))
+        if os.name == "nt" and self._snapshot is not None:  # no cov
+            # Windows does not replace a mapped file
+            self.close()
+        os.replace(temporary, self.path)
+        self.reload()
+
+
+_ledgers: dict[str, ReleaseLedger] = {}
+
+
+def ledger_for(path: str) -> ReleaseLedger:
+    """
+    Returns the process-wide `ReleaseLedger` of *path*, reloaded to see the latest records.
+    """
+    ledger = _ledgers.get(path)
+    if ledger is None:
+        ledger = _ledgers[path] = ReleaseLedger(path)
+    else:
+        ledger.reload()
+    return ledger
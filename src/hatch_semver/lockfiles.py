@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+
+"""
+Audits dependency upgrades by comparing two lockfiles or requirement lists.
+
+The pins of a file are read line by line from either format:
+
+- requirement lists, e.g. the output of `pip freeze`: lines like `name==1.2.3`,
+  comments, options and `--hash` continuation lines are skipped.
+- TOML lockfiles with `[[package]]` tables (`poetry.lock`, `uv.lock`) or `[[packages]]` tables
+  (`pylock.toml`): the `name` and `version` keys of each table.
+
+The old file is read into a hash index from the normalized project name to its version,
+the new file is streamed and joined with it, so the memory needed is one index entry per
+pin of the old file, whatever the number of changes. Each change is classified by
+the most significant version part which differs (see `hatch_semver.precedence.bump_level`),
+or as a `downgrade` if the new version has a lower precedence, which
+`hatch_semver.semver_scheme.SemverScheme.validate_bump` would reject.
+
+Versions are semantic versions or PEP 440 versions which have one
+(see `hatch_semver.pep440.from_pep440`), e.g. `2.0` or `2.1.0rc1`. Changes of other versions
+are classified as `unknown`. Each distinct version string is parsed once.
+"""
+
+import re
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from semver import Version
+
+from .names import normalize_name
+from .pep440 import from_pep440
+from .precedence import LEVELS, VersionKey, bump_level, key_from_parts
+
+CACHE_SIZE = 65536
+"""
+Number of parsed version strings which are memoized.
+"""
+CHANGES = (*reversed(LEVELS), "downgrade", "added", "removed", "unknown", "unchanged")
+"""
+Every kind of change: the bump levels, `downgrade`, `added` and `removed` pins, `unknown`
+for versions which are no semantic versions, and `unchanged`.
+"""
+PACKAGE_TABLES = ("[[package]]", "[[packages]]")
+REQUIREMENT = re.compile(r"([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*===?\s*([^\s;\\#]+)")
+TOML_KEY = re.compile(r'(name|version)\s*=\s*"([^"]*)"')
+
+
+class Pin(NamedTuple):
+    """
+    A parsed version with the attributes of `semver.Version` which
+    `hatch_semver.precedence.bump_level` compares, and its precedence key.
+    """
+
+    major: int
+    minor: int
+    patch: int
+    prerelease: Optional[str]
+    build: Optional[str]
+    key: VersionKey
+
+
+class Change(NamedTuple):
+    """
+    The change of the pin of a project.
+    """
+
+    name: str
+    """
+    The normalized project name.
+    """
+    old: Optional[str]
+    """
+    The old version, *None* if the pin was added.
+    """
+    new: Optional[str]
+    """
+    The new version, *None* if the pin was removed.
+    """
+    change: str
+    """
+    One of `CHANGES`.
+    """
+
+
+@dataclass(frozen=True)
+class AuditSummary:
+    """
+    The outcome of `audit`.
+    """
+
+    old: int
+    """
+    Number of projects pinned in the old file.
+    """
+    new: int
+    """
+    Number of pins in the new file.
+    """
+    counts: dict[str, int]
+    """
+    Number of pins with each kind of change of `CHANGES`.
+    """
+
+    @property
+    def downgrades(self) -> int:
+        """
+        Number of pins whose new version has a lower precedence than the old one.
+        """
+        return self.counts["downgrade"]
+
+
+def read_pins(lines: Iterable[str]) -> Iterator[tuple[str, str]]:
+    """
+    Yields the normalized project name and the version of every pin in the *lines*
+    of a requirement list or a TOML lockfile.
+    """
+    toml = in_package = False
+    name = version = None
+    for line in lines:
+        line = line.strip()
+        if line.startswith("["):
+            if name is not None and version is not None:
+                yield name, version
+            toml, in_package = True, line in PACKAGE_TABLES
+            name = version = None
+        elif in_package:
+            match = TOML_KEY.match(line)
+            if match is not None:
+                key, value = match.group(1, 2)
+                if key == "name":
+                    name = normalize_name(value)
+                else:
+                    version = value
+        elif not toml:
+            match = REQUIREMENT.match(line)
+            if match is not None:
+                project, pinned = match.group(1, 2)
+                yield normalize_name(project), pinned
+    if name is not None and version is not None:
+        yield name, version
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_pin(version: str) -> Optional[Pin]:
+    """
+    Parses a semantic version, or a PEP 440 version which has one,
+    *None* if *version* is neither.
+    """
+    match = Version._REGEX.match(version)
+    if match is None:
+        try:
+            match = Version._REGEX.match(from_pep440(version))
+        except ValueError:
+            return None
+        if match is None:
+            return None
+    major, minor, patch, prerelease, build = match.groups()
+    key = key_from_parts(major, minor, patch, prerelease)
+    return Pin(key.major, key.minor, key.patch, prerelease, build, key)
+
+
+def classify(old: str, new: str) -> str:
+    """
+    Classifies the change of a pin from the version *old* to *new*: one of the
+    `hatch_semver.precedence.LEVELS`, `downgrade`, `unknown` or `unchanged`.
+    """
+    if old == new:
+        return "unchanged"
+    old_pin, new_pin = parse_pin(old), parse_pin(new)
+    if old_pin is None or new_pin is None:
+        return "unknown"
+    if new_pin.key < old_pin.key:
+        return "downgrade"
+    return bump_level(old_pin, new_pin) or "unchanged"  # type: ignore[arg-type]
+
+
+def audit(
+    old: Iterable[str],
+    new: Iterable[str],
+    on_change: Optional[Callable[[Change], None]] = None,
+) -> AuditSummary:
+    """
+    Compares the pins of two lockfiles or requirement lists.
+
+    ### Parameters
+    - *old*, *new*: the lines of the files, e.g. open files, see `read_pins`.
+            *old* is indexed, *new* is streamed.
+    - *on_change*: called with every `Change` except `unchanged` pins as soon as it is found,
+            pins removed from *new* come last, in the order of *old*.
+            A project pinned more than once is compared with its last pin in *old*.
+
+    ### Return
+    The `AuditSummary`.
+    """
+    index: dict[str, str] = {}
+    for name, version in read_pins(old):
+        index[name] = version
+    counts = dict.fromkeys(CHANGES, 0)
+    seen: set[str] = set()
+    pins = 0
+    for name, version in read_pins(new):
+        pins += 1
+        previous = index.get(name)
+        if previous is None:
+            change = "added"
+        else:
+            seen.add(name)
+            change = classify(previous, version)
+        counts[change] += 1
+        if on_change is not None and change != "unchanged":
+            on_change(Change(name, previous, version, change))
+    for name, previous in index.items():
+        if name not in seen:
+            counts["removed"] += 1
+            if on_change is not None:
+                on_change(Change(name, previous, None, "removed"))
+    return AuditSummary(old=len(index), new=pins, counts=counts)
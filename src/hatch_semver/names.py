@@ -0,0 +1,20 @@
+#!/usr/bin/env python
+
+"""
+Normalizes project names as described in [PEP 503](https://peps.python.org/pep-0503/),
+so that the ledger, the package index, the dependency cascade and lockfile audits
+all look projects up by the same name.
+"""
+
+import re
+
+SEPARATORS = re.compile(r"[-_.]+")
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalizes a project name as described in PEP 503: lower case, with every run
+    of `-`, `_` and `.` replaced by a single `-`, e.g. `Foo__Bar.baz` becomes `foo-bar-baz`.
+    """
+    normalized = name.lower().replace("_", "-").replace(".", "-")
+    return SEPARATORS.sub("-", normalized) if "--" in normalized else normalized
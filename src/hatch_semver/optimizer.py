@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+"""
+Shortens chains of bump instructions before they are executed.
+
+Each step of a chain creates a new `semver.Version`. Chains written by hand are short,
+but generated ones often contain steps whose result is thrown away by a later step.
+`optimize` removes such steps and returns an equivalent, shorter chain: executing it
+yields the same version, the same `last_bump_was_build` flag and the same errors
+as executing the original chain.
+"""
+
+from copy import copy
+from typing import Sequence
+
+from semver import Version
+
+from .bump_instruction import BumpInstruction
+
+
+def can_fail(bi: BumpInstruction) -> bool:
+    """
+    Information whether the step *bi* can fail whatever the version it is applied to:
+    an invalid specific version, an `auto` step (no news fragment or commit may call
+    for a bump) or a `build` token template (which needs a git repository).
+    """
+    if bi.is_specific:
+        return not Version.is_valid(bi.version_part)
+    if bi.version_part == "build":
+        return bool(bi.token) and "{" in bi.token  # type: ignore[operator]
+    return bi.version_part == "auto"
+
+
+def optimize(steps: Sequence[BumpInstruction]) -> tuple[BumpInstruction, ...]:
+    """
+    Returns an equivalent, possibly shorter chain of bump instructions.
+
+    Three rules are applied:
+
+    - Every step before a specific version is dropped, because the specific version
+      overwrites both the version and the `rc_bumps_patch` state. The specific version
+      must not be the last step though, because only then its comparison with the
+      previous version decides whether the bump counts as a build bump.
+    - Consecutive `build` steps are merged into a single step with a
+      [repeat](#hatch_semver.bump_instruction.BumpInstruction.repeat) count.
+      Only the first one's token matters, the following ones just increment
+      the build counter.
+    - A `release` directly following another `release` is dropped, it changes nothing.
+
+    ### Parameters
+    - *steps*: parsed bump instructions in the order of their execution.
+
+    ### Return
+    The optimized bump instructions. Merged build steps are copies, the instances
+    in *steps* are not modified. No step is dropped if one of them `can_fail`,
+    so the optimized chain fails just like the original one.
+    """
+    start = 0
+    for index in range(len(steps) - 1):
+        if steps[index].is_specific:
+            start = index
+    if any(can_fail(dropped) for dropped in steps[:start]):
+        # keep the chain intact so that it fails like the original one
+        start = 0
+    optimized: list[BumpInstruction] = []
+    for bi in steps[start:]:
+        previous = optimized[-1] if optimized else None
+        if previous is not None and previous.version_part == bi.version_part == "build":
+            merged = copy(previous)
+            merged.repeat += bi.repeat
+            optimized[-1] = merged
+        elif previous is not None and previous.version_part == bi.version_part == "release":
+            continue
+        else:
+            optimized.append(bi)
+    return tuple(optimized)
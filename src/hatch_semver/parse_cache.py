@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+
+"""
+A bounded cache of parsed versions.
+
+`semver.Version` objects are immutable, so one parsed instance can be shared by
+every caller which parses the same string. `SemverScheme.update` parses the original
+version and the specific versions in the bump instructions through the process-wide
+`version_cache`, so tools calling it repeatedly parse each distinct string only once.
+"""
+
+import sys
+from dataclasses import dataclass
+from threading import Lock
+
+from semver import Version
+
+from .concurrency import ThreadCounter, evict
+from .tracing import count_versions
+
+
+@dataclass(frozen=True)
+class ParseCacheInfo:
+    """
+    Statistics of a `VersionCache`.
+    """
+
+    hits: int
+    """
+    Number of lookups answered from the cache.
+    """
+    misses: int
+    """
+    Number of lookups which had to parse the string.
+    """
+    evictions: int
+    """
+    Number of versions dropped because the cache was full.
+    """
+    maxsize: int
+    """
+    Maximum number of versions the cache holds.
+    """
+    currsize: int
+    """
+    Number of versions currently in the cache.
+    """
+    memory: int
+    """
+    Estimated size of the cached keys and versions in bytes.
+    """
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Share of the lookups answered from the cache, 0 if there was none.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def footprint(string: str, version: Version) -> int:
+    """
+    Estimates the memory in bytes held by a cache entry.
+    """
+    return (
+        sys.getsizeof(string)
+        + sys.getsizeof(version)
+        + sum(sys.getsizeof(part) for part in version.to_tuple() if part is not None)
+    )
+
+
+class VersionCache:
+    """
+    A bounded, thread-safe cache of `semver.Version`s keyed by the exact version string,
+    evicting approximately the least recently used versions.
+    Hits do not take a lock, see `hatch_semver.concurrency`.
+
+    Strings which are no valid version are not cached, the `ValueError` is raised on every lookup.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be a positive number, got {maxsize}")
+        self.maxsize = maxsize
+        # string -> [version, footprint, referenced since inserted or spared by the eviction]
+        self._versions: dict[str, list] = {}
+        self._lock = Lock()
+        self._hits = ThreadCounter()
+        self._misses = 0
+        self._evictions = 0
+        self._memory = 0
+
+    def parse(self, string: str) -> Version:
+        """
+        Returns the parsed *string*, parsing and caching it if necessary.
+
+        ### Raises
+        `ValueError` if *string* is not a valid semantic version.
+        """
+        entry = self._versions.get(string)
+        if entry is not None:
+            entry[2] = True
+            self._hits.increment()
+            return entry[0]
+        with self._lock:
+            # the entry may have been added, or moved by an eviction, in the meantime
+            entry = self._versions.get(string)
+            if entry is None:
+                self._misses += 1
+        if entry is not None:
+            self._hits.increment()
+            return entry[0]
+        # parse outside of the lock, a concurrent parse of the same string is harmless
+        version = Version.parse(string)
+        count_versions()
+        size = footprint(string, version)
+        with self._lock:
+            if string not in self._versions:
+                self._versions[string] = [version, size, False]
+                self._memory += size
+                self._evict()
+        return version
+
+    def _evict(self) -> None:
+        for _, size, _ in evict(self._versions, self.maxsize, 2):
+            self._memory -= size
+            self._evictions += 1
+
+    def resize(self, maxsize: int) -> None:
+        """
+        Changes the maximum number of cached versions, dropping the least recently used ones.
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be a positive number, got {maxsize}")
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def info(self) -> ParseCacheInfo:
+        """
+        Returns the cache statistics.
+        """
+        hits = self._hits.value
+        with self._lock:
+            return ParseCacheInfo(
+                hits=hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                maxsize=self.maxsize,
+                currsize=len(self._versions),
+                memory=self._memory,
+            )
+
+    def clear(self) -> None:
+        """
+        Empties the cache and resets its statistics.
+        """
+        with self._lock:
+            self._versions.clear()
+            self._hits.reset()
+            self._misses = 0
+            self._evictions = 0
+            self._memory = 0
+
+
+version_cache = VersionCache()
+"""
+The process-wide cache used by `hatch_semver.semver_scheme.SemverScheme.update`.
+"""
+
+
+def parse_version(string: str) -> Version:
+    """
+    Returns the parsed *string* from the process-wide `version_cache`.
+    """
+    return version_cache.parse(string)
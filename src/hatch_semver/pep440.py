@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+
+"""
+Translates semantic versions to [PEP 440](https://peps.python.org/pep-0440/) versions and back.
+
+| Semantic version                           | PEP 440          | Note                            |
+| ------------------------------------------ | ---------------- | ------------------------------- |
+| `1.4.0`                                    | `1.4.0`          |                                 |
+| `1.4.0-alpha.1`, `-a.1`, `-alpha1`, `-a1`  | `1.4.0a1`        |                                 |
+| `1.4.0-beta.2`, `-b.2`                     | `1.4.0b2`        |                                 |
+| `1.4.0-rc.3`, `-c.3`, `-pre.3`, `-preview.3` | `1.4.0rc3`     |                                 |
+| `1.4.0-rc`                                 | `1.4.0rc0`       | a missing number is 0           |
+| `1.4.0-dev.5`                              | `1.4.0.dev5`     | sorts differently, see below    |
+| `1.4.0-rc.3.dev.5`                         | `1.4.0rc3.dev5`  | sorts differently, see below    |
+| `1.4.0+build.7`                            | `1.4.0+build.7`  | build metadata is the local version |
+| `1.4.0+Build-007`                          | `1.4.0+build.7`  | lower case, `-` splits, no leading zeros |
+
+The pre-release names are those of the bump instructions `alpha`, `beta` and `rc`
+(see `hatch_semver.bump_instruction.BumpInstruction.normalize_version_part`)
+and the PEP 440 spellings of the same phases, in any case.
+Other pre-releases, e.g. `1.4.0-nightly.3`, have no PEP 440 form.
+
+`from_pep440` is the reverse: it accepts any PEP 440 spelling (`v1.4RC3` is `1.4.0-rc.3`),
+pads the release to three numbers and writes the phases as `alpha`, `beta` and `rc`.
+Epochs, post-releases and releases of more than three numbers have no semantic version.
+
+The translation keeps the order of versions except for developmental releases. PEP 440 sorts
+`1.4.0rc3.dev5` before `1.4.0rc3` and `1.4.0.dev5` before `1.4.0a1`, but semantic versioning
+compares pre-release identifiers one by one, so `1.4.0-rc.3.dev.5` comes after `1.4.0-rc.3`
+and `1.4.0-dev.5` after `1.4.0-alpha.1`.
+
+Both functions take a single version or an iterable of versions, and memoize the translation
+of each distinct string.
+"""
+
+import re
+from collections.abc import Callable, Iterable
+from functools import lru_cache
+from typing import Optional, Union, overload
+
+from packaging.version import InvalidVersion
+from packaging.version import Version as Pep440Version
+from semver import Version
+
+CACHE_SIZE = 16384
+"""
+Number of translations memoized in each direction.
+"""
+PRERELEASE = re.compile(
+    r"""
+    ^(?:
+        (?P<phase>alpha|a|beta|b|rc|c|pre|preview)(?:\.?(?P<number>\d+))?
+        (?P<phase_dev>\.dev(?:\.?(?P<phase_dev_number>\d+))?)?
+        |
+        dev(?:\.?(?P<dev>\d+))?
+    )$
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+PHASES = {
+    "alpha": "a",
+    "a": "a",
+    "beta": "b",
+    "b": "b",
+    "rc": "rc",
+    "c": "rc",
+    "pre": "rc",
+    "preview": "rc",
+}
+"""
+PEP 440 phase of every recognized pre-release name.
+"""
+SEMVER_PHASES = {"a": "alpha", "b": "beta", "rc": "rc"}
+"""
+Pre-release name of every PEP 440 phase.
+"""
+LOCAL_SEPARATORS = re.compile(r"[-_.]")
+CANONICAL = re.compile(
+    r"""
+    ^(?P<major>\d+)(?:\.(?P<minor>\d+))?(?:\.(?P<patch>\d+))?
+    (?:(?P<phase>a|b|rc)(?P<number>\d+))?
+    (?:\.dev(?P<dev>\d+))?
+    (?:\+(?P<local>[a-z0-9]+(?:\.[a-z0-9]+)*))?$
+    """,
+    re.VERBOSE,
+)
+"""
+PEP 440 versions in the spelling `to_pep440` writes, which are translated without `packaging`.
+"""
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _to_pep440(version: str) -> str:
+    match = Version._REGEX.match(version)
+    if match is None:
+        raise ValueError(f"{version} is not valid SemVer string")
+    major, minor, patch, prerelease, build = match.group(
+        "major", "minor", "patch", "prerelease", "build"
+    )
+    translated = f"{major}.{minor}.{patch}"
+    if prerelease is not None:
+        parts = PRERELEASE.match(prerelease)
+        if parts is None:
+            raise ValueError(f"Pre-release `{prerelease}` of {version} has no PEP 440 form")
+        phase = parts.group("phase")
+        if phase is None:
+            translated += f".dev{int(parts.group('dev') or 0)}"
+        else:
+            translated += PHASES[phase.lower()] + str(int(parts.group("number") or 0))
+            if parts.group("phase_dev") is not None:
+                translated += f".dev{int(parts.group('phase_dev_number') or 0)}"
+    if build is not None:
+        segments = LOCAL_SEPARATORS.split(build.lower())
+        translated += "+" + ".".join(str(int(s)) if s.isdigit() else s for s in segments)
+    return translated
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _from_pep440(version: str) -> str:
+    match = CANONICAL.match(version)
+    if match is not None:
+        major, minor, patch, phase, number, dev, local = match.groups()
+        translated = f"{int(major)}.{int(minor or 0)}.{int(patch or 0)}"
+        identifiers = []
+        if phase is not None:
+            identifiers += [SEMVER_PHASES[phase], str(int(number))]
+        if dev is not None:
+            identifiers += ["dev", str(int(dev))]
+        if identifiers:
+            translated += "-" + ".".join(identifiers)
+        if local is not None:
+            segments = local.split(".")
+            translated += "+" + ".".join(str(int(s)) if s.isdigit() else s for s in segments)
+        return translated
+    try:
+        parsed = Pep440Version(version)
+    except InvalidVersion:
+        raise ValueError(f"{version} is not a valid PEP 440 version") from None
+    if parsed.epoch:
+        raise ValueError(f"{version} has an epoch, which no semantic version has")
+    if parsed.post is not None:
+        raise ValueError(f"{version} is a post-release, which no semantic version is")
+    if len(parsed.release) > 3:
+        raise ValueError(f"{version} has more than three release numbers")
+    major, minor, patch = parsed.release + (0,) * (3 - len(parsed.release))
+    translated = f"{major}.{minor}.{patch}"
+    identifiers = []
+    if parsed.pre is not None:
+        phase, number = parsed.pre
+        identifiers += [SEMVER_PHASES[phase], str(number)]
+    if parsed.dev is not None:
+        identifiers += ["dev", str(parsed.dev)]
+    if identifiers:
+        translated += "-" + ".".join(identifiers)
+    if parsed.local is not None:
+        translated += "+" + parsed.local
+    return translated
+
+
+def _translate(
+    translate: Callable[[str], str], versions: Union[str, Iterable[str]], strict: bool
+) -> Union[str, list[Optional[str]]]:
+    if isinstance(versions, str):
+        return translate(versions)
+    if strict:
+        return [translate(version) for version in versions]
+    translated: list[Optional[str]] = []
+    for version in versions:
+        try:
+            translated.append(translate(version))
+        except ValueError:
+            translated.append(None)
+    return translated
+
+
+@overload
+def to_pep440(versions: str, strict: bool = True) -> str: ...
+
+
+@overload
+def to_pep440(versions: Iterable[str], strict: bool = True) -> list[Optional[str]]: ...
+
+
+def to_pep440(
+    versions: Union[str, Iterable[str]], strict: bool = True
+) -> Union[str, list[Optional[str]]]:
+    """
+    Translates a semantic version, or each of an iterable of them, to its normalized PEP 440 form.
+
+    ### Parameters
+    - *versions*: a semantic version string, or an iterable of them.
+    - *strict*: if *False*, a version which cannot be translated becomes *None* in the
+            returned list instead of raising.
+
+    ### Return
+    The PEP 440 version for a single version, otherwise the list of PEP 440 versions.
+
+    ### Raises
+    `ValueError` if a version is not a semantic version or has no PEP 440 form
+    (if *strict* or for a single version).
+    """
+    return _translate(_to_pep440, versions, strict)
+
+
+@overload
+def from_pep440(versions: str, strict: bool = True) -> str: ...
+
+
+@overload
+def from_pep440(versions: Iterable[str], strict: bool = True) -> list[Optional[str]]: ...
+
+
+def from_pep440(
+    versions: Union[str, Iterable[str]], strict: bool = True
+) -> Union[str, list[Optional[str]]]:
+    """
+    Translates a PEP 440 version, or each of an iterable of them, to a semantic version.
+
+    ### Parameters
+    - *versions*: a PEP 440 version string in any spelling, or an iterable of them.
+    - *strict*: if *False*, a version which cannot be translated becomes *None* in the
+            returned list instead of raising.
+
+    ### Return
+    The semantic version for a single version, otherwise the list of semantic versions.
+
+    ### Raises
+    `ValueError` if a version is not a PEP 440 version or has no semantic version
+    (if *strict* or for a single version).
+    """
+    return _translate(_from_pep440, versions, strict)
+
+
+def cache_clear() -> None:
+    """
+    Empties the memo caches of both directions.
+    """
+    _to_pep440.cache_clear()
+    _from_pep440.cache_clear()
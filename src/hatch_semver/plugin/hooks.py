@@ -1,19 +1,57 @@
 #!/usr/bin/env python
 
 
-from hatchling.plugin import hookimpl
+from importlib import import_module
 
-from ..semver_scheme import SemverScheme
+from hatchling.plugin import hookimpl
 
 """
 The registration hook for [hatch](https://github.com/pypa/hatch/tree/master/backend/src/hatchling/plugin)
 """
 
 
+def load_scheme() -> type:
+    """
+    Imports and returns `hatch_semver.semver_scheme.SemverScheme`.
+    """
+    return import_module("..semver_scheme", __package__).SemverScheme
+
+
+class LazySchemeMeta(type):
+    """
+    Metaclass of `LazySemverScheme`. Forwards attribute lookups
+    and instance checks to the real scheme class.
+    """
+
+    def __getattr__(cls, name: str):
+        return getattr(load_scheme(), name)
+
+    def __instancecheck__(cls, instance) -> bool:
+        return isinstance(instance, load_scheme())
+
+
+class LazySemverScheme(metaclass=LazySchemeMeta):
+    """
+    A stand-in for `hatch_semver.semver_scheme.SemverScheme` which hatch can register
+    without importing python-semver and hatchling's version scheme interface.
+    Hatch only reads `PLUGIN_NAME` until the scheme is actually used.
+    Instantiating this class imports the real scheme and returns its instance.
+    """
+
+    PLUGIN_NAME = "semver"
+    """
+    Must be the same as `hatch_semver.semver_scheme.SemverScheme.PLUGIN_NAME`.
+    """
+
+    def __new__(cls, *args, **kwargs):
+        return load_scheme()(*args, **kwargs)
+
+
 @hookimpl
 def hatch_register_version_scheme():
     """
-    Returns `hatch_semver.semver_scheme.SemverScheme`.
+    Returns `LazySemverScheme`, a stand-in for `hatch_semver.semver_scheme.SemverScheme`.
     By this our plugin can be somehow registered in [hatch](https://hatch.pypa.io/).
+    The heavy imports are deferred until hatch instantiates the scheme.
     """
-    return SemverScheme
+    return LazySemverScheme
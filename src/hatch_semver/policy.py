@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+
+"""
+Release policy rules which `hatch_semver.semver_scheme.SemverScheme.validate_bump` enforces
+in addition to the precedence check.
+
+The rules are set in the `policy` table of `[tool.hatch.version]`:
+
+```toml
+[tool.hatch.version.policy]
+forbid-skipping = true
+prerelease-tokens = ["alpha", "beta", "rc"]
+no-major-on-zero = true
+release-before-major = true
+```
+
+The table is compiled once into a `Policy`: a decision table which maps every kind of bump
+(see `hatch_semver.precedence.bump_level`) to the rules which apply to it, so a check
+classifies the bump once and runs only those rules, without reading any configuration.
+"""
+
+import json
+from collections.abc import Callable, Mapping
+from functools import lru_cache
+from typing import Any, Optional
+
+from semver import Version
+
+from .errors import ValidationError
+from .precedence import LEVELS, bump_level
+
+CONFIG_KEY = "policy"
+"""
+Name of the policy table in `[tool.hatch.version]`.
+"""
+
+Check = Callable[[Version, Version], Optional[str]]
+"""
+A rule: takes the new and the original version, returns why the bump is not allowed, or *None*.
+"""
+
+
+def successor(new: Version, old: Version) -> Optional[str]:
+    """
+    Rejects bumps which skip versions: major, minor and patch may only grow by one,
+    the parts after a grown one must be 0, and the number of a pre-release may only grow by one.
+    """
+    if new.major != old.major:
+        ok = new.major == old.major + 1 and new.minor == 0 and new.patch == 0
+    elif new.minor != old.minor:
+        ok = new.minor == old.minor + 1 and new.patch == 0
+    elif new.patch != old.patch:
+        ok = new.patch == old.patch + 1
+    elif new.prerelease and old.prerelease:
+        new_prefix, _, new_number = new.prerelease.rpartition(".")
+        old_prefix, _, old_number = old.prerelease.rpartition(".")
+        ok = not (
+            new_prefix == old_prefix
+            and new_number.isdigit()
+            and old_number.isdigit()
+            and int(new_number) > int(old_number) + 1
+        )
+    else:
+        ok = True
+    return None if ok else f"it skips versions after `{old}`"
+
+
+def prerelease_tokens(allowed: frozenset[str]) -> Check:
+    """
+    Returns a rule which only accepts pre-releases whose first identifier, without
+    trailing digits, is in *allowed*, e.g. `rc` for `rc.1` or `rc1`.
+    """
+
+    def check(new: Version, old: Version) -> Optional[str]:
+        if new.prerelease is None:
+            return None
+        token = new.prerelease.partition(".")[0].rstrip("0123456789")
+        if token in allowed:
+            return None
+        return f"pre-release token `{token}` is not one of {', '.join(sorted(allowed))}"
+
+    return check
+
+
+def no_major_on_zero(new: Version, old: Version) -> Optional[str]:
+    """
+    Rejects major bumps of 0.x versions, whose breaking changes bump the minor version.
+    """
+    return "major bumps of 0.x versions are not allowed" if old.major == 0 else None
+
+
+def release_before_major(new: Version, old: Version) -> Optional[str]:
+    """
+    Rejects major bumps of pre-releases: `old` has to be released first.
+    """
+    if old.prerelease is None:
+        return None
+    return f"`{old}` has to be released before a major bump"
+
+
+Factory = Callable[[str, Any], Optional[Check]]
+"""
+Makes a rule from its name and configured value, *None* if the rule is switched off.
+"""
+
+
+def flag(rule: Check) -> Factory:
+    """
+    Returns the factory of a rule which is switched on with `true`.
+    """
+
+    def factory(name: str, on: Any) -> Optional[Check]:
+        if not isinstance(on, bool):
+            raise ValueError(f"Policy rule `{name}` must be true or false, got {on!r}")
+        return rule if on else None
+
+    return factory
+
+
+def tokens(name: str, allowed: Any) -> Optional[Check]:
+    """
+    Returns the rule of the `prerelease-tokens` option.
+    """
+    if not isinstance(allowed, list) or not all(isinstance(token, str) for token in allowed):
+        raise ValueError(f"Policy rule `{name}` must be a list of strings, got {allowed!r}")
+    return prerelease_tokens(frozenset(allowed))
+
+
+BUMPS = LEVELS[1:]
+"""
+Bump levels which change the version's precedence.
+"""
+RULES: dict[str, tuple[Factory, tuple[str, ...]]] = {
+    "forbid-skipping": (flag(successor), BUMPS),
+    "prerelease-tokens": (tokens, BUMPS),
+    "no-major-on-zero": (flag(no_major_on_zero), ("major",)),
+    "release-before-major": (flag(release_before_major), ("major",)),
+}
+"""
+Every rule: a factory taking the configured value, and the bump levels the rule applies to.
+"""
+
+
+class Policy:
+    """
+    A compiled release policy.
+
+    ### Parameters
+    - *table*: the rules applying to each bump level.
+    """
+
+    def __init__(self, table: Mapping[Optional[str], tuple[Check, ...]]) -> None:
+        self.table = dict(table)
+
+    def __bool__(self) -> bool:
+        return any(self.table.values())
+
+    def violations(self, new: Version, old: Version) -> list[str]:
+        """
+        Returns why the bump from *old* to *new* violates the policy, empty if it does not.
+        """
+        rules = self.table.get(bump_level(old, new), ())
+        return [reason for reason in (rule(new, old) for rule in rules) if reason is not None]
+
+    def check(self, new: Version, old: Version) -> None:
+        """
+        ### Raises
+        `ValidationError` if the bump from *old* to *new* violates the policy.
+        """
+        reasons = self.violations(new, old)
+        if reasons:
+            raise ValidationError(
+                f"Version `{new}` violates the release policy: {'; '.join(reasons)}"
+            )
+
+
+@lru_cache(maxsize=64)
+def _compile(serialized: str) -> Policy:
+    table: dict[Optional[str], list[Check]] = {level: [] for level in LEVELS}
+    for name, value in json.loads(serialized).items():
+        if name not in RULES:
+            raise ValueError(f"Unknown policy rule `{name}`. Use one of {tuple(RULES)}")
+        factory, levels = RULES[name]
+        rule = factory(name, value)
+        if rule is not None:
+            for level in levels:
+                table[level].append(rule)
+    return Policy({level: tuple(rules) for level, rules in table.items()})
+
+
+def compile_policy(config: Mapping[str, Any]) -> Policy:
+    """
+    Compiles the `policy` table of a `[tool.hatch.version]` table *config*.
+    Equal tables are compiled only once per process.
+
+    ### Raises
+    `ValueError` if `policy` is no table, names an unknown rule or a rule has a wrong value.
+    """
+    policy = config.get(CONFIG_KEY, {})
+    if not isinstance(policy, Mapping):
+        raise ValueError(f"`{CONFIG_KEY}` must be a table, got {policy!r}")
+    return _compile(json.dumps(policy, sort_keys=True))
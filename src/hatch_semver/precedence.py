@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+
+"""
+Helpers for comparing semantic versions.
+"""
+
+from typing import NamedTuple, Optional, Union
+
+from semver import Version
+
+LEVELS = ("build", "prerelease", "patch", "minor", "major")
+"""
+Names of the version parts a change can affect, from the least to the most significant.
+"""
+
+
+def bump_level(old_version: Version, new_version: Version) -> Optional[str]:
+    """
+    Classifies the change from *old_version* to *new_version* by the most significant
+    version part which differs.
+
+    ### Return
+    One of the `LEVELS`, or *None* if the versions are identical.
+    The direction of the change is not considered.
+    """
+    if old_version.major != new_version.major:
+        return "major"
+    if old_version.minor != new_version.minor:
+        return "minor"
+    if old_version.patch != new_version.patch:
+        return "patch"
+    if old_version.prerelease != new_version.prerelease:
+        return "prerelease"
+    if old_version.build != new_version.build:
+        return "build"
+    return None
+
+
+def identifier_key(identifier: str) -> tuple[int, int, str]:
+    """
+    Returns the sort key of a single pre-release identifier.
+    Numeric identifiers are compared numerically and sort before alphanumeric ones.
+    """
+    if identifier.isdigit():
+        return 0, int(identifier), ""
+    return 1, 0, identifier
+
+
+class VersionKey(NamedTuple):
+    """
+    A tuple which compares exactly like the `semver.Version` it was made from,
+    so that `sorted`, `max` or `bisect` compare versions at native tuple speed.
+    Build metadata is ignored, as it is by `semver.Version`'s comparison.
+    Create it with `precedence_key`.
+    """
+
+    major: int
+    minor: int
+    patch: int
+    prerelease: tuple
+    """
+    `(1,)` for a release, which sorts after all of its pre-releases, otherwise `(0, identifiers)`
+    with an `identifier_key` for each pre-release identifier.
+    """
+
+    def to_bytes(self) -> bytes:
+        """
+        Encodes the key into bytes which sort like the key, e.g. to store keys in a database.
+        Numbers must fit into 255 bytes.
+        """
+        encoded = bytearray()
+        for number in self[:3]:
+            length = (number.bit_length() + 7) // 8
+            encoded.append(length)
+            encoded += number.to_bytes(length, "big")
+        if self.prerelease[0]:
+            encoded.append(1)
+            return bytes(encoded)
+        encoded.append(0)
+        for alphanumeric, number, text in self.prerelease[1]:
+            if alphanumeric:
+                # identifiers have no NUL, so the terminator sorts a prefix first
+                encoded.append(2)
+                encoded += text.encode("ascii")
+                encoded.append(0)
+            else:
+                length = (number.bit_length() + 7) // 8
+                encoded.append(1)
+                encoded.append(length)
+                encoded += number.to_bytes(length, "big")
+        # the end of the identifiers sorts before any further identifier
+        encoded.append(0)
+        return bytes(encoded)
+
+
+def key_from_parts(
+    major: Union[int, str], minor: Union[int, str], patch: Union[int, str], prerelease: Optional[str]
+) -> VersionKey:
+    """
+    Returns the precedence key of a version given by its parts, see `precedence_key`.
+    """
+    if prerelease is None:
+        return VersionKey(int(major), int(minor), int(patch), (1,))
+    identifiers = tuple(map(identifier_key, prerelease.split(".")))
+    return VersionKey(int(major), int(minor), int(patch), (0, identifiers))
+
+
+def precedence_key(version: Union[str, Version]) -> VersionKey:
+    """
+    Returns the `VersionKey` of a semantic version, e.g. to sort many versions without
+    comparing `semver.Version`s: `sorted(versions, key=precedence_key)`.
+
+    ### Raises
+    `ValueError` if *version* is a string which is not a valid semantic version.
+    """
+    if isinstance(version, Version):
+        return key_from_parts(version.major, version.minor, version.patch, version.prerelease)
+    match = Version._REGEX.match(version)
+    if match is None:
+        raise ValueError(f"{version} is not valid SemVer string")
+    return key_from_parts(*match.group("major", "minor", "patch", "prerelease"))
@@ -0,0 +1,360 @@
+#!/usr/bin/env python
+
+"""
+Version ranges compiled into predicates.
+
+A range expression is parsed once by `Range.compile` into a union of intervals
+of precedence keys (see `hatch_semver.precedence.precedence_key`), so matching a version
+costs a few tuple comparisons, and matching a `hatch_semver.columnar.VersionBatch`
+a few array comparisons per interval.
+
+The syntax follows the ranges of npm's node-semver:
+
+| Expression         | Meaning                                  |
+| ------------------ | ---------------------------------------- |
+| `1.2.3`, `=1.2.3`  | exactly `1.2.3` (build metadata ignored) |
+| `>1.2.3`, `>=1.2`, `<2`, `<=2.1` | comparisons, missing parts are wildcards |
+| `1.2`, `1.2.x`, `*` | any version with the given parts        |
+| `~1.2.3`           | `>=1.2.3 <1.3.0-0`                       |
+| `^1.2.3`, `^0.2.3`, `^0.0.3` | `>=1.2.3 <2.0.0-0`, `>=0.2.3 <0.3.0-0`, `>=0.0.3 <0.0.4-0` |
+| `1.2.3 - 2.3`      | `>=1.2.3 <2.4.0-0`                       |
+| `A B`              | both `A` and `B`                         |
+| `A \\|\\| B`           | `A` or `B`                               |
+
+Pre-releases are ordered by semantic version precedence. As in node-semver,
+a pre-release only matches if one of the comparators it is matched against names
+a pre-release of the same major, minor and patch version (e.g. `1.3.0-rc.2` matches
+`>=1.3.0-rc.1` but not `>=1.2.0`), unless the range is compiled with *include_prereleases*.
+"""
+
+import re
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Union
+
+from semver import Version
+
+from .precedence import identifier_key, key_from_parts, precedence_key
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .columnar import VersionBatch
+
+PARTIAL = re.compile(
+    r"""
+    ^v?
+    (?P<major>0|[1-9]\d*|[xX*])
+    (?:\.(?P<minor>0|[1-9]\d*|[xX*])
+        (?:\.(?P<patch>0|[1-9]\d*|[xX*])
+            (?:-(?P<prerelease>[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?
+            (?:\+[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*)?
+        )?
+    )?$
+    """,
+    re.VERBOSE,
+)
+COMPARATOR = re.compile(r"(>=|<=|>|<|=|\^|~>?)?\s*([^\s<>=^~]\S*)")
+HYPHEN = re.compile(r"^\s*(\S+)\s+-\s+(\S+)\s*$")
+
+Key = tuple
+Partial = tuple[Optional[int], Optional[int], Optional[int], Optional[str]]
+
+
+def parse_partial(text: str) -> Partial:
+    """
+    Parses a possibly partial version like `1`, `1.2`, `1.x` or `1.2.3-rc.1`.
+    Missing and wildcard parts are *None*.
+
+    ### Raises
+    `ValueError` if *text* is not a (partial) version.
+    """
+    match = PARTIAL.match(text)
+    if match is None:
+        raise ValueError(f"`{text}` is not a valid version in a range")
+    parts: list[Optional[int]] = []
+    for name in ("major", "minor", "patch"):
+        part = match.group(name)
+        if part is None or part in "xX*" or (parts and parts[-1] is None):
+            parts.append(None)
+        else:
+            parts.append(int(part))
+    prerelease = match.group("prerelease") if parts[2] is not None else None
+    return parts[0], parts[1], parts[2], prerelease
+
+
+def lowest(major: int, minor: int, patch: int) -> Key:
+    """
+    The key of the lowest version with this major, minor and patch, i.e. `<major.minor.patch>-0`.
+    """
+    return key_from_parts(major, minor, patch, "0")
+
+
+def next_of(partial: Partial) -> Key:
+    """
+    The key of the lowest version above every version matching the partial version *partial*.
+    """
+    major, minor, _, _ = partial
+    if minor is None:
+        return lowest(major + 1, 0, 0)  # type: ignore[operator]
+    return lowest(major, minor + 1, 0)  # type: ignore[arg-type]
+
+
+def desugar(operator: str, partial: Partial) -> list[tuple[str, Key]]:
+    """
+    Translates a comparator into primitive comparisons (`>=`, `>`, `<=`, `<`) with keys.
+    """
+    major, minor, patch, prerelease = partial
+    full = patch is not None
+    if major is None:
+        # a wildcard matches everything, except with < or >, where it matches nothing
+        return [("<", lowest(0, 0, 0))] if operator in ("<", ">") else []
+    if full:
+        floor = key_from_parts(major, minor, patch, prerelease)
+    else:
+        # e.g. `>=1.2` includes `1.2.0-rc.1` if pre-releases are included
+        floor = lowest(major, minor or 0, 0)
+    if operator in ("", "="):
+        if full:
+            return [(">=", floor), ("<=", floor)]
+        return [(">=", floor), ("<", next_of(partial))]
+    if operator == ">=":
+        return [(">=", floor)]
+    if operator == ">":
+        return [(">", floor)] if full else [(">=", next_of(partial))]
+    if operator == "<":
+        return [("<", floor if full else lowest(major, minor or 0, 0))]
+    if operator == "<=":
+        return [("<=", floor)] if full else [("<", next_of(partial))]
+    if operator in ("~", "~>"):
+        return [(">=", floor), ("<", next_of((major, minor, None, None)))]
+    # caret: the left-most non-zero part must not change
+    if major > 0 or minor is None:
+        upper = lowest(major + 1, 0, 0)
+    elif minor > 0 or patch is None:
+        upper = lowest(0, minor + 1, 0)
+    else:
+        upper = lowest(0, 0, patch + 1)
+    return [(">=", floor), ("<", upper)]
+
+
+@dataclass(frozen=True)
+class Interval:
+    """
+    The versions matched by one set of comparators (separated by `||` in the expression).
+    """
+
+    lower: Optional[Key] = None
+    """
+    Key of the lower bound, *None* if unbounded.
+    """
+    lower_inclusive: bool = True
+    upper: Optional[Key] = None
+    """
+    Key of the upper bound, *None* if unbounded.
+    """
+    upper_inclusive: bool = True
+    prerelease_cores: frozenset[tuple[int, int, int]] = frozenset()
+    """
+    Major, minor and patch of the pre-releases named by the comparators.
+    """
+
+    @classmethod
+    def from_comparisons(
+        cls, comparisons: Iterable[tuple[str, Key]], prerelease_cores: frozenset
+    ) -> "Interval":
+        lower, lower_inclusive, upper, upper_inclusive = None, True, None, True
+        for operator, key in comparisons:
+            if operator[0] == ">":
+                inclusive = operator == ">="
+                if lower is None or key > lower or (key == lower and not inclusive):
+                    lower, lower_inclusive = key, inclusive
+            else:
+                inclusive = operator == "<="
+                if upper is None or key < upper or (key == upper and not inclusive):
+                    upper, upper_inclusive = key, inclusive
+        return cls(lower, lower_inclusive, upper, upper_inclusive, prerelease_cores)
+
+    def contains(self, key: Key) -> bool:
+        """
+        Information whether the version with precedence key *key* lies in the interval,
+        disregarding the pre-release rule.
+        """
+        lower, upper = self.lower, self.upper
+        if lower is not None and (key < lower if self.lower_inclusive else key <= lower):
+            return False
+        if upper is not None and (key > upper if self.upper_inclusive else key >= upper):
+            return False
+        return True
+
+
+@dataclass(frozen=True)
+class Range:
+    """
+    A compiled range expression. Use `Range.compile` or `compile_range` to create one.
+    """
+
+    source: str
+    """
+    The range expression.
+    """
+    intervals: tuple[Interval, ...]
+    """
+    The intervals of the alternatives, a version matches if it lies in any of them.
+    """
+    include_prereleases: bool = False
+    """
+    If *True*, pre-releases match by precedence alone.
+    """
+
+    @classmethod
+    def compile(cls, expression: str, include_prereleases: bool = False) -> "Range":
+        """
+        Parses *expression* into a `Range`.
+
+        ### Raises
+        `ValueError` if the expression is malformed.
+        """
+        intervals = []
+        for alternative in expression.split("||"):
+            comparisons: list[tuple[str, Key]] = []
+            cores = set()
+            hyphen = HYPHEN.match(alternative)
+            if hyphen:
+                low, high = map(parse_partial, hyphen.groups())
+                parts = [(">=", low), ("<=", high)]
+            else:
+                if COMPARATOR.sub("", alternative).strip():
+                    raise ValueError(f"Malformed range `{expression}`")
+                parts = [
+                    (match.group(1) or "", parse_partial(match.group(2)))
+                    for match in COMPARATOR.finditer(alternative)
+                ]
+            for operator, partial in parts:
+                comparisons.extend(desugar(operator, partial))
+                if partial[3] is not None:
+                    cores.add(partial[:3])
+            intervals.append(Interval.from_comparisons(comparisons, frozenset(cores)))
+        return cls(expression, tuple(intervals), include_prereleases)
+
+    def match_key(self, key: Key) -> bool:
+        """
+        Information whether the version with precedence key *key* is in the range.
+        """
+        if key[3][0] or self.include_prereleases:
+            return any(interval.contains(key) for interval in self.intervals)
+        core = key[:3]
+        return any(
+            core in interval.prerelease_cores and interval.contains(key)
+            for interval in self.intervals
+        )
+
+    def match(self, version: Union[str, Version]) -> bool:
+        """
+        Information whether *version* is in the range.
+        """
+        return self.match_key(precedence_key(version))
+
+    def match_many(self, versions: Iterable[Union[str, Version]]) -> list[bool]:
+        """
+        Matches each of *versions*.
+        """
+        return list(map(self.match, versions))
+
+    def filter(self, versions: Iterable[str]) -> list[str]:
+        """
+        Returns the *versions* which are in the range, in their original order.
+        """
+        return [version for version in versions if self.match(version)]
+
+    def match_batch(self, batch: "VersionBatch") -> "np.ndarray":
+        """
+        Matches every version of a `hatch_semver.columnar.VersionBatch`
+        (requires NumPy). Returns a boolean array.
+        """
+        import numpy as np
+
+        from .columnar import NONE
+
+        c = batch.columns
+        has_prerelease = c["pre_head"] != NONE
+        result = np.zeros(len(batch), dtype=bool)
+        for interval in self.intervals:
+            inside = np.ones(len(batch), dtype=bool)
+            if interval.lower is not None:
+                relation = compare_constant(batch, interval.lower)
+                inside &= relation >= 0 if interval.lower_inclusive else relation > 0
+            if interval.upper is not None:
+                relation = compare_constant(batch, interval.upper)
+                inside &= relation <= 0 if interval.upper_inclusive else relation < 0
+            if not self.include_prereleases:
+                allowed = ~has_prerelease
+                for major, minor, patch in interval.prerelease_cores:
+                    allowed |= (c["major"] == major) & (c["minor"] == minor) & (c["patch"] == patch)
+                inside &= allowed
+            result |= inside
+        # the scalar rows are matched on their precedence key, not on the columns
+        for index, version in batch.scalar.items():
+            result[index] = self.match(version)
+        return result
+
+
+def compare_constant(batch: "VersionBatch", key: Key) -> "np.ndarray":
+    """
+    Compares every version of *batch* with the version of precedence key *key*.
+    Returns -1, 0 or 1 per row. Rows in `batch.scalar` are not computed,
+    their placeholder columns are never decoded.
+    """
+    import numpy as np
+
+    from .columnar import NONE
+
+    c = batch.columns
+    major, minor, patch, prerelease = key
+    result = np.sign(c["major"] - major)
+    for part, value in (("minor", minor), ("patch", patch)):
+        undecided = result == 0
+        result[undecided] = np.sign(c[part][undecided] - value)
+    core_equal = result == 0
+    has_prerelease = c["pre_head"] != NONE
+    if prerelease[0]:
+        # the constant is a release, which is higher than its pre-releases
+        result[core_equal & has_prerelease] = -1
+        return result
+    result[core_equal & ~has_prerelease] = 1
+    encoded = core_equal & has_prerelease
+    encoded[list(batch.scalar)] = False
+    rows = np.flatnonzero(encoded)
+    if len(rows):
+        encoded = np.stack([c["pre_head"][rows], c["pre_number"][rows], c["pre_tail"][rows]], 1)
+        unique, inverse = np.unique(encoded, axis=0, return_inverse=True)
+        identifiers = prerelease[1]
+        relations = []
+        for head, number, tail in unique.tolist():
+            other = tuple(map(identifier_key, batch.vocabulary.decode(head, number, tail).split(".")))
+            relations.append((other > identifiers) - (other < identifiers))
+        result[rows] = np.array(relations)[inverse.reshape(-1)]
+    return result
+
+
+@lru_cache(maxsize=256)
+def compile_range(expression: str, include_prereleases: bool = False) -> Range:
+    """
+    Returns the compiled `Range` for *expression*, cached by expression.
+    """
+    return Range.compile(expression, include_prereleases)
+
+
+def satisfies(
+    versions: Union[str, Version, Sequence[Union[str, Version]]],
+    expression: str,
+    include_prereleases: bool = False,
+) -> Union[bool, list[bool]]:
+    """
+    Matches a version, or each of a list of versions, against the range *expression*.
+    """
+    compiled = compile_range(expression, include_prereleases)
+    if isinstance(versions, (str, Version)):
+        return compiled.match(versions)
+    return compiled.match_many(versions)
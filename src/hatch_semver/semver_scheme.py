@@ -4,20 +4,82 @@
 Implements the version scheme interface between hatch and python-semver.
 """
 
-from copy import deepcopy
+import os
+from functools import cached_property
 from operator import ge, gt
-from typing import Mapping
+from typing import Any, Mapping, NamedTuple, Optional
 
 from hatchling.version.scheme.plugin.interface import VersionSchemeInterface
 from semver import Version
 
+from . import fast_engine, tracing
 from .bump_instruction import BumpInstruction
+from .bump_plan import BumpPlan, compile_plan
 from .errors import ValidationError
+from .parse_cache import parse_version
+from .policy import Policy, compile_policy
+
+
+class Settings(NamedTuple):
+    """
+    The options of [`tool.hatch.version`] which `SemverScheme` reads on every bump.
+    """
+
+    validate: bool
+    engine: str
+    index_url: Optional[str]
+    ledger: Optional[str]
+    policy: Policy
+
+
+class Step(NamedTuple):
+    """
+    One executed step of `SemverScheme.update_detailed`.
+    """
+
+    instruction: BumpInstruction
+    version: Version
+    """
+    The version after the step.
+    """
+
+
+class UpdateResult(NamedTuple):
+    """
+    The outcome of `SemverScheme.update_detailed`.
+    """
+
+    original: Version
+    version: Version
+    """
+    The new version.
+    """
+    steps: tuple[Step, ...]
+    """
+    One step for each bump instruction, in the order they were written, with its result.
+    Empty if the steps were not recorded.
+    """
+    last_bump_was_build: bool
+    """
+    The *bumped_build* argument passed to `SemverScheme.validate_bump`.
+    """
+    validated: bool
+    """
+    Whether the new version was validated, i.e. the option `validate-bump` is on.
+    """
+    error: Optional[ValidationError]
+    """
+    Why the validation failed, *None* if it passed or was not done.
+    """
 
 
 class SemverScheme(VersionSchemeInterface):
     """
     Implements the semantic version scheme.
+
+    A scheme can be shared by many threads, also on free-threaded CPython builds:
+    its options are read once (see `SemverScheme.settings`) and never change, and the
+    process-wide caches it uses are thread-safe, see `hatch_semver.concurrency`.
     ### References
     - https://semver.org/
     - https://hatch.pypa.io/latest/plugins/version-scheme/reference/
@@ -28,16 +90,58 @@ class SemverScheme(VersionSchemeInterface):
     The name of the plugin which is to be used in *pyproject.toml* in [`tool.hatch.version`].
     Value: `semver`
     """
-    INSTRUCTION_SEPARATOR = ","
+    INSTRUCTION_SEPARATOR = BumpPlan.separator
     """
     Separator of bump instructions which the user writes as an argument to `hatch version`.
     Value: `,` (comma)
     """
+    ENGINES = ("semver", "fast")
+    """
+    Accepted values of the `engine` option in [`tool.hatch.version`].
+    """
+    AUTO_SOURCES = ("fragments", "commits")
+    """
+    Accepted values of the `source` option in [`tool.hatch.version.auto`].
+    """
+
+    @cached_property
+    def settings(self) -> Settings:
+        """
+        The options of this scheme's configuration, read and compiled once per instance.
+
+        ### Raises
+        `ValueError` if the `policy` table is invalid, see `hatch_semver.policy.compile_policy`.
+        """
+        return Settings(
+            validate=self.config.get("validate-bump", True),
+            engine=self.config.get("engine", "semver"),
+            index_url=self.config.get("index-url"),
+            ledger=self.config.get("ledger"),
+            policy=compile_policy(self.config),
+        )
 
     def update(self, desired_version: str, original_version: str, version_data: Mapping) -> str:
         """
         Calculates the new version and returns it as a valid semver string.
 
+        The configuration option `engine` selects how the bump instructions are executed:
+        `semver` (default) uses python-semver's `Version` methods,
+        `fast` uses `hatch_semver.fast_engine` which gives the same results
+        with far fewer temporary objects.
+
+        The `auto` instruction bumps the part which the project's pending towncrier news
+        fragments, or its conventional commits since the last release tag, call for,
+        e.g. `minor` if there is a `feature` (see `SemverScheme.infer_auto_part`).
+
+        Tokens of `build` instructions may contain placeholders for build metadata
+        from the git repository, e.g. `build={sha7}` (see `hatch_semver.vcs`).
+
+        The configuration option `index-url` names a PEP 691 package index. If the new version
+        is already published there, the next free one is taken (see `hatch_semver.index`).
+
+        The configuration option `trace` (or the environment variable `HATCH_SEMVER_TRACE`)
+        names a file to which the timing of every step is written, see `hatch_semver.tracing`.
+
         If the configuration option [`validate-bump`](https://hatch.pypa.io/latest/plugins/version-scheme/standard/#options) is *True* it calls
                 [self.validate_bump](#hatch_semver.semver_scheme.SemverScheme.validate_bump)
                 to check if the new version is valid
@@ -48,7 +152,9 @@ class SemverScheme(VersionSchemeInterface):
                 instructions how to bump the current version.
                 These commands are separated by `SemverScheme.INSTRUCTION_SEPARATOR`.
                 Each such command is in turn parsed and represented as an instance of
-                `hatch_semver.bump_instruction.BumpInstruction`.
+                `hatch_semver.bump_instruction.BumpInstruction`. The parsed chain is
+                compiled into a `hatch_semver.bump_plan.BumpPlan` which is cached,
+                so repeated calls with the same instructions are not parsed again.
         - *original_version*: Project's original version. Must be a valid
                 semantic version ([regex checker](https://regex101.com/r/Ly7O1x/3/)).
         - *version_data*: Poorly documented argument. Ignored entirely.
@@ -57,47 +163,183 @@ class SemverScheme(VersionSchemeInterface):
 
         ### Return
         Returns the new version as a valid semver string.
+        See `SemverScheme.update_detailed` for the new version with the steps leading to it.
         """
         if not desired_version:
             return original_version
-        original_version = Version.parse(original_version)
-        current_version = deepcopy(original_version)
-        instructions: str = desired_version
-        validate = self.config.get("validate-bump", True)
-        rc_bumps_patch = True
-        for instruction in instructions.split(self.INSTRUCTION_SEPARATOR):
-            bi = BumpInstruction(instruction)
-            last_bump_was_build = False
-            if bi.version_part == "build":
-                current_version = current_version.bump_build(token=bi.token)
-                last_bump_was_build = True
-            elif bi.version_part == "release":
-                current_version = current_version.finalize_version()
-                rc_bumps_patch = True
-            elif bi.is_specific:
-                # Users may enter a specific version string to change nothing but
-                # the metadata.
-                # This would result in an unnecessary ValidationError if such an instruction
-                # comes last in the instruction iterable.
-                # To avoid this, we check if nothing but the metadata changed.
-                # if so, we will pretend that last_bump_was_build
-                temp_old_version = deepcopy(current_version)
-                current_version = Version.parse(bi.version_part)
-                if temp_old_version == current_version:
-                    last_bump_was_build = True
-                rc_bumps_patch = False
-            else:
-                if not rc_bumps_patch and bi.version_part == "prerelease":
-                    current_version = current_version.bump_prerelease(token=bi.token)
-                    rc_bumps_patch = True
+        return str(
+            self.update_detailed(desired_version, original_version, version_data, False).version
+        )
+
+    def update_detailed(
+        self,
+        desired_version: str,
+        original_version: str,
+        version_data: Optional[Mapping] = None,
+        record_steps: bool = True,
+        raise_invalid: bool = True,
+    ) -> UpdateResult:
+        """
+        Calculates the new version like `SemverScheme.update`, but returns it as
+        a `semver.Version` together with the intermediate versions and the validation outcome,
+        so callers need not parse the new version again or re-run parts of the chain.
+
+        ### Parameters
+        - *desired_version*, *original_version*, *version_data*: see `SemverScheme.update`.
+        - *record_steps*: whether to record the version after every instruction in
+                `UpdateResult.steps`. The instructions are then executed as written, without
+                `hatch_semver.optimizer`.
+        - *raise_invalid*: if *False*, a failed validation is returned as `UpdateResult.error`
+                instead of being raised.
+
+        ### Return
+        The `UpdateResult`.
+
+        ### Raises
+        `ValidationError` if the new version is invalid and *raise_invalid* is *True*,
+        `ValueError` if a version or an instruction is malformed.
+        """
+        if not desired_version:
+            original = parse_version(original_version)
+            return UpdateResult(original, original, (), False, False, None)
+        tracer = tracing.tracer_for(self.config, self.root)
+        if tracer is None:
+            return self._bump(desired_version, original_version, None, record_steps, raise_invalid)
+        fields = {
+            "original": original_version,
+            "instructions": desired_version,
+            "engine": self.config.get("engine", "semver"),
+        }
+        with tracer:
+            try:
+                result = self._bump(
+                    desired_version, original_version, tracer, record_steps, raise_invalid
+                )
+            except Exception as e:
+                tracer.finish(**fields, version=None, error=str(e))
+                raise
+            error = None if result.error is None else str(result.error)
+            tracer.finish(**fields, version=str(result.version), error=error)
+        return result
+
+    def _bump(
+        self,
+        desired_version: str,
+        original_version: str,
+        tracer: Optional[tracing.Tracer],
+        record_steps: bool,
+        raise_invalid: bool,
+    ) -> UpdateResult:
+        original_version = parse_version(original_version)
+        if tracer is not None:
+            tracer.emit("parse", version=str(original_version))
+        settings = self.settings
+        engine = settings.engine
+        if record_steps:
+            # one step per written instruction, so nothing is left out or merged
+            plan = BumpPlan.compile(desired_version, optimize=False)
+        else:
+            plan = compile_plan(desired_version)
+        if plan.has_build_templates:
+            from . import vcs
+
+            plan = plan.render_build_tokens(lambda template: vcs.render(template, self.root))
+        on_step = None
+        if tracer is not None:
+            tracer.emit("compile", instructions=desired_version)
+            on_step = tracer.step
+        if plan.has_auto:
+            source, part = self.infer_auto_part()
+            plan = plan.resolve_auto(part)
+            if tracer is not None:
+                tracer.emit("auto", source=source, part=part)
+        steps: list[Step] = []
+        if record_steps:
+            trace_step = on_step
+
+            def on_step(index: int, bi: BumpInstruction, version: Any) -> None:
+                # the fast engine passes its mutable `CompactVersion`
+                if type(version) is Version:
+                    steps.append(Step(bi, version))
                 else:
-                    current_version = current_version.next_version(
-                        bi.version_part, prerelease_token=bi.token
-                    )
-                    rc_bumps_patch = False
-        if validate:
-            self.validate_bump(current_version, original_version, bumped_build=last_bump_was_build)
-        return str(current_version)
+                    steps.append(Step(bi, version.to_version()))
+                    if tracer is not None:
+                        tracer.versions += 1
+                if trace_step is not None:
+                    trace_step(index, bi, version)
+
+        if engine == "semver":
+            current_version, last_bump_was_build = plan.execute(original_version, on_step)
+        elif engine == "fast":
+            current_version, last_bump_was_build = fast_engine.execute(
+                plan, original_version, on_step
+            )
+            if tracer is not None:
+                tracer.versions += 1
+        else:
+            raise ValueError(f"Unknown engine `{engine}`. Use one of {self.ENGINES}")
+        if settings.index_url:
+            current_version = self.skip_published(current_version, settings.index_url)
+            if tracer is not None:
+                tracer.emit("index", version=str(current_version))
+        error = None
+        if settings.validate:
+            valid = False
+            try:
+                self.validate_bump(
+                    current_version, original_version, bumped_build=last_bump_was_build
+                )
+                valid = True
+            except ValidationError as e:
+                if raise_invalid:
+                    raise
+                error = e
+            finally:
+                if tracer is not None:
+                    tracer.emit("validate", bumped_build=last_bump_was_build, valid=valid)
+        return UpdateResult(
+            original_version,
+            current_version,
+            tuple(steps),
+            last_bump_was_build,
+            settings.validate,
+            error,
+        )
+
+    def infer_auto_part(self) -> tuple[str, str]:
+        """
+        Returns the source (the `source` option of the `auto` table) and the bump of
+        the `auto` instruction: `fragments` infers it from towncrier news fragments
+        (see `hatch_semver.fragments`), `commits` from the conventional commits since
+        the last release tag (see `hatch_semver.commits`).
+
+        ### Raises
+        `ValueError` if the `auto` table is invalid, the source is unknown
+        or it calls for no bump.
+        """
+        from .fragments import auto_table
+
+        source = auto_table(self.config).get("source", "fragments")
+        if source == "fragments":
+            from .fragments import infer_part
+        elif source == "commits":
+            from .commits import infer_part
+        else:
+            raise ValueError(f"Unknown auto source `{source}`. Use one of {self.AUTO_SOURCES}")
+        return source, infer_part(self.root, self.config)
+
+    def skip_published(self, version: Version, index_url: str) -> Version:
+        """
+        Returns the next version after *version* which is not yet published on the
+        PEP 691 package index *index_url*, see `hatch_semver.index.next_free_version`.
+        The project name is read from the `pyproject.toml` in the project root.
+        """
+        from . import index
+        from .workspace import read_project
+
+        client = index.client_for(index_url, index.default_cache_dir())
+        taken = client.versions(read_project(self.root).name)
+        return index.next_free_version(version, taken)
 
     def validate_bump(
         self, current_version: Version, original_version: Version, bumped_build: bool
@@ -115,6 +357,13 @@ class SemverScheme(VersionSchemeInterface):
         Raises [ValidationError](../errors/#validationerror) if the *current_version* (new version) is not higher than the *original_version*. \
         In case only a build identifier bump was performed as the last bump, `ValidationError` is \
         raised if the new version is not at least of equal precedence.
+
+        The rules of the configuration table `policy` (see `hatch_semver.policy`) are checked next,
+        `ValidationError` is raised if the bump violates any of them.
+
+        If the configuration option `ledger` names a release ledger (see `hatch_semver.ledger`),
+        `ValidationError` is also raised if the new version of the project is recorded there,
+        i.e. it was released before.
         """
         if bumped_build:
             comparator = ge
@@ -122,9 +371,7 @@ class SemverScheme(VersionSchemeInterface):
         else:
             comparator = gt
             relation = "higher than"
-        if comparator(current_version, original_version):
-            return
-        else:
+        if not comparator(current_version, original_version):
             raise ValidationError(
                 " ".join(
                     (
@@ -133,3 +380,22 @@ class SemverScheme(VersionSchemeInterface):
                     )
                 )
             )
+        settings = self.settings
+        if settings.policy:
+            settings.policy.check(current_version, original_version)
+        if settings.ledger:
+            self.check_ledger(current_version, settings.ledger)
+
+    def check_ledger(self, version: Version, ledger_path: str) -> None:
+        """
+        Raises `ValidationError` if *version* of the project is recorded in the release ledger
+        *ledger_path* (relative to the project root).
+        The project name is read from the `pyproject.toml` in the project root.
+        """
+        from .ledger import ledger_for
+        from .workspace import read_project
+
+        path = os.path.join(self.root, ledger_path)
+        name = read_project(self.root).name
+        if ledger_for(path).released(name, str(version)):
+            raise ValidationError(f"Version `{version}` of `{name}` was already released")
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+
+"""
+Opt-in instrumentation of `hatch_semver.semver_scheme.SemverScheme.update`.
+
+Tracing is turned on by the `trace` option in the `[tool.hatch.version]` table
+(a file path relative to the project root), by the `HATCH_SEMVER_TRACE` environment
+variable (a file path), or by registering a callback with `register`.
+Every call of `update` then produces these events:
+
+| Event      | Fields                                                                    |
+| ---------- | ------------------------------------------------------------------------- |
+| `parse`    | *version*: the original version                                           |
+| `compile`  | *instructions*: the bump instructions, parsed and normalized               |
+| `auto`     | *source*, *part*: the bump inferred from news fragments or commits        |
+| `step`     | *index*, *part*, *token*, *is_specific*, *repeat*, *version*: the result  |
+| `index`    | *version*: the first version not published on the package index          |
+| `validate` | *bumped_build*, *valid*: whether the new version passed the validation     |
+| `update`   | *original*, *instructions*, *engine*, *version*, *error*; total of the call |
+
+Each event also has a *duration_us* and a *versions* field: the time spent and the number of
+`semver.Version` objects hatch-semver created since the previous event, i.e. the result of
+every step of the `semver` engine, of the `fast` engine and of every parse which missed
+`hatch_semver.parse_cache`. Objects semver creates internally are not counted.
+Trace files get one JSON object per line, appended when `update` returns.
+Callbacks receive each event as a dictionary as soon as it happens.
+
+When tracing is off, `update` only checks the option, the value of the environment
+variable (read once on import) and the callback registry.
+Each thread counts only the objects it creates, so concurrent updates in several threads
+can be traced at the same time; their events are written to a shared trace file one
+update at a time.
+"""
+
+import os
+from collections.abc import Mapping
+from threading import Lock, local
+from time import perf_counter_ns
+from typing import Any, Callable, Optional
+
+from semver import Version
+
+from .bump_instruction import BumpInstruction
+
+CONFIG_KEY = "trace"
+"""
+Option in the `[tool.hatch.version]` table naming the trace file.
+"""
+ENVIRONMENT_VARIABLE = "HATCH_SEMVER_TRACE"
+"""
+Environment variable naming the trace file.
+"""
+environment_path: Optional[str] = os.environ.get(ENVIRONMENT_VARIABLE) or None
+"""
+Value of the environment variable `ENVIRONMENT_VARIABLE`, read once on import,
+because looking it up takes longer than some bumps.
+"""
+
+Callback = Callable[[dict[str, Any]], None]
+
+_callbacks: list[Callback] = []
+_active = local()
+_lock = Lock()
+
+
+def count_versions(count: int = 1) -> None:
+    """
+    Counts *count* `semver.Version` objects created by the calling thread
+    for its active `Tracer`, if there is one.
+    """
+    tracer = getattr(_active, "tracer", None)
+    if tracer is not None:
+        tracer.versions += count
+
+
+def register(callback: Callback) -> None:
+    """
+    Calls *callback* with every trace event from now on.
+    """
+    _callbacks.append(callback)
+
+
+def unregister(callback: Callback) -> None:
+    """
+    Stops calling *callback*.
+    """
+    _callbacks.remove(callback)
+
+
+class Tracer:
+    """
+    Records the events of one `update` call.
+    Use it as a context manager around the traced code.
+
+    ### Parameters
+    - *path*: the trace file to append the events to, or *None*.
+    - *callbacks*: functions to call with each event.
+    """
+
+    def __init__(self, path: Optional[str], callbacks: tuple[Callback, ...]) -> None:
+        self.path = path
+        self.callbacks = callbacks
+        self.events: list[dict[str, Any]] = []
+        self.versions = 0
+        """
+        Number of `semver.Version` objects created so far.
+        """
+        self._start = self._mark = 0
+        self._versions_at_mark = 0
+        self._outer: Optional[Tracer] = None
+
+    def __enter__(self) -> "Tracer":
+        self._outer = getattr(_active, "tracer", None)
+        _active.tracer = self
+        self._start = self._mark = perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        _active.tracer = self._outer
+        if self.path is not None:
+            import json
+
+            with _lock:
+                with open(self.path, "a", encoding="utf-8") as file:
+                    file.writelines(json.dumps(event) + "\n" for event in self.events)
+
+    def emit(self, event: str, **fields: Any) -> None:
+        """
+        Records an event which ends now and started with the previous one.
+        """
+        now = perf_counter_ns()
+        record = {
+            "event": event,
+            **fields,
+            "duration_us": (now - self._mark) / 1000,
+            "versions": self.versions - self._versions_at_mark,
+        }
+        self.events.append(record)
+        for callback in self.callbacks:
+            callback(record)
+        # the time spent on recording is not attributed to the next event
+        self._versions_at_mark = self.versions
+        self._mark = perf_counter_ns()
+
+    def step(self, index: int, bi: BumpInstruction, version: object) -> None:
+        """
+        Records a step of the bump plan, see `hatch_semver.bump_plan.BumpPlan.execute`.
+        """
+        if type(version) is Version and not bi.is_specific:
+            # a new result of the semver engine, specific versions come from the parse cache
+            self.versions += 1
+        self.emit(
+            "step",
+            index=index,
+            part=bi.version_part,
+            token=bi.token,
+            is_specific=bi.is_specific,
+            repeat=bi.repeat,
+            version=str(version),
+        )
+
+    def finish(self, **fields: Any) -> None:
+        """
+        Records the `update` event spanning the whole call.
+        """
+        self._mark = self._start
+        self._versions_at_mark = 0
+        self.emit("update", **fields)
+
+
+def tracer_for(config: Mapping, root: str) -> Optional[Tracer]:
+    """
+    Returns a `Tracer` if tracing is turned on for a project
+    with the `[tool.hatch.version]` table *config* in *root*, otherwise *None*.
+    """
+    path = config.get(CONFIG_KEY)
+    if path:
+        path = os.path.join(root, path)
+    else:
+        path = environment_path
+        if path is None and not _callbacks:
+            return None
+    return Tracer(path, tuple(_callbacks))
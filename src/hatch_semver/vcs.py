@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+
+"""
+Build metadata from the git repository, without running git.
+
+A `build` bump instruction can use a template as its token, e.g. `build={sha7}`
+or `build={branch}.{sha7}{dirty}`. The placeholders are filled from the repository
+containing the project:
+
+| Placeholder | Value                                                              |
+| ----------- | ------------------------------------------------------------------ |
+| `{sha}`     | the full commit hash of `HEAD`                                     |
+| `{sha7}`    | the first seven characters of the commit hash                      |
+| `{branch}`  | the current branch, `detached` if `HEAD` is detached               |
+| `{dirty}`   | `.dirty` if a tracked file differs from the index, otherwise empty |
+
+`HEAD` and the refs are read from the files in the git directory. Whether the working tree
+is dirty is decided by comparing the size and modification time of the tracked files with
+those recorded in the git index, i.e. a file which was only touched counts as modified.
+Untracked files are not considered. The information is read once per process.
+"""
+
+import os
+import re
+import struct
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterator
+
+from .git_tags import common_dir, find_git_dir
+
+ENTRY_HEADER = struct.Struct(">10I20sH")
+"""
+ctime (s, ns), mtime (s, ns), dev, ino, mode, uid, gid, size, object id, flags
+"""
+EXTENDED_FLAG = 0x4000
+ASSUME_VALID_FLAG = 0x8000
+SKIP_WORKTREE_FLAG = 0x4000 << 16
+GITLINK_MODE = 0o160000
+
+
+@dataclass(frozen=True)
+class VcsInfo:
+    """
+    The state of a git repository relevant for build metadata.
+    """
+
+    sha: str
+    """
+    The commit hash of `HEAD`.
+    """
+    branch: str
+    """
+    The current branch, or `detached`.
+    """
+    dirty: bool
+    """
+    Whether a tracked file differs from the index.
+    """
+
+    def placeholders(self) -> dict[str, str]:
+        """
+        The values of the template placeholders.
+        """
+        return {
+            "sha": self.sha,
+            "sha7": self.sha[:7],
+            "branch": re.sub(r"[^0-9A-Za-z-]+", "-", self.branch),
+            "dirty": ".dirty" if self.dirty else "",
+        }
+
+
+def resolve_ref(refs_dir: str, ref: str) -> str:
+    """
+    Returns the commit hash *ref* (e.g. `refs/heads/main`) points to.
+    """
+    try:
+        with open(os.path.join(refs_dir, *ref.split("/")), encoding="utf-8") as file:
+            return file.read().strip()
+    except FileNotFoundError:
+        pass
+    try:
+        with open(os.path.join(refs_dir, "packed-refs"), encoding="utf-8") as file:
+            for line in file:
+                sha, _, name = line.rstrip("\n").partition(" ")
+                if name == ref:
+                    return sha
+    except FileNotFoundError:
+        pass
+    raise ValueError(f"git reference {ref} not found (no commits yet?)")
+
+
+def read_head(git_dir: str) -> tuple[str, str]:
+    """
+    Returns the commit hash of `HEAD` and the current branch name.
+    """
+    with open(os.path.join(git_dir, "HEAD"), encoding="utf-8") as file:
+        head = file.read().strip()
+    if not head.startswith("ref:"):
+        return head, "detached"
+    ref = head[len("ref:") :].strip()
+    branch = ref[len("refs/heads/") :] if ref.startswith("refs/heads/") else ref
+    # HEAD is per worktree, but the branches are shared by all worktrees
+    return resolve_ref(common_dir(git_dir), ref), branch
+
+
+def read_index(path: str) -> Iterator[tuple[str, int, int, int, int, int]]:
+    """
+    Yields the path, mode, mtime seconds, mtime nanoseconds, size and flags
+    of every entry in a git index file (versions 2, 3 and 4).
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    signature, version, count = struct.unpack_from(">4sII", data)
+    if signature != b"DIRC" or version not in (2, 3, 4):
+        raise ValueError(f"unsupported git index {path}")
+    offset = 12
+    previous = b""
+    for _ in range(count):
+        fields = ENTRY_HEADER.unpack_from(data, offset)
+        mtime_s, mtime_ns, mode, size, flags = fields[2], fields[3], fields[6], fields[9], fields[11]
+        position = offset + ENTRY_HEADER.size
+        if flags & EXTENDED_FLAG:
+            flags |= struct.unpack_from(">H", data, position)[0] << 16
+            position += 2
+        if version == 4:
+            # the path is stored as the number of bytes to remove from the previous path
+            # (a variable length integer) and the suffix to append
+            strip = data[position] & 0x7F
+            while data[position] & 0x80:
+                position += 1
+                strip = ((strip + 1) << 7) | (data[position] & 0x7F)
+            position += 1
+            end = data.index(b"\0", position)
+            name = previous[: len(previous) - strip] + data[position:end]
+            offset = end + 1
+        else:
+            end = data.index(b"\0", position)
+            name = data[position:end]
+            # entries are padded with NULs to a multiple of eight bytes
+            offset += (end - offset + 8) & ~7
+        previous = name
+        yield name.decode("utf-8", "surrogateescape"), mode, mtime_s, mtime_ns, size, flags
+
+
+def is_dirty(git_dir: str, worktree: str) -> bool:
+    """
+    Compares the stat data in the index of *git_dir* with the files in *worktree*.
+    Returns on the first difference.
+    """
+    index = os.path.join(git_dir, "index")
+    if not os.path.isfile(index):
+        return False
+    for name, mode, mtime_s, mtime_ns, size, flags in read_index(index):
+        if flags & (ASSUME_VALID_FLAG | SKIP_WORKTREE_FLAG) or mode == GITLINK_MODE:
+            continue
+        try:
+            status = os.lstat(os.path.join(worktree, *name.split("/")))
+        except OSError:
+            return True
+        if (
+            status.st_size & 0xFFFFFFFF != size
+            or status.st_mtime_ns // 1_000_000_000 & 0xFFFFFFFF != mtime_s
+            or status.st_mtime_ns % 1_000_000_000 != mtime_ns
+        ):
+            return True
+    return False
+
+
+def worktree_of(git_dir: str, path: str) -> str:
+    """
+    Returns the top directory of the working tree whose git directory is *git_dir*.
+    """
+    directory = os.path.abspath(path)
+    while not os.path.exists(os.path.join(directory, ".git")):
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            break
+        directory = parent
+    return directory
+
+
+@lru_cache(maxsize=None)
+def read_vcs_info(path: str) -> VcsInfo:
+    """
+    Returns the `VcsInfo` of the repository containing *path*.
+    The result is cached for the lifetime of the process.
+
+    ### Raises
+    `ValueError` if *path* is not inside a git repository or it has no commits.
+    """
+    try:
+        git_dir = find_git_dir(path)
+    except FileNotFoundError as e:
+        raise ValueError(f"build metadata templates need a git repository: {e}") from e
+    sha, branch = read_head(git_dir)
+    return VcsInfo(sha=sha, branch=branch, dirty=is_dirty(git_dir, worktree_of(git_dir, path)))
+
+
+def render(template: str, path: str) -> str:
+    """
+    Fills the placeholders in *template* from the repository containing *path*.
+
+    ### Raises
+    `ValueError` on unknown placeholders or if *path* is not inside a git repository.
+    """
+    placeholders = read_vcs_info(os.path.abspath(path)).placeholders()
+    try:
+        return template.format_map(placeholders)
+    except (KeyError, IndexError) as e:
+        raise ValueError(
+            f"Unknown placeholder {e} in `{template}`. Use one of {sorted(placeholders)}"
+        ) from e
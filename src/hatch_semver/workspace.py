@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+
+"""
+Bumps the versions of many hatch projects at once.
+
+Every `pyproject.toml` below a root directory whose `[tool.hatch.version]` table uses
+the `semver` scheme and the (default) `regex` version source is a project.
+The projects are bumped by `hatch_semver.semver_scheme.SemverScheme.update`
+in a pool of worker processes, which saves starting a `hatch version` process for each.
+"""
+
+import os
+import sys
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+from hatchling.version.core import VersionFile
+
+from .errors import HatchSemverError
+from .semver_scheme import SemverScheme
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+PROJECT_FILE = "pyproject.toml"
+"""
+Name of the file which marks a project directory.
+"""
+EXCLUDED_DIRECTORIES = frozenset(("node_modules", "venv", "build", "dist", "site", "__pycache__"))
+"""
+Directories which are not searched for projects. Hidden directories are never searched.
+"""
+
+
+@dataclass(frozen=True)
+class BumpResult:
+    """
+    Outcome of bumping a single project.
+    """
+
+    root: str
+    """
+    Directory of the project.
+    """
+    name: str
+    """
+    Project name from `[project] name`, or the directory name.
+    """
+    old_version: Optional[str] = None
+    """
+    The version before the bump.
+    """
+    new_version: Optional[str] = None
+    """
+    The version after the bump. *None* if the project was skipped or the bump failed.
+    """
+    skipped: Optional[str] = None
+    """
+    Reason why the project was not bumped, e.g. because it uses a different scheme.
+    """
+    error: Optional[str] = None
+    """
+    Error message if the bump failed, e.g. on a `hatch_semver.errors.ValidationError`.
+    """
+
+
+def find_projects(root: str) -> Iterator[str]:
+    """
+    Yields the directories under *root* (including *root* itself)
+    which contain a `pyproject.toml`, in sorted order.
+    """
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories[:] = sorted(
+            d for d in subdirectories if not d.startswith(".") and d not in EXCLUDED_DIRECTORIES
+        )
+        if PROJECT_FILE in files:
+            yield directory
+
+
+@dataclass(frozen=True)
+class Project:
+    """
+    The parts of a project's `pyproject.toml` which hatch-semver cares about.
+    """
+
+    root: str
+    """
+    Directory of the project.
+    """
+    name: str
+    """
+    Project name from `[project] name`, or the directory name.
+    """
+    version_config: dict
+    """
+    The `[tool.hatch.version]` table.
+    """
+    dependencies: tuple[str, ...]
+    """
+    The requirement strings from `[project] dependencies`.
+    """
+
+
+def read_project(root: str) -> Project:
+    """
+    Reads a project's `pyproject.toml`.
+    """
+    with open(os.path.join(root, PROJECT_FILE), "rb") as file:
+        data = tomllib.load(file)
+    metadata = data.get("project", {})
+    return Project(
+        root=root,
+        name=metadata.get("name", os.path.basename(os.path.abspath(root))),
+        version_config=data.get("tool", {}).get("hatch", {}).get("version", {}),
+        dependencies=tuple(metadata.get("dependencies", ())),
+    )
+
+
+def read_version(project: Project) -> tuple[VersionFile, str]:
+    """
+    Reads the version of a *project* which uses the `regex` version source.
+
+    ### Return
+    The version file (to write the new version with) and the version.
+
+    ### Raises
+    `OSError` or `ValueError` if the version file cannot be read or parsed.
+    """
+    config = project.version_config
+    version_file = VersionFile(project.root, config.get("path", ""))
+    return version_file, version_file.read(pattern=config.get("pattern", ""))
+
+
+def skip_reason(project: Project) -> Optional[str]:
+    """
+    Returns why hatch-semver cannot bump *project*, or *None* if it can.
+    """
+    if project.version_config.get("scheme") != SemverScheme.PLUGIN_NAME:
+        return "scheme is not semver"
+    if project.version_config.get("source", "regex") != "regex":
+        return "version source is not regex"
+    return None
+
+
+def bump_project(root: str, instructions: str, dry_run: bool = False) -> BumpResult:
+    """
+    Bumps the version of the project in *root* by *instructions*.
+
+    ### Parameters
+    - *root*: the project directory.
+    - *instructions*: the chain of bump instructions, as for `hatch version`.
+    - *dry_run*: if *True*, the new version is computed but not written.
+
+    ### Return
+    A `BumpResult`. Errors are reported in it rather than raised, so that one
+    broken project does not stop the others.
+    """
+    try:
+        project = read_project(root)
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        return BumpResult(root=root, name=os.path.basename(root), error=str(e))
+    name = project.name
+    reason = skip_reason(project)
+    if reason:
+        return BumpResult(root=root, name=name, skipped=reason)
+    try:
+        version_file, old_version = read_version(project)
+        scheme = SemverScheme(root, project.version_config)
+        new_version = scheme.update(instructions, old_version, {})
+        if not dry_run:
+            version_file.set_version(new_version)
+    except (OSError, ValueError, HatchSemverError) as e:
+        return BumpResult(root=root, name=name, error=str(e))
+    return BumpResult(root=root, name=name, old_version=old_version, new_version=new_version)
+
+
+def bump_workspace(
+    root: str, instructions: str, jobs: Optional[int] = None, dry_run: bool = False
+) -> list[BumpResult]:
+    """
+    Bumps every project found under *root* by *instructions*.
+
+    ### Parameters
+    - *root*: the directory to search for projects.
+    - *instructions*: the chain of bump instructions, as for `hatch version`.
+    - *jobs*: number of worker processes. *None* uses one per CPU,
+            `1` bumps all projects in the current process.
+    - *dry_run*: if *True*, the new versions are computed but not written.
+
+    ### Return
+    A `BumpResult` for each project, in the order the projects were found.
+    """
+    projects = list(find_projects(root))
+    if jobs == 1 or len(projects) < 2:
+        return [bump_project(project, instructions, dry_run) for project in projects]
+    workers = jobs or os.cpu_count() or 1
+    chunksize = max(1, len(projects) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                bump_project,
+                projects,
+                (instructions,) * len(projects),
+                (dry_run,) * len(projects),
+                chunksize=chunksize,
+            )
+        )
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+
+
+import pytest
+from semver import Version
+
+from hatch_semver.bump_plan import BumpPlan, BumpPlanCache, CacheInfo
+
+
+class TestBumpPlan:
+    @pytest.mark.parametrize(
+        "instructions, parts",
+        (
+            ("minor", ("minor",)),
+            ("minor,rc", ("minor", "prerelease")),
+            ("patch,build=dev", ("patch", "build")),
+            ("fix,alpha,dev", ("patch", "prerelease", "build")),
+        ),
+    )
+    def test_compile(self, instructions: str, parts: tuple[str, ...]) -> None:
+        plan = BumpPlan.compile(instructions)
+        assert plan.source == instructions
+        assert tuple(step.version_part for step in plan.steps) == parts
+
+    def test_immutable(self) -> None:
+        plan = BumpPlan.compile("major")
+        with pytest.raises(AttributeError):
+            plan.steps = ()
+
+    @pytest.mark.parametrize(
+        "instructions, original, expected, bumped_build",
+        (
+            ("minor,rc", "2.3.8", "2.4.0-rc.1", False),
+            ("patch,build=dev", "1.0.0", "1.0.1+dev.1", True),
+            ("release", "1.2.3-rc.4", "1.2.3", False),
+            ("9.1.2-alpha.3+dev.1", "9.1.2-alpha.3+build.1", "9.1.2-alpha.3+dev.1", True),
+        ),
+    )
+    def test_execute(
+        self, instructions: str, original: str, expected: str, bumped_build: bool
+    ) -> None:
+        plan = BumpPlan.compile(instructions)
+        version, last_bump_was_build = plan.execute(Version.parse(original))
+        assert str(version) == expected
+        assert last_bump_was_build == bumped_build
+
+    def test_reusable(self) -> None:
+        plan = BumpPlan.compile("minor,rc")
+        assert str(plan.execute(Version.parse("1.0.0"))[0]) == "1.1.0-rc.1"
+        assert str(plan.execute(Version.parse("2.5.1"))[0]) == "2.6.0-rc.1"
+
+
+class TestBumpPlanCache:
+    def test_hits_and_misses(self) -> None:
+        cache = BumpPlanCache(maxsize=4)
+        first = cache.get("minor,rc")
+        second = cache.get("minor,rc")
+        assert first is second
+        info = cache.info()
+        assert (info.hits, info.misses, info.evictions, info.currsize) == (1, 1, 0, 1)
+
+    def test_lru_eviction(self) -> None:
+        cache = BumpPlanCache(maxsize=2)
+        cache.get("major")
+        cache.get("minor")
+        cache.get("major")
+        cache.get("patch")
+        info = cache.info()
+        assert info.evictions == 1
+        assert info.currsize == 2
+        cache.get("major")
+        assert cache.info().hits == 2
+        cache.get("minor")
+        assert cache.info().misses == 4
+
+    def test_invalid_instructions_are_not_cached(self) -> None:
+        cache = BumpPlanCache()
+        with pytest.raises(ValueError, match="specifically"):
+            cache.get("minor=4")
+        assert cache.info().currsize == 0
+
+    def test_clear(self) -> None:
+        cache = BumpPlanCache()
+        cache.get("major")
+        cache.clear()
+        assert cache.info() == CacheInfo(0, 0, 0, cache.maxsize, 0)
+
+    def test_invalid_maxsize(self) -> None:
+        with pytest.raises(ValueError, match="positive"):
+            BumpPlanCache(maxsize=0)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+
+
+from pathlib import Path
+
+import pytest
+
+from hatch_semver import cascade
+from hatch_semver.cascade import Node, cascade_workspace, plan_cascade
+from hatch_semver.cli import main
+from hatch_semver.errors import DependencyCycleError, ValidationError
+
+nodes = {
+    "core": Node("1.4.2"),
+    "utils": Node("0.3.0", ("core>=1.0",)),
+    "Web_App": Node("2.0.0", ("utils", "core[extra]; python_version >= '3.9'", "requests")),
+    "cli": Node("5.1.0", ("web-app==2.*",)),
+    "docs": Node("1.0.0"),
+}
+
+
+@pytest.mark.parametrize(
+    "requirement, name",
+    (
+        ("foo", "foo"),
+        ("Foo_Bar>=1.0", "foo-bar"),
+        ("foo.bar[extra] ; python_version < '3.11'", "foo-bar"),
+        ("  spaced ==1", "spaced"),
+        ("", None),
+    ),
+)
+def test_requirement_name(requirement: str, name: str) -> None:
+    assert cascade.requirement_name(requirement) == name
+
+
+def test_topological_levels() -> None:
+    graph = {"a": set(), "b": {"a"}, "c": {"a"}, "d": {"b", "c"}}
+    assert cascade.topological_levels(graph) == [["a"], ["b", "c"], ["d"]]
+
+
+def test_cycle() -> None:
+    with pytest.raises(DependencyCycleError, match="a, b"):
+        cascade.topological_levels({"a": {"b"}, "b": {"a"}, "c": set()})
+
+
+@pytest.mark.parametrize("workers", (1, 4))
+def test_major_cascade(workers: int) -> None:
+    plan = plan_cascade(nodes, {"core": "major"}, workers=workers)
+    assert [(b.name, b.new_version, b.triggered_by) for b in plan] == [
+        ("core", "2.0.0", ()),
+        ("utils", "0.4.0", ("core",)),
+        ("web-app", "2.1.0", ("core", "utils")),
+        ("cli", "5.1.1", ("web-app",)),
+    ]
+
+
+def test_policy() -> None:
+    plan = plan_cascade(nodes, {"utils": "patch"}, policy={"patch": None})
+    assert [b.name for b in plan] == ["utils"]
+    plan = plan_cascade(nodes, {"core": "rc"}, policy={"patch": "prerelease"})
+    assert [b.new_version for b in plan] == ["1.4.3-rc.1", "0.3.1-rc.1", "2.0.1-rc.1", "5.1.1-rc.1"]
+
+
+def test_explicit_bump_wins() -> None:
+    plan = plan_cascade(nodes, {"core": "major", "utils": "major"})
+    assert {b.name: b.new_version for b in plan}["utils"] == "1.0.0"
+
+
+@pytest.mark.parametrize(
+    "seeds, policy, error, match",
+    (
+        ({"nope": "major"}, None, ValueError, "Unknown projects"),
+        ({"core": "major"}, {"major": "huge"}, ValueError, "Invalid policy"),
+        ({"core": "1.0.0"}, None, ValidationError, "core: Version `1.0.0` is not higher"),
+    ),
+)
+def test_errors(seeds, policy, error, match) -> None:
+    with pytest.raises(error, match=match):
+        plan_cascade(nodes, seeds, **({"policy": policy} if policy else {}))
+
+
+def test_large_graph() -> None:
+    chain = {f"p{i}": Node("1.0.0", (f"p{i - 1}", f"p{i // 2}")) for i in range(1, 3000)}
+    chain["p0"] = Node("1.0.0")
+    plan = plan_cascade(chain, {"p0": "major"})
+    assert len(plan) == 3000
+    assert plan[1].new_version == "1.1.0"
+    assert plan[-1].new_version == "1.0.1"
+
+
+def make_project(root: Path, name: str, version: str, dependencies: tuple[str, ...] = ()) -> None:
+    project = root / name
+    project.mkdir()
+    (project / "version.py").write_text(f'__version__ = "{version}"\n')
+    (project / "pyproject.toml").write_text(
+        "\n".join(
+            (
+                "[project]",
+                f'name = "{name}"',
+                f"dependencies = {list(dependencies)!r}",
+                "[tool.hatch.version]",
+                'path = "version.py"',
+                'scheme = "semver"',
+            )
+        )
+    )
+
+
+def test_cascade_workspace(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    make_project(tmp_path, "core", "1.0.0")
+    make_project(tmp_path, "app", "0.1.0", ("core>=1",))
+    assert main(["cascade", "core:major", "--root", str(tmp_path), "-n"]) == 0
+    assert "app: 0.1.0 -> 0.2.0 (because of core)" in capsys.readouterr().out
+    assert (tmp_path / "app" / "version.py").read_text() == '__version__ = "0.1.0"\n'
+    plan = cascade_workspace(str(tmp_path), {"core": "minor"})
+    assert [b.new_version for b in plan] == ["1.1.0", "0.1.1"]
+    assert (tmp_path / "app" / "version.py").read_text() == '__version__ = "0.1.1"\n'
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+
+
+import random
+from itertools import product
+
+import pytest
+from semver import Version
+
+from hatch_semver.bump_plan import BumpPlan
+
+np = pytest.importorskip("numpy")
+columnar = pytest.importorskip("hatch_semver.columnar")
+
+vocabulary = (
+    "major",
+    "minor",
+    "patch",
+    "rc",
+    "rc=",
+    "beta",
+    "build",
+    "build=",
+    "dev",
+    "release",
+    "1.2.3",
+    "1.2.0+meta.1",
+    "2.0.0-rc.1",
+    "1.2.3+b.007",
+)
+
+originals = (
+    "0.0.0",
+    "1.2.3",
+    "1.2.0-rc.1",
+    "1.0.0+build.9",
+    "0.9.0-beta.2+devdrop0",
+    "2.0.0-pre+arst",
+    "3.1.4-rc.99",
+    "1.2.3-rc9",
+    "1.2.3-alpha",
+    "1.2.3-1.x",
+    "1.0.0+build.007",
+    "1.2.3-rc01",
+)
+
+
+def scalar(plan: BumpPlan, original: str) -> tuple[str, bool, bool]:
+    old = Version.parse(original)
+    new, last_bump_was_build = plan.execute(old)
+    return str(new), last_bump_was_build, new > old or (last_bump_was_build and new >= old)
+
+
+def assert_same_result(instructions: str) -> None:
+    batch = columnar.VersionBatch.from_strings(originals)
+    for optimize in (True, False):
+        plan = BumpPlan.compile(instructions, optimize=optimize)
+        result = columnar.apply(plan, batch)
+        rows = zip(result.to_strings(), result.bumped_build.tolist(), result.valid.tolist())
+        expected = [scalar(plan, original) for original in originals]
+        assert list(rows) == expected, instructions
+
+
+@pytest.mark.parametrize("length", (1, 2))
+def test_differential_exhaustive(length: int) -> None:
+    for chain in product(vocabulary, repeat=length):
+        assert_same_result(",".join(chain))
+
+
+def test_differential_random() -> None:
+    rng = random.Random(1010)
+    for _ in range(200):
+        chain = rng.choices(vocabulary, k=rng.randint(3, 10))
+        assert_same_result(",".join(chain))
+
+
+def test_roundtrip() -> None:
+    batch = columnar.VersionBatch.from_strings(originals)
+    assert batch.to_strings() == list(originals)
+    assert batch.scalar.keys() == {originals.index("1.0.0+build.007"), len(originals) - 1}
+
+
+def test_only_scalar_rows() -> None:
+    versions = ["1.2.3-rc01", "1.0.0+build.007", "1.0.0-x01+b.0"]
+    batch = columnar.VersionBatch.from_strings(versions)
+    assert batch.scalar.keys() == {0, 1, 2}
+    assert batch.to_strings() == versions
+    assert columnar.VersionBatch.from_strings(versions[:1]).to_strings() == versions[:1]
+    plan = BumpPlan.compile("patch")
+    result = columnar.apply(plan, batch)
+    rows = zip(result.to_strings(), result.bumped_build.tolist(), result.valid.tolist())
+    assert list(rows) == [scalar(plan, version) for version in versions]
+    assert columnar.compare(result.versions, batch).tolist() == [1, 0, 1]
+
+
+def test_invalid_version() -> None:
+    with pytest.raises(ValueError, match="at index 1"):
+        columnar.VersionBatch.from_strings(["1.2.3", "1.2"])
+
+
+def test_compare() -> None:
+    new = columnar.VersionBatch.from_strings(["1.0.0-rc.10", "1.0.0-rc10", "1.0.0", "1.0.0+b"])
+    old = columnar.VersionBatch.from_strings(
+        ["1.0.0-rc.9", "1.0.0-rc9", "1.0.0-rc.1", "1.0.0"], new.vocabulary
+    )
+    assert columnar.compare(new, old).tolist() == [1, -1, 1, 0]
+
+
+def test_scalar_constants() -> None:
+    batch = columnar.VersionBatch.from_strings(["1.2.3", "2.0.0"])
+    result = columnar.apply(BumpPlan.compile("1.2.3+b.007"), batch)
+    assert result.to_strings() == ["1.2.3+b.007", "1.2.3+b.007"]
+    assert result.scalar_rows.tolist() == [0, 1]
+    assert result.bumped_build.tolist() == [True, False]
+    assert result.valid.tolist() == [True, False]
+
+
+def test_build_templates_rejected() -> None:
+    batch = columnar.VersionBatch.from_strings(["1.2.3"])
+    with pytest.raises(ValueError, match="templates"):
+        columnar.apply(BumpPlan.compile("build={sha7}"), batch)
+
+
+def test_no_validation() -> None:
+    batch = columnar.VersionBatch.from_strings(["1.2.3"] * 3)
+    result = columnar.apply(BumpPlan.compile("minor,rc"), batch, validate=False)
+    assert result.valid is None
+    assert result.to_strings() == ["1.3.0-rc.1"] * 3
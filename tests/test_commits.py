@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from hatch_semver import commits
+from hatch_semver.commits import CHECKPOINT_FILE, TYPES, classify, infer, scan
+from hatch_semver.semver_scheme import SemverScheme
+
+needs_git = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+class Repository:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.git("init", "-q")
+
+    def git(self, *args: str) -> str:
+        identity = ("-c", "user.name=Foo Bar", "-c", "user.email=foo@bar.baz")
+        return subprocess.run(
+            ("git", *identity, *args), cwd=self.root, check=True, capture_output=True, text=True
+        ).stdout
+
+    def commit(self, *messages: str) -> None:
+        for message in messages:
+            self.git("commit", "-q", "--allow-empty", "-m", message)
+
+
+@pytest.fixture
+def repository(tmp_path: Path) -> Repository:
+    return Repository(tmp_path)
+
+
+@pytest.mark.parametrize(
+    "subject, bump",
+    (
+        ("feat: add auto", "minor"),
+        ("feat(cli): add auto", "minor"),
+        ("Fix: crash", "patch"),
+        ("perf: faster", "patch"),
+        ("docs: typo", ""),
+        ("refactor!: drop python 3.8", "major"),
+        ("feat(api)!: new signature", "major"),
+        ("feature request: something", ""),
+        ("Merge branch 'main'", ""),
+        ("feat:missing space", ""),
+    ),
+)
+def test_classify(subject: str, bump: str) -> None:
+    assert classify(subject, TYPES) == bump
+
+
+def test_scan() -> None:
+    log = [
+        "\x1eaaa fix: one\n",
+        "\n",
+        "\x1ebbb feat: two\n",
+        "body\n",
+        "\x1eccc chore: three\n",
+        "BREAKING CHANGE: the config changed\n",
+        "\x1eddd feat: never read\n",
+    ]
+    assert scan(log) == ("major", "ccc", 3)
+    assert scan(log[:4]) == ("minor", "bbb", 2)
+    assert scan([]) == ("", None, 0)
+    assert commits.LOG_FORMAT.startswith("--format=\x1e")
+
+
+@needs_git
+def test_since_release_tag(repository: Repository) -> None:
+    repository.commit("feat!: first", "fix: released")
+    repository.git("tag", "v1.0.0")
+    repository.commit("docs: readme", "feat: later")
+    repository.git("tag", "v1.1.0-rc.1")
+    repository.commit("fix: after the pre-release")
+    inference = infer(str(repository.root), "v", use_checkpoint=False)
+    assert (inference.part, inference.scanned, inference.since) == ("minor", 3, None)
+    assert inference.commit == repository.git("rev-parse", "HEAD~1").strip()
+    # without a release tag with the prefix all commits count
+    assert infer(str(repository.root), "x", use_checkpoint=False).part == "major"
+    repository.git("tag", "v1.1.0", "HEAD~1")
+    assert infer(str(repository.root), "v", use_checkpoint=False).part == "patch"
+    repository.git("tag", "v1.1.1")
+    assert infer(str(repository.root), "v", use_checkpoint=False).part is None
+
+
+@needs_git
+def test_stops_at_breaking_change(repository: Repository) -> None:
+    repository.commit(*(f"fix: {i}" for i in range(50)))
+    repository.git("commit", "-q", "--allow-empty", "-m", "chore: x\n\nBREAKING-CHANGE: y")
+    repository.commit(*(f"feat: {i}" for i in range(5)))
+    inference = infer(str(repository.root), use_checkpoint=False)
+    assert (inference.part, inference.scanned) == ("major", 6)
+
+
+@needs_git
+def test_checkpoint(repository: Repository, monkeypatch: pytest.MonkeyPatch) -> None:
+    root = str(repository.root)
+    repository.commit("chore: init")
+    repository.git("tag", "1.0.0")
+    repository.commit(*(f"fix: {i}" for i in range(20)))
+    first = infer(root)
+    assert (first.part, first.scanned, first.since) == ("patch", 20, None)
+    assert (repository.root / ".git" / CHECKPOINT_FILE).is_file()
+    # HEAD did not move: no git log at all
+    head = repository.git("rev-parse", "HEAD").strip()
+    monkeypatch.setattr(commits, "stream", None)
+    assert infer(root) == commits.Inference("patch", None, 0, head)
+    monkeypatch.undo()
+    repository.commit("docs: a", "feat: b", "docs: c")
+    second = infer(root)
+    assert (second.part, second.scanned, second.since) == ("minor", 3, head)
+    repository.commit("docs: d")
+    third = infer(root)
+    assert (third.part, third.scanned, third.commit) == ("minor", 1, None)
+    # a new release tag resets the checkpoint
+    repository.git("tag", "1.1.0")
+    repository.commit("fix: e")
+    fourth = infer(root)
+    assert (fourth.part, fourth.scanned, fourth.since) == ("patch", 1, None)
+    # so do other types
+    assert infer(root, types={"fix": ""}).part is None
+
+
+@needs_git
+def test_checkpoint_after_rewrite(repository: Repository) -> None:
+    root = str(repository.root)
+    repository.commit("chore: init", "feat!: breaking")
+    assert infer(root).part == "major"
+    repository.git("reset", "-q", "--hard", "HEAD~1")
+    repository.commit("fix: instead")
+    inference = infer(root)
+    assert (inference.part, inference.since) == ("patch", None)
+
+
+@needs_git
+def test_scheme(repository: Repository) -> None:
+    root = str(repository.root)
+    config = {"auto": {"source": "commits", "tag-prefix": "v"}}
+    repository.commit("feat: init")
+    repository.git("tag", "v1.2.3")
+    scheme = SemverScheme(root, config)
+    with pytest.raises(ValueError, match="No commit since the last release tag"):
+        scheme.update("auto", "1.2.3", {})
+    repository.commit("fix: a", "feat(cli): b")
+    assert scheme.update("auto,rc", "1.2.3", {}) == "1.3.0-rc.1"
+    config = {"auto": {"source": "commits", "tag-prefix": "v", "types": {"feat": "major"}}}
+    assert SemverScheme(root, config).update("auto", "1.2.3", {}) == "2.0.0"
+    with pytest.raises(ValueError, match="Unknown auto source"):
+        SemverScheme(root, {"auto": {"source": "tickets"}}).update("auto", "1.2.3", {})
+
+
+def test_no_repository(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="needs a git repository"):
+        infer(str(tmp_path))
+
+
+def test_invalid_configuration(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="`auto` must be a table"):
+        commits.infer_part(str(tmp_path), {"auto": True})
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+
+import gc
+import random
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from semver import Version
+
+from hatch_semver import tracing
+from hatch_semver.bump_plan import plan_cache
+from hatch_semver.concurrency import ThreadCounter, evict
+from hatch_semver.errors import ValidationError
+from hatch_semver.parse_cache import version_cache
+from hatch_semver.semver_scheme import SemverScheme
+
+INSTRUCTIONS = ("major", "minor", "patch", "minor,rc", "rc", "release", "build", "patch,alpha")
+
+
+@pytest.fixture
+def contention():
+    """
+    Switches threads as often as possible and makes the caches small, so that hits,
+    misses and evictions of different threads interleave.
+    """
+    interval = sys.getswitchinterval()
+    plan_size, version_size = plan_cache.maxsize, version_cache.maxsize
+    sys.setswitchinterval(1e-6)
+    plan_cache.maxsize = 3
+    version_cache.resize(5)
+    yield
+    sys.setswitchinterval(interval)
+    plan_cache.maxsize = plan_size
+    version_cache.resize(version_size)
+
+
+def jobs(count: int) -> list[tuple[str, str]]:
+    rng = random.Random(21)
+    return [
+        (rng.choice(INSTRUCTIONS), f"{rng.randrange(3)}.{rng.randrange(5)}.{rng.randrange(5)}")
+        for _ in range(count)
+    ]
+
+
+def outcome(scheme: SemverScheme, instructions: str, original: str) -> str:
+    try:
+        return scheme.update(instructions, original, {})
+    except ValidationError as e:
+        return f"error: {e}"
+
+
+@pytest.mark.parametrize("engine", SemverScheme.ENGINES)
+def test_shared_scheme(contention, engine: str) -> None:
+    scheme = SemverScheme(".", {"engine": engine})
+    work = jobs(4000)
+    expected = [outcome(SemverScheme(".", {"engine": engine}), *job) for job in work]
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda job: outcome(scheme, *job), work, chunksize=7))
+    assert results == expected
+    assert version_cache.info().currsize <= 5
+    assert plan_cache.info().currsize <= 3
+
+
+def test_validate_bump(contention) -> None:
+    scheme = SemverScheme(".", {"policy": {"forbid-skipping": True}})
+    pairs = [(Version.parse(new), Version.parse(old)) for new, old in (("1.2.4", "1.2.3"),) * 500]
+    pairs += [(Version.parse("1.2.5"), Version.parse("1.2.3"))] * 500
+
+    def validate(pair: tuple[Version, Version]) -> bool:
+        try:
+            scheme.validate_bump(*pair, bumped_build=False)
+        except ValidationError:
+            return False
+        return True
+
+    with ThreadPoolExecutor(8) as executor:
+        assert list(executor.map(validate, pairs)) == [True] * 500 + [False] * 500
+
+
+def test_thread_counter() -> None:
+    counter = ThreadCounter()
+
+    def count(_: int) -> None:
+        for _ in range(1000):
+            counter.increment()
+
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(count, range(16)))
+    assert counter.value == 16_000
+    counter.reset()
+    assert counter.value == 0
+
+
+def test_thread_counter_drops_ended_threads() -> None:
+    counter = ThreadCounter()
+    counter.increment()
+
+    def count() -> None:
+        for _ in range(10):
+            counter.increment()
+
+    for _ in range(100):
+        thread = threading.Thread(target=count)
+        thread.start()
+        thread.join()
+    gc.collect()
+    assert len(counter._cells) == 1
+    assert counter.value == 1001
+    counter.reset()
+    assert counter.value == 0
+
+
+def test_evict_second_chance() -> None:
+    entries = {"a": ["a", True], "b": ["b", False], "c": ["c", False]}
+    assert evict(entries, 2, 1) == [["b", False]]
+    assert list(entries) == ["c", "a"]
+    assert entries["a"][1] is False
+
+
+def test_tracers_count_their_own_thread(contention) -> None:
+    recorded: list[dict] = []
+    version_cache.parse("1.2.3")
+    tracing.register(recorded.append)
+    try:
+        scheme = SemverScheme(".", {})
+        with ThreadPoolExecutor(4) as executor:
+            list(executor.map(lambda _: scheme.update("patch", "1.2.3", {}), range(200)))
+    finally:
+        tracing.unregister(recorded.append)
+    updates = [event for event in recorded if event["event"] == "update"]
+    assert len(updates) == 200
+    # objects created by the other threads' updates are not counted
+    assert {event["versions"] for event in updates} == {1}
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+
+
+import json
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from hatch_semver.client import Client
+from hatch_semver.daemon import MAX_SCHEMES, VersionDaemon, remove_stale_socket
+from hatch_semver.errors import ValidationError
+from hatch_semver.semver_scheme import SemverScheme
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+
+@pytest.fixture
+def socket_path():
+    # socket paths must be short, so no pytest tmp_path
+    with tempfile.TemporaryDirectory(prefix="hs") as directory:
+        yield str(Path(directory) / "d.sock")
+
+
+def start(path: str, idle_timeout: float = 30) -> tuple[VersionDaemon, threading.Thread]:
+    import asyncio
+
+    daemon = VersionDaemon(path, idle_timeout)
+    thread = threading.Thread(target=asyncio.run, args=(daemon.serve(),), daemon=True)
+    thread.start()
+    # the socket file exists from bind() on, wait until the server answers
+    for _ in range(500):
+        with Client(path, fallback=False) as client:
+            if client.request({"op": "ping"}) is not None:
+                break
+        time.sleep(0.01)
+    return daemon, thread
+
+
+def test_update_and_validate(socket_path: str) -> None:
+    daemon, thread = start(socket_path)
+    with Client(socket_path) as client:
+        assert client.update("minor,rc", "1.2.3") == "1.3.0-rc.1"
+        assert client.used_daemon
+        assert client.validate("1.2.4", "1.2.3") is None
+        assert "not at least as high" in client.validate("1.2.2", "1.2.3", bumped_build=True)
+        with pytest.raises(ValidationError):
+            client.update("1.0.0", "1.2.3")
+        with pytest.raises(ValueError):
+            client.update("nonsense", "1.2.3")
+        assert client.update("major", "2.0.0", {"validate-bump": False}) == "3.0.0"
+        assert client.shutdown()
+    thread.join(5)
+    assert not thread.is_alive()
+    # the ping of start() is a request, too
+    assert daemon.requests == 8
+    assert not Path(socket_path).exists()
+
+
+def test_concurrent_clients(socket_path: str) -> None:
+    daemon, thread = start(socket_path)
+
+    def bump(patch: int) -> str:
+        with Client(socket_path, fallback=False) as client:
+            return client.update("patch", f"1.0.{patch}")
+
+    with ThreadPoolExecutor(16) as executor:
+        results = list(executor.map(bump, range(200)))
+    assert results == [f"1.0.{patch + 1}" for patch in range(200)]
+    Client(socket_path).shutdown()
+    thread.join(5)
+
+
+def test_protocol_errors(socket_path: str) -> None:
+    _, thread = start(socket_path)
+    with socket.socket(socket.AF_UNIX) as connection:
+        connection.connect(socket_path)
+        file = connection.makefile("rwb")
+        file.write(b'not json\n{"op": "what"}\n{"op": "update"}\n')
+        file.flush()
+        responses = [json.loads(file.readline()) for _ in range(3)]
+        file.close()
+    assert [response["ok"] for response in responses] == [False] * 3
+    assert "Missing field" in responses[2]["error"]
+    Client(socket_path).shutdown()
+    thread.join(5)
+
+
+def test_errors_of_the_scheme(socket_path: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    daemon = VersionDaemon(socket_path)
+
+    def update(*args) -> str:
+        raise KeyError("build")
+
+    monkeypatch.setattr(SemverScheme, "update", update)
+    response = daemon.answer({"op": "update", "instructions": "minor", "version": "1.2.3"})
+    assert response == {"ok": False, "error": "'build'", "type": "KeyError"}
+    assert daemon.answer({"op": "validate", "new": "1.2.4"})["error"] == "Missing field 'old'"
+    assert daemon.answer([])["ok"] is False
+
+
+def test_warm_schemes_are_capped(socket_path: str) -> None:
+    daemon = VersionDaemon(socket_path)
+    first = daemon.scheme(".", {})
+    for i in range(MAX_SCHEMES * 2):
+        daemon.scheme(".", {"trace": f"{i}.log"})
+        # kept as it is used
+        assert daemon.scheme(".", {}) is first
+    assert len(daemon._schemes) <= MAX_SCHEMES
+
+
+def test_idle_timeout(socket_path: str) -> None:
+    _, thread = start(socket_path, idle_timeout=0.2)
+    thread.join(5)
+    assert not thread.is_alive()
+    assert not Path(socket_path).exists()
+
+
+def test_fallback(socket_path: str) -> None:
+    with Client(socket_path) as client:
+        assert client.update("minor,rc", "1.2.3") == "1.3.0-rc.1"
+        assert not client.used_daemon
+        with pytest.raises(ValidationError):
+            client.update("1.0.0", "1.2.3")
+        assert not client.shutdown()
+    with pytest.raises(ConnectionError):
+        Client(socket_path, fallback=False).update("minor", "1.2.3")
+
+
+def test_stale_socket(socket_path: str) -> None:
+    stale = socket.socket(socket.AF_UNIX)
+    stale.bind(socket_path)
+    stale.close()
+    remove_stale_socket(socket_path)
+    assert not Path(socket_path).exists()
+    _, thread = start(socket_path)
+    with pytest.raises(RuntimeError):
+        remove_stale_socket(socket_path)
+    Client(socket_path).shutdown()
+    thread.join(5)
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+def test_build_metadata_follows_commits(socket_path: str, tmp_path: Path) -> None:
+    def git(*args: str) -> str:
+        identity = ("-c", "user.name=Foo Bar", "-c", "user.email=foo@bar.baz")
+        completed = subprocess.run(
+            ("git", *identity, *args), cwd=tmp_path, check=True, capture_output=True, text=True
+        )
+        return completed.stdout.strip()
+
+    git("init", "-q")
+    git("commit", "-q", "--allow-empty", "-m", "first")
+    _, thread = start(socket_path)
+    with Client(socket_path, fallback=False) as client:
+        first = client.update("build=g{sha7}", "1.2.3", root=str(tmp_path))
+        assert first == f"1.2.3+g{git('rev-parse', 'HEAD')[:7]}.1"
+        git("commit", "-q", "--allow-empty", "-m", "second")
+        second = client.update("build=g{sha7}", "1.2.3", root=str(tmp_path))
+        assert second == f"1.2.3+g{git('rev-parse', 'HEAD')[:7]}.1"
+        assert second != first
+        client.shutdown()
+    thread.join(5)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+
+
+import random
+from itertools import product
+
+import pytest
+from semver import Version
+
+from hatch_semver import fast_engine
+from hatch_semver.bump_plan import BumpPlan
+from hatch_semver.fast_engine import CompactVersion
+
+vocabulary = (
+    "major",
+    "minor",
+    "patch",
+    "rc",
+    "rc=",
+    "beta",
+    "build",
+    "build=",
+    "dev",
+    "release",
+    "1.2.3",
+    "1.2.0+meta.1",
+    "2.0.0-rc.1",
+    "a",
+)
+
+originals = (
+    "0.0.0",
+    "1.2.3",
+    "1.2.0-rc.1",
+    "1.0.0+build.9",
+    "0.9.0-beta.2+devdrop0",
+    "2.0.0-pre+arst",
+    "3.1.4-rc.99",
+)
+
+
+def execute(engine, plan: BumpPlan, original: str) -> tuple[str, bool]:
+    try:
+        version, last_bump_was_build = engine(plan, Version.parse(original))
+    except ValueError as e:
+        return f"ValueError: {e}", False
+    return str(version), last_bump_was_build
+
+
+def assert_same_result(instructions: str) -> None:
+    for optimize in (True, False):
+        plan = BumpPlan.compile(instructions, optimize=optimize)
+        for original in originals:
+            assert execute(fast_engine.execute, plan, original) == execute(
+                BumpPlan.execute, plan, original
+            ), f"{instructions} applied on {original}"
+
+
+@pytest.mark.parametrize("length", (1, 2, 3))
+def test_differential_exhaustive(length: int) -> None:
+    for chain in product(vocabulary, repeat=length):
+        assert_same_result(",".join(chain))
+
+
+def test_differential_random() -> None:
+    rng = random.Random(4321)
+    for _ in range(300):
+        chain = rng.choices(vocabulary, k=rng.randint(4, 16))
+        assert_same_result(",".join(chain))
+
+
+@pytest.mark.parametrize("original", originals)
+def test_roundtrip(original: str) -> None:
+    version = Version.parse(original)
+    compact = CompactVersion.from_version(version)
+    assert compact.to_version().to_tuple() == version.to_tuple()
+    assert compact.same_precedence(version.replace(build="other"))
+
+
+def test_slots() -> None:
+    with pytest.raises(AttributeError):
+        CompactVersion(1, 2, 3).local = "+foo"
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+
+import pytest
+
+from hatch_semver import fragments
+from hatch_semver.bump_plan import BumpPlan
+from hatch_semver.fragments import TYPES, classify, infer, types_for
+from hatch_semver.semver_scheme import SemverScheme
+
+
+def write_fragments(directory, *names: str) -> None:
+    directory.mkdir(exist_ok=True)
+    for name in names:
+        (directory / name).write_text("text\n", encoding="utf-8")
+
+
+@pytest.mark.parametrize(
+    "name, bump",
+    (
+        ("123.feature.md", "minor"),
+        ("+cache.fixed.md", "patch"),
+        ("123.feature.1.md", "minor"),
+        ("123!.fixed.md", "major"),
+        ("+api.removal.md", "major"),
+        ("123.doc.md", ""),
+        ("123!.doc.md", ""),
+        ("changelog_template.jinja", None),
+        ("README.md", None),
+    ),
+)
+def test_classify(name: str, bump: str) -> None:
+    assert classify(name, TYPES) == bump
+
+
+def test_infer(tmp_path) -> None:
+    directory = tmp_path / "changelog.d"
+    assert infer(str(directory)).part is None
+    write_fragments(directory, "changelog_template.jinja", "1.doc.md", ".hidden.feature.md")
+    assert infer(str(directory)).part is None
+    write_fragments(directory, "2.fixed.md", "3.improved.md")
+    assert infer(str(directory)).part == "patch"
+    write_fragments(directory, "4.feature.md")
+    inference = infer(str(directory))
+    assert (inference.part, inference.fragment) == ("minor", "4.feature.md")
+    # a directory named like a fragment is ignored
+    (directory / "5!.feature.md").mkdir()
+    assert infer(str(directory)).part == "minor"
+
+
+def test_stops_at_major(tmp_path) -> None:
+    directory = tmp_path / "changelog.d"
+    write_fragments(directory, *(f"{i}.fixed.md" for i in range(200)), "999!.feature.md")
+    inference = infer(str(directory))
+    assert (inference.part, inference.fragment) == ("major", "999!.feature.md")
+    assert inference.scanned <= 202
+    write_fragments(directory, *(f"+{i}.removal.md" for i in range(200)))
+    assert infer(str(directory)).scanned < 402
+
+
+def test_configuration(tmp_path) -> None:
+    config = {"auto": {"types": {"improved": "minor", "security": "patch"}}}
+    types = types_for(config)
+    assert (types["improved"], types["security"], types["fixed"]) == ("minor", "patch", "patch")
+    with pytest.raises(ValueError):
+        types_for({"auto": {"types": {"feature": "prerelease"}}})
+    assert fragments.directory_for(str(tmp_path), {}) == str(tmp_path / "changelog.d")
+    (tmp_path / "pyproject.toml").write_text(
+        '[tool.towncrier]\ndirectory = "news"\n', encoding="utf-8"
+    )
+    assert fragments.directory_for(str(tmp_path), {}) == str(tmp_path / "news")
+    assert fragments.directory_for(str(tmp_path), {"auto": {"directory": "x"}}) == str(tmp_path / "x")
+
+
+@pytest.mark.parametrize("config", ({"auto": True}, {"auto": "fragments"}, {"auto": {"types": []}}))
+def test_invalid_configuration(tmp_path, config: dict) -> None:
+    with pytest.raises(ValueError, match="must be a table"):
+        types_for(config)
+    with pytest.raises(ValueError, match="must be a table"):
+        SemverScheme(str(tmp_path), config).update("auto", "1.2.3", {})
+    assert fragments.auto_table({}) == {}
+
+
+def test_plan() -> None:
+    plan = BumpPlan.compile("patch,auto,rc")
+    assert plan.has_auto
+    resolved = plan.resolve_auto("minor")
+    assert not resolved.has_auto
+    assert [bi.version_part for bi in resolved.steps] == ["patch", "minor", "prerelease"]
+    with pytest.raises(ValueError):
+        BumpPlan.compile("auto=minor")
+
+
+@pytest.mark.parametrize("engine", SemverScheme.ENGINES)
+def test_scheme(tmp_path, engine: str) -> None:
+    scheme = SemverScheme(str(tmp_path), {"engine": engine})
+    with pytest.raises(ValueError, match="No news fragment"):
+        scheme.update("auto", "1.2.3", {})
+    write_fragments(tmp_path / "changelog.d", "1.fixed.md")
+    assert scheme.update("auto", "1.2.3", {}) == "1.2.4"
+    write_fragments(tmp_path / "changelog.d", "2.feature.md")
+    assert scheme.update("auto,rc", "1.2.3", {}) == "1.3.0-rc.1"
+    config = {"engine": engine, "auto": {"types": {"feature": "major"}}}
+    assert SemverScheme(str(tmp_path), config).update("auto", "1.2.3", {}) == "2.0.0"
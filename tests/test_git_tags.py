@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+
+
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+from semver import Version
+
+from hatch_semver import git_tags
+from hatch_semver.cli import main
+from hatch_semver.git_tags import TagIndex, find_git_dir, latest_version
+from hatch_semver.semver_scheme import SemverScheme
+
+sha = "0123456789abcdef0123456789abcdef01234567"
+
+
+def make_repository(root: Path, packed: tuple[str, ...], loose: tuple[str, ...] = ()) -> Path:
+    git_dir = root / ".git"
+    (git_dir / "refs" / "tags").mkdir(parents=True)
+    lines = ["# pack-refs with: peeled fully-peeled sorted"]
+    for tag in packed:
+        lines.append(f"{sha} refs/tags/{tag}")
+        lines.append(f"^{sha}")
+    lines.append(f"{sha} refs/heads/main")
+    (git_dir / "packed-refs").write_text("\n".join(lines) + "\n")
+    for tag in loose:
+        path = git_dir / "refs" / "tags" / tag
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(sha + "\n")
+    return git_dir
+
+
+@pytest.fixture
+def repository(tmp_path: Path) -> Path:
+    make_repository(
+        tmp_path,
+        ("v1.0.0", "v1.10.0", "v1.9.0", "v2.0.0-rc.1", "not-a-version", "1.5.0", "v1.2"),
+        ("v1.10.1", "release/v9.0.0"),
+    )
+    return tmp_path
+
+
+def test_latest(repository: Path) -> None:
+    index = TagIndex(str(repository), prefix="v")
+    assert len(index) == 5
+    assert str(index.latest()) == "2.0.0-rc.1"
+    assert str(index.latest(include_prereleases=False)) == "1.10.1"
+    assert str(index.latest_below(Version.parse("1.10.0"))) == "1.9.0"
+    assert index.latest_below(Version.parse("1.0.0")) is None
+    assert index.tag(Version.parse("1.10.1")) == "v1.10.1"
+    assert [str(v) for v in index.versions] == ["1.0.0", "1.9.0", "1.10.0", "1.10.1", "2.0.0-rc.1"]
+
+
+def test_prefix(repository: Path) -> None:
+    assert latest_version(str(repository)) == "1.5.0"
+    assert latest_version(str(repository), prefix="release/v") == "9.0.0"
+    assert latest_version(str(repository), prefix="nothing") is None
+
+
+def test_incremental_cache(repository: Path) -> None:
+    first = TagIndex(str(repository), prefix="v")
+    assert first.parsed_tags == 6
+    assert (repository / ".git" / git_tags.CACHE_FILE).is_file()
+    second = TagIndex(str(repository), prefix="v")
+    assert second.parsed_tags == 0
+    assert second.versions == first.versions
+    packed_refs = repository / ".git" / "packed-refs"
+    with packed_refs.open("a") as file:
+        file.write(f"{sha} refs/tags/v3.0.0\n")
+    third = TagIndex(str(repository), prefix="v")
+    assert third.parsed_tags == 1
+    assert str(third.latest()) == "3.0.0"
+    (repository / ".git" / "refs" / "tags" / "v1.10.1").unlink()
+    assert str(TagIndex(str(repository), prefix="v").latest(False)) == "3.0.0"
+    assert TagIndex(str(repository), prefix="v").tag(Version.parse("1.10.1")) is None
+
+
+def test_lazy_versions(repository: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    TagIndex(str(repository), prefix="v")
+    parsed: list[str] = []
+    parse = Version.parse
+    monkeypatch.setattr(Version, "parse", lambda version: parsed.append(version) or parse(version))
+    cached = TagIndex(str(repository), prefix="v")
+    assert (cached.parsed_tags, parsed) == (0, [])
+    assert cached.tag(Version(1, 9, 0)) == "v1.9.0"
+    assert str(cached.latest()) == str(cached.latest()) == "2.0.0-rc.1"
+    assert parsed == ["2.0.0-rc.1"]
+
+
+def test_old_cache_format(repository: Path) -> None:
+    cache = {"prefix": "v", "packed_refs": None, "packed": [], "tags": {"v1.0.0": "1.0.0"}}
+    (repository / ".git" / git_tags.CACHE_FILE).write_text(json.dumps(cache))
+    index = TagIndex(str(repository), prefix="v")
+    assert (index.parsed_tags, len(index)) == (6, 5)
+
+
+def test_add(repository: Path) -> None:
+    index = TagIndex(str(repository), prefix="v", use_cache=False)
+    index.add("v1.9.5")
+    index.add("garbage")
+    assert str(index.latest_below(Version.parse("1.10.0"))) == "1.9.5"
+    assert not (repository / ".git" / git_tags.CACHE_FILE).exists()
+
+
+def test_worktree_git_file(repository: Path, tmp_path: Path) -> None:
+    worktree = tmp_path / "worktree"
+    worktree.mkdir()
+    (worktree / ".git").write_text(f"gitdir: {repository / '.git'}\n")
+    (worktree / "src").mkdir()
+    assert find_git_dir(str(worktree / "src")) == str(repository / ".git")
+
+
+def test_not_a_repository(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        find_git_dir(str(tmp_path))
+
+
+def test_as_original_version(repository: Path) -> None:
+    original = latest_version(str(repository), prefix="v", include_prereleases=False)
+    assert SemverScheme(str(repository), {}).update("minor", original, {}) == "1.11.0"
+
+
+def test_cli(repository: Path, capsys: pytest.CaptureFixture) -> None:
+    assert main(["latest", "--root", str(repository), "--prefix", "v"]) == 0
+    assert capsys.readouterr().out == "2.0.0-rc.1\n"
+    assert main(["latest", "--root", str(repository), "--prefix", "x"]) == 1
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+def test_real_repository(tmp_path: Path) -> None:
+    def git(*args: str) -> None:
+        identity = ("-c", "user.name=Foo Bar", "-c", "user.email=foo@bar.baz")
+        subprocess.run(("git", *identity, *args), cwd=tmp_path, check=True, capture_output=True)
+
+    git("init")
+    git("commit", "--allow-empty", "-m", "init")
+    for tag in ("0.1.0", "0.2.0", "0.10.0-beta.1"):
+        git("tag", tag)
+    git("pack-refs", "--all")
+    git("tag", "-a", "-m", "annotated", "0.10.0")
+    assert latest_version(str(tmp_path)) == "0.10.0"
+    assert os.path.isfile(tmp_path / ".git" / git_tags.CACHE_FILE)
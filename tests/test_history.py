@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+
+
+import pytest
+
+from hatch_semver.cli import main
+from hatch_semver.history import check_history
+
+
+def test_valid_history() -> None:
+    history = ["0.1.0", "0.1.1-rc.1", "0.1.1", "0.1.1+build.2", "0.2.0", "1.0.0-alpha", "1.0.0"]
+    report = check_history(history)
+    assert report.ok
+    assert report.count == len(history)
+
+
+@pytest.mark.parametrize("chunk_size", (1, 2, 3, 100))
+def test_violations(chunk_size: int) -> None:
+    history = [
+        "1.0.0",
+        "1.1.0",
+        "1.0.5",
+        "1.0.5",
+        "not a version",
+        "1.0.5+b",
+        "1.0.6-rc.10",
+        "1.0.6-rc.9",
+        "1.0.6",
+    ]
+    report = check_history(history, chunk_size=chunk_size)
+    assert [(v.index, v.previous, v.relation) for v in report.violations] == [
+        (2, "1.1.0", "lower"),
+        (3, "1.0.5", "equal"),
+        (7, "1.0.6-rc.10", "lower"),
+    ]
+    assert report.invalid == (4,)
+    assert not report.ok
+
+
+def test_stream() -> None:
+    report = check_history(f"1.{i}.0\n" for i in range(20000))
+    assert report.ok
+    assert report.count == 20000
+
+
+def test_cli(tmp_path, capsys) -> None:
+    path = tmp_path / "history.txt"
+    path.write_text("1.0.0\n0.9.0\n", encoding="utf-8")
+    assert main(["history", str(path)]) == 1
+    assert "line 2: 0.9.0 is not higher than 1.0.0 (lower)" in capsys.readouterr().err
@@ -1,8 +1,49 @@
 #!/usr/bin/env python
 
 
+import subprocess
+import sys
+from typing import Generator
+
+from hatch.utils.fs import Path
+
+import hatch_semver
 from hatch_semver.plugin import hooks
+from hatch_semver.semver_scheme import SemverScheme
 
 
 def test_hook():
     assert hooks.hatch_register_version_scheme()
+
+
+def test_plugin_name():
+    assert hooks.hatch_register_version_scheme().PLUGIN_NAME == SemverScheme.PLUGIN_NAME
+
+
+def test_lazy_scheme(isolation: Generator[Path, None, None]):
+    scheme_class = hooks.hatch_register_version_scheme()
+    scheme = scheme_class(str(isolation), {})
+    assert isinstance(scheme, SemverScheme)
+    assert isinstance(scheme, scheme_class)
+    assert scheme_class.INSTRUCTION_SEPARATOR == SemverScheme.INSTRUCTION_SEPARATOR
+    assert scheme.update("minor", "1.2.3", {}) == "1.3.0"
+
+
+def test_no_heavy_imports():
+    code = "; ".join(
+        (
+            "import sys",
+            "import hatch_semver.plugin.hooks as hooks",
+            "hooks.hatch_register_version_scheme()",
+            "print(sorted(m for m in ('semver', 'copy', 'hatchling.version') if m in sys.modules))",
+        )
+    )
+    completed = subprocess.run(
+        (sys.executable, "-c", code), capture_output=True, check=True, text=True
+    )
+    assert completed.stdout.strip() == "[]"
+
+
+def test_package_attributes():
+    assert hatch_semver.SemverScheme is SemverScheme
+    assert "BumpPlan" in dir(hatch_semver)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from hatch_semver import index
+from hatch_semver.index import IndexClient, next_free_version
+from hatch_semver.semver_scheme import SemverScheme
+
+PAGES = {
+    "/simple/alpha/": {
+        "meta": {"api-version": "1.0"},
+        "name": "alpha",
+        "files": [
+            {"filename": "alpha-1.2.3.tar.gz"},
+            {"filename": "alpha-1.2.3-py3-none-any.whl"},
+            {"filename": "alpha-1.3.0rc1-py3-none-any.whl"},
+            {"filename": "alpha-1.3.0rc2.tar.gz"},
+        ],
+    },
+    "/simple/beta/": {"meta": {"api-version": "1.1"}, "name": "beta", "versions": ["2.0.0"]},
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self) -> None:
+        self.server.paths.append(self.path)
+        if self.path in ("/simple/alpha", "/simple/beta"):
+            self.send_response(301)
+            self.send_header("Location", self.path + "/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/simple/garbage/":
+            self.wfile.write(b"garbage\r\n\r\n")
+            self.close_connection = True
+            return
+        if self.path == "/simple/truncated/":
+            self.send_response(200)
+            self.send_header("Content-Length", "100")
+            self.end_headers()
+            self.wfile.write(b'{"files": ')
+            self.close_connection = True
+            return
+        page = PAGES.get(self.path)
+        if page is None:
+            self.send_error(404)
+            return
+        assert self.headers["Accept"] == index.ACCEPT
+        etag = f'"{self.path}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.server.revalidated += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps(page).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", index.ACCEPT)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.connections = 0
+    httpd.paths = []
+    httpd.revalidated = 0
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def url(server) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}/simple/"
+
+
+def test_versions(server, tmp_path) -> None:
+    with IndexClient(url(server), str(tmp_path)) as client:
+        assert client.versions("Alpha") == {"1.2.3", "1.3.0rc1", "1.3.0rc2"}
+        assert client.versions("beta") == {"2.0.0"}
+        assert client.versions("gamma") == set()
+        assert client.connections == 1
+    assert server.connections == 1
+
+
+def test_etag_revalidation(server, tmp_path) -> None:
+    with IndexClient(url(server), str(tmp_path)) as client:
+        client.versions("alpha")
+    with IndexClient(url(server), str(tmp_path)) as client:
+        assert client.versions("alpha") == {"1.2.3", "1.3.0rc1", "1.3.0rc2"}
+    assert server.revalidated == 1
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_no_cache(server) -> None:
+    with IndexClient(url(server)) as client:
+        assert client.versions("beta") == {"2.0.0"}
+
+
+@pytest.mark.parametrize("project", ("garbage", "truncated"))
+def test_invalid_response(server, project: str) -> None:
+    with IndexClient(url(server)) as client:
+        with pytest.raises(ValueError, match="Invalid response of the package index"):
+            client.versions(project)
+        # the broken connection is not reused
+        assert client.versions("beta") == {"2.0.0"}
+        assert client.connections == 2
+
+
+@pytest.mark.parametrize(
+    "version, expected",
+    (
+        ("1.2.4", "1.2.4"),
+        ("1.2.3", "1.2.4"),
+        ("1.3.0-rc.1", "1.3.0-rc.3"),
+        ("1.2.3+build.1", "1.2.3+build.2"),
+    ),
+)
+def test_next_free_version(version: str, expected: str) -> None:
+    taken = {"1.2.3", "1.3.0rc1", "1.3.0rc2", "1.2.3+build.1"}
+    assert str(next_free_version(version, taken)) == expected
+
+
+def test_scheme(server, tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    (tmp_path / "pyproject.toml").write_text('[project]\nname = "alpha"\n', encoding="utf-8")
+    scheme = SemverScheme(str(tmp_path), {"index-url": url(server)})
+    assert scheme.update("minor,rc", "1.2.3", {}) == "1.3.0-rc.3"
+    assert scheme.update("major", "1.2.3", {}) == "2.0.0"
+    client = index.client_for(url(server), index.default_cache_dir())
+    assert client.connections == 1
+    # every thread has its own client
+    with ThreadPoolExecutor(1) as executor:
+        other = executor.submit(index.client_for, url(server), index.default_cache_dir()).result()
+    assert other is not client
+    assert index.client_for(url(server), index.default_cache_dir()) is client
+    client.close()
+    index._local.clients.clear()
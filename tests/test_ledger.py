@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+import threading
+
+import pytest
+
+from hatch_semver import ledger
+from hatch_semver.cli import main
+from hatch_semver.errors import ValidationError
+from hatch_semver.ledger import ReleaseLedger
+from hatch_semver.semver_scheme import SemverScheme
+
+
+def test_missing_file_is_empty(tmp_path) -> None:
+    with ReleaseLedger(str(tmp_path / "ledger")) as releases:
+        assert len(releases) == 0
+        assert not releases.released("alpha", "1.0.0")
+        assert list(releases) == []
+
+
+def test_empty_file_is_empty(tmp_path) -> None:
+    path = tmp_path / "ledger"
+    path.touch()
+    with ReleaseLedger(str(path)) as releases:
+        assert len(releases) == 0
+        assert not releases.released("alpha", "1.0.0")
+        assert list(releases) == []
+        assert releases.add("alpha", "1.0.0")
+    assert ReleaseLedger(str(path)).released("alpha", "1.0.0")
+
+
+def test_add_and_lookup(tmp_path) -> None:
+    path = str(tmp_path / "ledger")
+    releases = ReleaseLedger(path)
+    assert releases.add("My_Project", "1.0.0")
+    assert not releases.add("my-project", "1.0.0")
+    assert releases.add("my-project", "1.0.0+build.1")
+    assert releases.released("my.project", "1.0.0")
+    assert not releases.released("my-project", "1.0.1")
+    assert not releases.released("other", "1.0.0")
+    # another reader maps the file without loading it
+    assert ReleaseLedger(path).released("MY-PROJECT", "1.0.0+build.1")
+    assert list(releases) == [("my-project", "1.0.0"), ("my-project", "1.0.0+build.1")]
+
+
+def test_growth_keeps_records_in_order(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(ledger, "INITIAL_SLOTS", 4)
+    releases = ReleaseLedger(str(tmp_path / "ledger"))
+    expected = [(f"p{i % 3}", f"1.{i}.0") for i in range(100)]
+    for i, (project, version) in enumerate(expected):
+        assert releases.add(project, version)
+        assert len(releases) == i + 1
+    assert releases.add_many(expected + [("new", "1.0.0"), ("new", "1.0.0")]) == 1
+    assert list(releases) == expected + [("new", "1.0.0")]
+    assert all(releases.released(project, version) for project, version in expected)
+
+
+def test_not_a_ledger(tmp_path) -> None:
+    path = tmp_path / "ledger"
+    path.write_bytes(b"[]" * 20)
+    with pytest.raises(ValueError):
+        ReleaseLedger(str(path))
+
+
+def test_concurrent_writers(tmp_path) -> None:
+    path = str(tmp_path / "ledger")
+
+    def write(worker: int) -> None:
+        releases = ReleaseLedger(path)
+        for i in range(50):
+            releases.add(f"p{worker}", f"1.{i}.0")
+
+    threads = [threading.Thread(target=write, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    releases = ReleaseLedger(path)
+    assert len(releases) == 200
+    assert len(set(releases)) == 200
+
+
+def test_scheme(tmp_path) -> None:
+    (tmp_path / "pyproject.toml").write_text('[project]\nname = "alpha"\n', encoding="utf-8")
+    ReleaseLedger(str(tmp_path / "releases.ledger")).add("alpha", "1.0.1")
+    scheme = SemverScheme(str(tmp_path), {"ledger": "releases.ledger"})
+    assert scheme.update("minor", "1.0.0", {}) == "1.1.0"
+    with pytest.raises(ValidationError, match="already released"):
+        scheme.update("patch", "1.0.0", {})
+    assert SemverScheme(str(tmp_path), {}).update("patch", "1.0.0", {}) == "1.0.1"
+
+
+def test_cli(tmp_path, capsys) -> None:
+    path = str(tmp_path / "ledger")
+    assert main(["ledger", path, "alpha", "1.0.0", "1.1.0", "--add"]) == 0
+    assert main(["ledger", path, "alpha", "1.1.0", "1.2.0"]) == 1
+    assert "alpha 1.1.0 was already released" in capsys.readouterr().err
+    assert main(["ledger", path]) == 0
+    assert capsys.readouterr().out == "alpha 1.0.0\nalpha 1.1.0\n"
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+
+import json
+from pathlib import Path
+
+import pytest
+
+from hatch_semver.cli import main
+from hatch_semver.lockfiles import Change, audit, classify, read_pins
+
+REQUIREMENTS = """\
+# generated by pip-compile
+--index-url https://pypi.org/simple
+Foo_Bar==1.2.3 \\
+    --hash=sha256:0123
+requests[socks]==2.31.0 ; python_version >= "3.8"  # via -r requirements.in
+-e ./local
+black===24.1.0
+not-pinned>=1.0
+"""
+
+LOCKFILE = """\
+version = 1
+requires-python = ">=3.9"
+
+[[package]]
+name = "foo.bar"
+version = "1.2.3"
+source = { registry = "https://pypi.org/simple" }
+dependencies = [
+    { name = "requests" },
+]
+
+[package.dependencies]
+requests = { version = ">=2.0" }
+
+[[package]]
+name = "requests"
+version = "2.31.0"
+"""
+
+
+def test_read_pins() -> None:
+    assert list(read_pins(REQUIREMENTS.splitlines())) == [
+        ("foo-bar", "1.2.3"),
+        ("requests", "2.31.0"),
+        ("black", "24.1.0"),
+    ]
+    assert list(read_pins(LOCKFILE.splitlines())) == [
+        ("foo-bar", "1.2.3"),
+        ("requests", "2.31.0"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "old, new, change",
+    (
+        ("1.2.3", "2.0.0", "major"),
+        ("1.2.3", "1.3.0", "minor"),
+        ("1.2.3", "1.2.4", "patch"),
+        ("1.3.0-rc.1", "1.3.0-rc.2", "prerelease"),
+        ("1.3.0-rc.1", "1.3.0", "prerelease"),
+        ("1.2.3+a", "1.2.3+b", "build"),
+        ("1.2.3", "1.2.3", "unchanged"),
+        ("2.0.0", "1.9.9", "downgrade"),
+        ("1.3.0", "1.3.0-rc.1", "downgrade"),
+        ("1.3.0-rc.10", "1.3.0-rc.9", "downgrade"),
+        # PEP 440 versions
+        ("2.0", "2.0.0", "unchanged"),
+        ("2.0", "2.1", "minor"),
+        ("2.1.0rc1", "2.1.0", "prerelease"),
+        ("2.1.0", "2.1.0rc1", "downgrade"),
+        ("1.2.3.post1", "1.2.4", "unknown"),
+        ("1!2.0", "1!2.1", "unknown"),
+    ),
+)
+def test_classify(old: str, new: str, change: str) -> None:
+    assert classify(old, new) == change
+
+
+def test_audit() -> None:
+    old = ["a==1.0.0", "b==1.0.0", "c==2.0.0", "d==1.0.0", "e==1.0.0", "e==1.1.0"]
+    new = ["A==1.1.0", "c==1.0.0", "d==1.0.0", "f==0.1.0", "e==1.2.0"]
+    changes: list[Change] = []
+    summary = audit(old, new, changes.append)
+    assert changes == [
+        Change("a", "1.0.0", "1.1.0", "minor"),
+        Change("c", "2.0.0", "1.0.0", "downgrade"),
+        Change("f", None, "0.1.0", "added"),
+        Change("e", "1.1.0", "1.2.0", "minor"),
+        Change("b", "1.0.0", None, "removed"),
+    ]
+    assert (summary.old, summary.new, summary.downgrades) == (5, 5, 1)
+    assert {change: count for change, count in summary.counts.items() if count} == {
+        "minor": 2,
+        "downgrade": 1,
+        "added": 1,
+        "removed": 1,
+        "unchanged": 1,
+    }
+
+
+def test_large() -> None:
+    old = [f"package-{i}=={i % 7}.{i % 11}.{i % 13}" for i in range(20_000)]
+    new = [f"package-{i}=={i % 7}.{i % 11}.{(i + 1) % 13}" for i in range(20_000)]
+    summary = audit(old, new)
+    assert summary.new == 20_000
+    assert summary.counts["patch"] + summary.counts["downgrade"] == 20_000
+    assert summary.downgrades == sum(1 for i in range(20_000) if (i + 1) % 13 == 0)
+
+
+def test_cli(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    (tmp_path / "old.txt").write_text(REQUIREMENTS)
+    (tmp_path / "uv.lock").write_text(LOCKFILE.replace('"2.31.0"', '"2.32.0"'))
+    assert main(["audit", str(tmp_path / "old.txt"), str(tmp_path / "uv.lock")]) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        "requests: 2.31.0 -> 2.32.0 (minor)",
+        "black: removed 24.1.0",
+        "3 -> 2 pins: 1 minor, 1 removed, 1 unchanged",
+    ]
+    arguments = ["audit", "--json", str(tmp_path / "uv.lock"), str(tmp_path / "old.txt")]
+    assert main(arguments) == 1
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert lines[0] == {"name": "requests", "old": "2.32.0", "new": "2.31.0", "change": "downgrade"}
+    assert lines[-1]["counts"]["added"] == 1
@@ -0,0 +1,19 @@
+#!/usr/bin/env python
+
+import pytest
+
+from hatch_semver.names import normalize_name
+
+
+@pytest.mark.parametrize(
+    "name, normalized",
+    (
+        ("foo", "foo"),
+        ("Foo_Bar", "foo-bar"),
+        ("foo.bar", "foo-bar"),
+        ("Foo__Bar.-baz", "foo-bar-baz"),
+        ("foo-_-bar", "foo-bar"),
+    ),
+)
+def test_normalize_name(name: str, normalized: str) -> None:
+    assert normalize_name(name) == normalized
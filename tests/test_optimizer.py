@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+
+
+import random
+from itertools import product
+
+import pytest
+from semver import Version
+
+from hatch_semver.bump_instruction import BumpInstruction as BI
+from hatch_semver.bump_plan import BumpPlan
+from hatch_semver.optimizer import optimize
+from hatch_semver.semver_scheme import SemverScheme
+
+vocabulary = (
+    "major",
+    "minor",
+    "patch",
+    "rc",
+    "alpha",
+    "build",
+    "dev",
+    "build=data",
+    "release",
+    "1.2.3",
+    "1.2.3+meta",
+    "2.0.0-rc.1",
+    "a",
+)
+
+originals = (
+    "1.2.3",
+    "1.2.3-rc.1",
+    "1.2.3+build.9",
+    "0.9.0-beta.2+devdrop0",
+    "2.0.0+arst",
+)
+
+
+def execute(instructions: str, original: str, optimized: bool) -> tuple[str, bool]:
+    plan = BumpPlan.compile(instructions, optimize=optimized)
+    try:
+        version, last_bump_was_build = plan.execute(Version.parse(original))
+    except ValueError as e:
+        return f"ValueError: {e}", False
+    return str(version), last_bump_was_build
+
+
+def assert_same_result(instructions: str) -> None:
+    for original in originals:
+        assert execute(instructions, original, optimized=True) == execute(
+            instructions, original, optimized=False
+        ), f"{instructions} applied on {original}"
+
+
+@pytest.mark.parametrize("length", (1, 2, 3))
+def test_differential_exhaustive(length: int) -> None:
+    for chain in product(vocabulary, repeat=length):
+        assert_same_result(",".join(chain))
+
+
+def test_differential_random() -> None:
+    rng = random.Random(1234)
+    for _ in range(300):
+        chain = rng.choices(vocabulary, k=rng.randint(4, 12))
+        assert_same_result(",".join(chain))
+
+
+@pytest.mark.parametrize(
+    "instructions, optimized",
+    (
+        ("build,build,build,minor", ("build", "minor")),
+        ("release,release", ("release",)),
+        ("patch,1.2.3,minor", ("1.2.3", "minor")),
+        ("patch,1.2.3", ("patch", "1.2.3")),
+        ("major,a,1.2.3,minor", ("major", "a", "1.2.3", "minor")),
+        ("auto,1.2.3-rc.1,minor", ("auto", "1.2.3-rc.1", "minor")),
+        ("build={sha7},1.2.3,minor", ("build", "1.2.3", "minor")),
+        ("minor,release,release,release,build,dev", ("minor", "release", "build")),
+    ),
+)
+def test_optimize(instructions: str, optimized: tuple[str, ...]) -> None:
+    steps = optimize(tuple(BI(instruction) for instruction in instructions.split(",")))
+    assert tuple(step.version_part for step in steps) == tuple(
+        BI(instruction).version_part for instruction in optimized
+    )
+
+
+@pytest.mark.parametrize("engine", SemverScheme.ENGINES)
+def test_auto_is_kept(tmp_path, engine: str) -> None:
+    scheme = SemverScheme(str(tmp_path), {"engine": engine})
+    with pytest.raises(ValueError, match="No news fragment"):
+        scheme.update("auto,1.2.3-rc.1,minor", "1.0.0", {})
+
+
+def test_merged_builds() -> None:
+    original = tuple(BI(instruction) for instruction in ("dev", "build", "build=other"))
+    steps = optimize(original)
+    assert len(steps) == 1
+    assert steps[0].repeat == 3
+    assert steps[0].token == "dev"
+    assert all(step.repeat == 1 for step in original)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from hatch_semver.parse_cache import VersionCache
+
+
+def test_hits_and_sharing() -> None:
+    cache = VersionCache()
+    version = cache.parse("1.2.3-rc.1+b")
+    assert cache.parse("1.2.3-rc.1+b") is version
+    info = cache.info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+    assert info.hit_rate == 0.5
+    assert info.memory > 0
+
+
+def test_eviction() -> None:
+    cache = VersionCache(maxsize=2)
+    for string in ("1.0.0", "2.0.0", "1.0.0", "3.0.0"):
+        cache.parse(string)
+    info = cache.info()
+    assert (info.evictions, info.currsize) == (1, 2)
+    cache.parse("1.0.0")
+    assert cache.info().hits == 2
+
+
+def test_resize() -> None:
+    cache = VersionCache(maxsize=3)
+    for string in ("1.0.0", "2.0.0", "3.0.0"):
+        cache.parse(string)
+    memory = cache.info().memory
+    cache.resize(1)
+    info = cache.info()
+    assert (info.maxsize, info.currsize, info.evictions) == (1, 1, 2)
+    assert 0 < info.memory < memory
+    with pytest.raises(ValueError):
+        cache.resize(0)
+
+
+def test_invalid_not_cached() -> None:
+    cache = VersionCache()
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            cache.parse("1.2")
+    assert cache.info().currsize == 0
+
+
+def test_clear() -> None:
+    cache = VersionCache()
+    cache.parse("1.0.0")
+    cache.clear()
+    assert cache.info() == VersionCache().info()
+
+
+def test_threads() -> None:
+    cache = VersionCache(maxsize=50)
+    strings = [f"1.{i % 100}.0" for i in range(20000)]
+    with ThreadPoolExecutor(8) as executor:
+        versions = list(executor.map(cache.parse, strings, chunksize=100))
+    assert [str(version) for version in versions] == strings
+    info = cache.info()
+    assert info.hits + info.misses == len(strings)
+    assert info.currsize == 50
+    assert info.misses - info.evictions >= info.currsize
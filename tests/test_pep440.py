@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+
+import random
+
+import pytest
+from packaging.version import Version as Pep440Version
+from semver import Version
+
+from hatch_semver.pep440 import from_pep440, to_pep440
+
+
+@pytest.mark.parametrize(
+    "semver, pep440",
+    (
+        ("1.4.0", "1.4.0"),
+        ("1.4.0-alpha.1", "1.4.0a1"),
+        ("1.4.0-a1", "1.4.0a1"),
+        ("1.4.0-beta.2", "1.4.0b2"),
+        ("1.4.0-BETA", "1.4.0b0"),
+        ("1.4.0-rc.2+build.7", "1.4.0rc2+build.7"),
+        ("1.4.0-c.3", "1.4.0rc3"),
+        ("1.4.0-pre.3", "1.4.0rc3"),
+        ("1.4.0-preview3", "1.4.0rc3"),
+        ("1.4.0-dev.5", "1.4.0.dev5"),
+        ("1.4.0-dev", "1.4.0.dev0"),
+        ("1.4.0-rc.3.dev.5", "1.4.0rc3.dev5"),
+        ("1.4.0+Build-007", "1.4.0+build.7"),
+    ),
+)
+def test_to_pep440(semver: str, pep440: str) -> None:
+    assert to_pep440(semver) == pep440
+    # the result is already normalized
+    assert str(Pep440Version(pep440)) == pep440
+
+
+@pytest.mark.parametrize("version", ("1.4", "1.4.0-nightly.3", "1.4.0-alpha.1.2", "1.4.0-rc.x"))
+def test_to_pep440_invalid(version: str) -> None:
+    with pytest.raises(ValueError):
+        to_pep440(version)
+
+
+@pytest.mark.parametrize(
+    "pep440, semver",
+    (
+        ("1.4.0", "1.4.0"),
+        ("v1.4", "1.4.0"),
+        ("2", "2.0.0"),
+        ("1.4.0a1", "1.4.0-alpha.1"),
+        ("1.4.0-BETA-2", "1.4.0-beta.2"),
+        ("1.4RC3", "1.4.0-rc.3"),
+        ("1.4.0.dev5", "1.4.0-dev.5"),
+        ("1.4.0rc3.dev5", "1.4.0-rc.3.dev.5"),
+        ("1.4.0+Build_7", "1.4.0+build.7"),
+    ),
+)
+def test_from_pep440(pep440: str, semver: str) -> None:
+    assert from_pep440(pep440) == semver
+
+
+@pytest.mark.parametrize("version", ("1!1.0", "1.0.post1", "1.2.3.4", "latest"))
+def test_from_pep440_invalid(version: str) -> None:
+    with pytest.raises(ValueError):
+        from_pep440(version)
+
+
+@pytest.mark.parametrize(
+    "lower, higher",
+    (("1.4.0-rc.3", "1.4.0-rc.3.dev.5"), ("1.4.0-alpha.1", "1.4.0-dev.5")),
+)
+def test_dev_order(lower: str, higher: str) -> None:
+    # documented: developmental releases sort differently in PEP 440
+    assert Version.parse(lower) < Version.parse(higher)
+    assert Pep440Version(to_pep440(lower)) > Pep440Version(to_pep440(higher))
+
+
+def test_batches() -> None:
+    assert to_pep440(["1.0.0-rc.1", "1.0.0"]) == ["1.0.0rc1", "1.0.0"]
+    assert to_pep440(iter(["1.0.0-nightly", "1.0.0"]), strict=False) == [None, "1.0.0"]
+    with pytest.raises(ValueError):
+        to_pep440(["1.0.0-nightly", "1.0.0"])
+    assert from_pep440(("1.0rc1", "1.0.post1"), strict=False) == ["1.0.0-rc.1", None]
+
+
+def test_round_trip() -> None:
+    rng = random.Random(19)
+    for _ in range(2000):
+        version = ".".join(str(rng.randrange(20)) for _ in range(3))
+        if rng.random() < 0.6:
+            version += "-" + rng.choice(("alpha", "beta", "rc")) + f".{rng.randrange(20)}"
+            if rng.random() < 0.3:
+                version += f".dev.{rng.randrange(5)}"
+        elif rng.random() < 0.2:
+            version += f"-dev.{rng.randrange(5)}"
+        if rng.random() < 0.3:
+            version += f"+build.{rng.randrange(100)}"
+        pep440 = to_pep440(version)
+        assert from_pep440(pep440) == version
+        assert to_pep440(from_pep440(pep440)) == pep440
+        # other spellings are parsed by packaging instead of the fast path
+        assert from_pep440("v" + pep440.upper()) == version
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+
+import pytest
+from semver import Version
+
+from hatch_semver.errors import ValidationError
+from hatch_semver.policy import compile_policy
+from hatch_semver.semver_scheme import SemverScheme
+
+ALL_RULES = {
+    "forbid-skipping": True,
+    "prerelease-tokens": ["alpha", "beta", "rc"],
+    "no-major-on-zero": True,
+    "release-before-major": True,
+}
+
+
+@pytest.mark.parametrize(
+    "old, new, reason",
+    (
+        ("1.2.3", "1.2.4", None),
+        ("1.2.3", "1.3.0", None),
+        ("1.2.3", "2.0.0", None),
+        ("1.2.3", "1.2.5", "skips versions"),
+        ("1.2.3", "1.4.0", "skips versions"),
+        ("1.2.3", "1.3.1", "skips versions"),
+        ("1.2.3", "3.0.0", "skips versions"),
+        ("1.2.3-rc.1", "1.2.3-rc.2", None),
+        ("1.2.3-rc.1", "1.2.3-rc.3", "skips versions"),
+        ("1.2.3-alpha.4", "1.2.3-beta.1", None),
+        ("1.2.3-rc.1", "1.2.3", None),
+        ("1.2.3", "1.2.4-rc1", None),
+        ("1.2.3", "1.2.4-nightly.1", "token `nightly`"),
+        ("1.2.3", "1.2.4-1", "token ``"),
+        ("0.9.0", "1.0.0", "0.x"),
+        ("1.2.3-rc.1", "2.0.0", "has to be released"),
+        ("1.2.3", "1.2.3+build.1", None),
+    ),
+)
+def test_rules(old: str, new: str, reason: str) -> None:
+    policy = compile_policy({"policy": ALL_RULES})
+    violations = policy.violations(Version.parse(new), Version.parse(old))
+    if reason is None:
+        assert violations == []
+    else:
+        assert len(violations) == 1 and reason in violations[0]
+
+
+def test_decision_table() -> None:
+    policy = compile_policy({"policy": {"no-major-on-zero": True, "forbid-skipping": False}})
+    assert policy
+    assert len(policy.table["major"]) == 1
+    assert policy.table["minor"] == policy.table["build"] == ()
+    assert not compile_policy({})
+    # equal tables are compiled once
+    assert compile_policy({"policy": dict(ALL_RULES)}) is compile_policy({"policy": ALL_RULES})
+
+
+@pytest.mark.parametrize(
+    "table",
+    ({"forbid-skiping": True}, {"forbid-skipping": "yes"}, {"prerelease-tokens": "rc"}),
+)
+def test_invalid_policy(table: dict) -> None:
+    with pytest.raises(ValueError):
+        compile_policy({"policy": table})
+
+
+@pytest.mark.parametrize("policy", (True, "strict", ["forbid-skipping"]))
+def test_policy_not_a_table(policy) -> None:
+    with pytest.raises(ValueError, match="`policy` must be a table"):
+        SemverScheme(".", {"policy": policy}).update("minor", "1.0.0", {})
+
+
+def test_scheme() -> None:
+    scheme = SemverScheme(".", {"policy": ALL_RULES})
+    assert scheme.update("minor", "0.4.2", {}) == "0.5.0"
+    assert scheme.update("major", "1.4.2", {}) == "2.0.0"
+    with pytest.raises(ValidationError, match="0.x"):
+        scheme.update("major", "0.4.2", {})
+    with pytest.raises(ValidationError, match="token `dev`"):
+        scheme.update("patch,prerelease=dev", "0.4.2", {})
+    with pytest.raises(ValidationError, match="skips versions"):
+        scheme.update("1.6.0", "1.4.2", {})
+    # the policy is part of the validation
+    unvalidated = SemverScheme(".", {"policy": ALL_RULES, "validate-bump": False})
+    assert unvalidated.update("major", "0.4.2", {}) == "1.0.0"
+    assert scheme.settings is scheme.settings
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+
+
+import random
+from bisect import bisect_left
+from functools import cmp_to_key
+from itertools import product
+
+import pytest
+from semver import Version
+
+from hatch_semver.precedence import VersionKey, bump_level, precedence_key
+
+
+@pytest.mark.parametrize(
+    "old, new, level",
+    (
+        ("1.0.0", "2.0.0", "major"),
+        ("2.0.0", "1.9.9", "major"),
+        ("1.0.0", "1.1.0", "minor"),
+        ("1.0.0", "1.0.1-rc.1", "patch"),
+        ("1.0.1-rc.1", "1.0.1", "prerelease"),
+        ("1.0.1-rc.1", "1.0.1-rc.2+b", "prerelease"),
+        ("1.0.1", "1.0.1+b.2", "build"),
+        ("1.0.1+b", "1.0.1+b", None),
+    ),
+)
+def test_bump_level(old: str, new: str, level: str) -> None:
+    assert bump_level(Version.parse(old), Version.parse(new)) == level
+
+
+def test_precedence_key_matches_semver() -> None:
+    versions = (
+        "0.0.0",
+        "1.0.0-0",
+        "1.0.0-1",
+        "1.0.0-10",
+        "1.0.0-a",
+        "1.0.0-alpha",
+        "1.0.0-alpha.1",
+        "1.0.0-alpha.beta",
+        "1.0.0-beta.2",
+        "1.0.0-beta.11",
+        "1.0.0-rc.1",
+        "1.0.0-rc.1.0",
+        "1.0.0-rc1",
+        "1.0.0",
+        "1.0.0+build",
+        "1.0.1-x-y",
+        "1.10.0",
+        "2.0.0",
+    )
+    for a, b in product(versions, repeat=2):
+        expected = Version.parse(a).compare(b)
+        ka, kb = precedence_key(a), precedence_key(b)
+        assert (ka > kb) - (ka < kb) == expected, (a, b)
+
+
+def test_precedence_key_invalid() -> None:
+    with pytest.raises(ValueError):
+        precedence_key("1.2")
+
+
+def random_version(rng: random.Random) -> str:
+    def number() -> str:
+        return str(rng.choice((0, 1, 2, 9, 10, 255, 256, 2**64, rng.randrange(10**6))))
+
+    def identifier() -> str:
+        if rng.random() < 0.5:
+            return number()
+        text = "".join(rng.choice("0aAzZ-9") for _ in range(rng.randint(1, 4)))
+        # numeric identifiers must not have leading zeros
+        return text if not text.isdigit() else text + "x"
+
+    version = ".".join(rng.choice((number(), str(rng.randrange(3)))) for _ in range(3))
+    if rng.random() < 0.7:
+        version += "-" + ".".join(identifier() for _ in range(rng.randint(1, 4)))
+    if rng.random() < 0.3:
+        version += "+" + ".".join(identifier() for _ in range(rng.randint(1, 2)))
+    return version
+
+
+def test_version_key_properties() -> None:
+    rng = random.Random(17)
+    strings = [random_version(rng) for _ in range(600)]
+    versions = [Version.parse(string) for string in strings]
+    keys = [precedence_key(string) for string in strings]
+    encoded = [key.to_bytes() for key in keys]
+    for _ in range(20_000):
+        i, j = rng.randrange(len(strings)), rng.randrange(len(strings))
+        expected = versions[i].compare(versions[j])
+        assert (keys[i] > keys[j]) - (keys[i] < keys[j]) == expected, (strings[i], strings[j])
+        assert (encoded[i] > encoded[j]) - (encoded[i] < encoded[j]) == expected
+        assert (keys[i] == keys[j]) == (encoded[i] == encoded[j])
+    # a Version and its string have the same key
+    assert [precedence_key(version) for version in versions] == keys
+    assert all(isinstance(key, VersionKey) for key in keys)
+    by_semver = sorted(versions, key=cmp_to_key(Version.compare))
+    by_key = sorted(versions, key=precedence_key)
+    assert [precedence_key(v) for v in by_key] == [precedence_key(v) for v in by_semver]
+    assert sorted(encoded) == [precedence_key(v).to_bytes() for v in by_semver]
+    assert precedence_key(max(versions, key=precedence_key)) == precedence_key(max(versions))
+    sorted_keys = sorted(keys)
+    for version in versions[:50]:
+        position = bisect_left(sorted_keys, precedence_key(version))
+        assert sum(other < version for other in versions) == position
+
+
+def test_version_key_fields() -> None:
+    key = precedence_key("1.2.3-rc.4+build")
+    assert (key.major, key.minor, key.patch) == (1, 2, 3)
+    assert key.prerelease == (0, ((1, 0, "rc"), (0, 4, "")))
+    assert precedence_key("1.2.3").prerelease == (1,)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+
+
+import random
+
+import pytest
+from semver import Version
+
+from hatch_semver.bump_plan import BumpPlan
+from hatch_semver.ranges import Range, compile_range, satisfies
+
+
+@pytest.mark.parametrize(
+    "expression, version, expected",
+    (
+        ("^1.2", "1.2.0", True),
+        ("^1.2", "1.9.9", True),
+        ("^1.2", "2.0.0", False),
+        ("^1.2", "2.0.0-rc.1", False),
+        ("^0.2.3", "0.2.9", True),
+        ("^0.2.3", "0.3.0", False),
+        ("^0.0.3", "0.0.3", True),
+        ("^0.0.3", "0.0.4", False),
+        ("^0.0", "0.0.9", True),
+        ("^0.0", "0.1.0", False),
+        ("~1.4.0", "1.4.7", True),
+        ("~1.4.0", "1.5.0", False),
+        ("~1", "1.9.0", True),
+        ("~1", "2.0.0", False),
+        (">=2.0.0-rc.1 <3", "2.0.0-rc.2", True),
+        (">=2.0.0-rc.1 <3", "2.0.0-rc.10", True),
+        (">=2.0.0-rc.1 <3", "2.0.0-beta.5", False),
+        (">=2.0.0-rc.1 <3", "2.0.0", True),
+        (">=2.0.0-rc.1 <3", "2.1.0-rc.1", False),
+        (">=2.0.0-rc.1 <3", "3.0.0-rc.1", False),
+        (">= 1.2.3", "1.2.3", True),
+        (">1.2.3", "1.2.3+build", False),
+        (">1", "2.0.0", True),
+        (">1", "1.9.0", False),
+        ("<1.2", "1.1.9", True),
+        ("<1.2", "1.2.0", False),
+        ("<=1.2", "1.2.9", True),
+        ("<=1.2", "1.3.0", False),
+        ("1.2.3 - 2.3", "2.3.9", True),
+        ("1.2.3 - 2.3", "2.4.0", False),
+        ("1.2.3 - 2.3", "1.2.2", False),
+        ("1.x", "1.5.0", True),
+        ("1.x", "2.0.0", False),
+        ("*", "0.0.1", True),
+        ("", "1.0.0", True),
+        ("*", "1.0.0-rc.1", False),
+        ("=1.2.3", "1.2.3+b", True),
+        ("<1.2 || >=3", "1.1.9", True),
+        ("<1.2 || >=3", "2.0.0", False),
+        ("<1.2 || >=3", "3.1.0", True),
+        ("<*", "1.0.0", False),
+    ),
+)
+def test_match(expression: str, version: str, expected: bool) -> None:
+    assert satisfies(version, expression) is expected
+    assert Range.compile(expression).match(Version.parse(version)) is expected
+
+
+@pytest.mark.parametrize(
+    "expression, version, expected",
+    (
+        (">=1.2", "1.2.0-rc.1", True),
+        ("^1.2.0", "2.0.0-rc.1", False),
+        ("^1.2.0", "1.3.0-rc.1", True),
+        ("*", "1.0.0-rc.1", True),
+    ),
+)
+def test_include_prereleases(expression: str, version: str, expected: bool) -> None:
+    assert satisfies(version, expression, include_prereleases=True) is expected
+
+
+@pytest.mark.parametrize("expression", ("1.2.3.4", ">", "^1.2 foo", "1.2.3 -", "~v"))
+def test_malformed(expression: str) -> None:
+    with pytest.raises(ValueError):
+        Range.compile(expression)
+
+
+def test_list_and_filter() -> None:
+    versions = ["1.0.0", "1.2.0", "1.3.0-rc.1", "2.0.0"]
+    assert satisfies(versions, "^1.1") == [False, True, False, False]
+    assert compile_range("^1.0 || 2").filter(versions) == ["1.0.0", "1.2.0", "2.0.0"]
+    assert compile_range("^1.0") is compile_range("^1.0")
+
+
+def random_version(rng: random.Random) -> str:
+    version = ".".join(str(rng.randint(0, 3)) for _ in range(3))
+    if rng.random() < 0.4:
+        version += "-" + rng.choice(
+            ("0", "rc.1", "rc.2", "rc.10", "beta.2", "alpha", "rc1", "rc.1.x")
+        )
+    if rng.random() < 0.2:
+        version += "+b.7"
+    return version
+
+
+@pytest.mark.parametrize("include_prereleases", (False, True))
+def test_batch(include_prereleases: bool) -> None:
+    columnar = pytest.importorskip("hatch_semver.columnar")
+    rng = random.Random(16)
+    versions = [random_version(rng) for _ in range(3000)] + ["1.2.3-rc.007x", "2.0.0+b.007"]
+    batch = columnar.VersionBatch.from_strings(versions)
+    expressions = (
+        "^1.2",
+        "~1.1.0",
+        ">=2.0.0-rc.1 <3",
+        "1.2.3 - 2.3",
+        "<1 || >=3.0.0-beta.2",
+        "1.x",
+        ">1.1.1-rc.1 <=2.2.2-rc.10",
+        "=1.2.3-rc1",
+        "*",
+    )
+    for expression in expressions:
+        compiled = Range.compile(expression, include_prereleases)
+        assert compiled.match_batch(batch).tolist() == compiled.match_many(versions), expression
+
+
+def test_batch_scalar_rows() -> None:
+    columnar = pytest.importorskip("hatch_semver.columnar")
+    versions = ["1.2.3-rc01", "0.0.5", "0.0.1-rc.1", "0.1.0-x01", "1.2.3+b.007"]
+    only_scalar = columnar.VersionBatch.from_strings(versions[:1])
+    assert Range.compile("0.0.x").match_batch(only_scalar).tolist() == [False]
+    # bumping may give the placeholder columns of scalar rows any identifier
+    bumped = columnar.apply(
+        BumpPlan.compile("0.0.1-rc.1"), columnar.VersionBatch.from_strings(versions)
+    )
+    for expression in ("0.0.x", "<=0.0.1-rc.1", ">=0.0.1-rc.0", "*"):
+        compiled = Range.compile(expression, include_prereleases=True)
+        batch = columnar.VersionBatch.from_strings(versions)
+        assert compiled.match_batch(batch).tolist() == compiled.match_many(versions), expression
+        strings = bumped.to_strings()
+        assert compiled.match_batch(bumped.versions).tolist() == compiled.match_many(strings)
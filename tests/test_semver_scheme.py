@@ -8,6 +8,7 @@ import pytest
 from _pytest.python_api import RaisesContext
 from hatch.utils.fs import Path
 from pytest import raises
+from semver import Version
 
 from hatch_semver.bump_instruction import BumpInstruction as BI
 from hatch_semver.errors import ValidationError
@@ -158,14 +159,72 @@ invalid = raises(ValueError, match="not valid SemVer")
         (sep(("major", " minor")), "0.4.0", "1.1.0", {}, invalid),
     ),
 )
+@pytest.mark.parametrize("engine", SemverScheme.ENGINES)
 def test_semver_scheme(
     isolation: Generator[Path, None, None],
+    engine: str,
     instructions: Optional[str],
     original: str,
     expected: str,
     settings: Mapping[str, bool],
     exp_error: Union[no_error, RaisesContext],
 ) -> None:
-    scheme = SemverScheme(str(isolation), settings)
+    scheme = SemverScheme(str(isolation), {**settings, "engine": engine})
     with exp_error:
         assert scheme.update(instructions, original, {}) == expected
+
+
+def test_unknown_engine(isolation: Generator[Path, None, None]) -> None:
+    scheme = SemverScheme(str(isolation), {"engine": "turbo"})
+    with raises(ValueError, match="Unknown engine"):
+        scheme.update("patch", "1.0.0", {})
+
+
+@pytest.mark.parametrize("engine", SemverScheme.ENGINES)
+def test_update_detailed(isolation: Generator[Path, None, None], engine: str) -> None:
+    scheme = SemverScheme(str(isolation), {"engine": engine})
+    result = scheme.update_detailed("minor,rc,rc,build=ci", "1.2.3")
+    assert result.version == Version(1, 3, 0, "rc.2", "ci.1")
+    assert result.original == Version(1, 2, 3)
+    assert [(step.instruction.version_part, str(step.version)) for step in result.steps] == [
+        ("minor", "1.3.0"),
+        ("prerelease", "1.3.0-rc.1"),
+        ("prerelease", "1.3.0-rc.2"),
+        ("build", "1.3.0-rc.2+ci.1"),
+    ]
+    assert all(type(step.version) is Version for step in result.steps)
+    assert (result.last_bump_was_build, result.validated, result.error) == (True, True, None)
+    assert scheme.update_detailed("minor", "1.2.3", record_steps=False).steps == ()
+    result = scheme.update_detailed("", "1.2.3")
+    assert (result.version, result.steps, result.validated) == (Version(1, 2, 3), (), False)
+
+
+def test_update_detailed_invalid(isolation: Generator[Path, None, None]) -> None:
+    scheme = SemverScheme(str(isolation), {})
+    with not_higher:
+        scheme.update_detailed("1.0.0", "1.2.3")
+    result = scheme.update_detailed("1.0.0", "1.2.3", raise_invalid=False)
+    assert result.version == Version(1, 0, 0)
+    assert isinstance(result.error, ValidationError)
+    result = SemverScheme(str(isolation), no_val).update_detailed("1.0.0", "1.2.3")
+    assert (result.validated, result.error) == (False, None)
+
+
+@pytest.mark.parametrize("engine", SemverScheme.ENGINES)
+def test_update_detailed_unoptimized(isolation: Generator[Path, None, None], engine: str) -> None:
+    scheme = SemverScheme(str(isolation), {"engine": engine})
+    instructions = ("patch", "minor", "2.0.0", "build", "build", "release", "release")
+    result = scheme.update_detailed(sep(instructions), "1.2.3")
+    assert len(result.steps) == len(instructions)
+    assert [step.instruction.version_part for step in result.steps] == list(instructions)
+    assert [str(step.version) for step in result.steps] == [
+        "1.2.4",
+        "1.3.0",
+        "2.0.0",
+        "2.0.0+build.1",
+        "2.0.0+build.2",
+        "2.0.0",
+        "2.0.0",
+    ]
+    assert result.version == Version(2, 0, 0)
+    assert str(result.version) == scheme.update(sep(instructions), "1.2.3", {})
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from semver import Version
+
+from hatch_semver import tracing
+from hatch_semver.errors import ValidationError
+from hatch_semver.semver_scheme import SemverScheme
+
+
+@pytest.fixture
+def events():
+    recorded = []
+    tracing.register(recorded.append)
+    yield recorded
+    tracing.unregister(recorded.append)
+
+
+@pytest.mark.parametrize("engine", SemverScheme.ENGINES)
+def test_callback(events, engine: str) -> None:
+    scheme = SemverScheme(".", {"engine": engine})
+    assert scheme.update("minor,rc,build=ci", "1.2.3", {}) == "1.3.0-rc.1+ci.1"
+    assert [event["event"] for event in events] == [
+        "parse",
+        "compile",
+        "step",
+        "step",
+        "step",
+        "validate",
+        "update",
+    ]
+    steps = [event for event in events if event["event"] == "step"]
+    assert [(step["part"], step["token"], step["version"]) for step in steps] == [
+        ("minor", None, "1.3.0"),
+        ("prerelease", None, "1.3.0-rc.1"),
+        ("build", "ci", "1.3.0-rc.1+ci.1"),
+    ]
+    update = events[-1]
+    assert update["version"] == "1.3.0-rc.1+ci.1"
+    assert update["engine"] == engine
+    assert update["versions"] == sum(event["versions"] for event in events[:-1])
+    assert update["versions"] > 0
+    assert all(event["duration_us"] >= 0 for event in events)
+
+
+def test_failed_validation(events) -> None:
+    init = Version.__init__
+    with pytest.raises(ValidationError):
+        SemverScheme(".", {}).update("1.0.0", "2.0.0", {})
+    assert Version.__init__ is init
+    assert [event["event"] for event in events[-2:]] == ["validate", "update"]
+    assert events[-2]["valid"] is False
+    assert events[-1]["error"]
+    assert events[-1]["version"] is None
+
+
+@pytest.mark.parametrize("engine", SemverScheme.ENGINES)
+def test_validation_outcome(events, engine: str) -> None:
+    scheme = SemverScheme(".", {"engine": engine})
+    scheme.update_detailed("1.0.0", "2.0.0", {}, raise_invalid=False)
+    scheme.update_detailed("patch", "1.2.3", {})
+    validations = [event for event in events if event["event"] == "validate"]
+    assert [event["valid"] for event in validations] == [False, True]
+
+
+def test_trace_file(tmp_path) -> None:
+    scheme = SemverScheme(str(tmp_path), {"trace": "trace.jsonl"})
+    scheme.update("patch", "1.2.3", {})
+    scheme.update("major", "1.2.3", {})
+    lines = (tmp_path / "trace.jsonl").read_text(encoding="utf-8").splitlines()
+    events = [json.loads(line) for line in lines]
+    assert [event["version"] for event in events if event["event"] == "update"] == [
+        "1.2.4",
+        "2.0.0",
+    ]
+
+
+def test_environment_variable(tmp_path) -> None:
+    path = tmp_path / "trace.jsonl"
+    code = "from hatch_semver.semver_scheme import SemverScheme; SemverScheme('.', {}).update('patch', '1.2.3', {})"
+    environment = {**os.environ, tracing.ENVIRONMENT_VARIABLE: str(path)}
+    subprocess.run([sys.executable, "-c", code], env=environment, check=True)
+    assert path.exists()
+
+
+def test_off(monkeypatch) -> None:
+    monkeypatch.setattr(tracing, "environment_path", None)
+    assert tracing.tracer_for({}, ".") is None
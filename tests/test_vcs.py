@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Generator
+
+import pytest
+
+from hatch_semver import vcs
+from hatch_semver.semver_scheme import SemverScheme
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def git(root: Path, *args: str) -> str:
+    identity = ("-c", "user.name=Foo Bar", "-c", "user.email=foo@bar.baz")
+    completed = subprocess.run(
+        ("git", *identity, *args), cwd=root, check=True, capture_output=True, text=True
+    )
+    return completed.stdout.strip()
+
+
+@pytest.fixture
+def repository(tmp_path: Path) -> Generator[Path, None, None]:
+    git(tmp_path, "init", "--initial-branch=feature/x")
+    (tmp_path / "src").mkdir()
+    for name in ("a.txt", "src/b.txt", "src/c.txt"):
+        (tmp_path / name).write_text(name)
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-m", "init")
+    vcs.read_vcs_info.cache_clear()
+    yield tmp_path
+    vcs.read_vcs_info.cache_clear()
+
+
+def test_head(repository: Path) -> None:
+    info = vcs.read_vcs_info(str(repository / "src"))
+    assert info.sha == git(repository, "rev-parse", "HEAD")
+    assert info.branch == "feature/x"
+    assert not info.dirty
+    assert info.placeholders()["branch"] == "feature-x"
+
+
+def test_packed_and_detached(repository: Path) -> None:
+    git(repository, "pack-refs", "--all")
+    sha = git(repository, "rev-parse", "HEAD")
+    assert vcs.read_vcs_info(str(repository)).sha == sha
+    git(repository, "checkout", "--detach")
+    vcs.read_vcs_info.cache_clear()
+    assert vcs.read_vcs_info(str(repository)).branch == "detached"
+
+
+@pytest.mark.parametrize("index_version", ("2", "3", "4"))
+def test_index(repository: Path, index_version: str) -> None:
+    git(repository, "update-index", "--index-version", index_version)
+    names = [entry[0] for entry in vcs.read_index(str(repository / ".git" / "index"))]
+    assert names == ["a.txt", "src/b.txt", "src/c.txt"]
+    assert not vcs.is_dirty(str(repository / ".git"), str(repository))
+
+
+@pytest.mark.parametrize(
+    "change",
+    (
+        lambda root: (root / "src" / "c.txt").write_text("changed content"),
+        lambda root: (root / "a.txt").unlink(),
+        lambda root: os.utime(root / "src" / "b.txt", ns=(0, 0)),
+    ),
+)
+def test_dirty(repository: Path, change) -> None:
+    change(repository)
+    assert vcs.is_dirty(str(repository / ".git"), str(repository))
+
+
+def test_untracked_files_are_clean(repository: Path) -> None:
+    (repository / "new.txt").write_text("untracked")
+    assert not vcs.read_vcs_info(str(repository)).dirty
+
+
+def test_render(repository: Path) -> None:
+    sha = git(repository, "rev-parse", "HEAD")
+    assert vcs.render("{branch}.{sha7}{dirty}", str(repository)) == f"feature-x.{sha[:7]}"
+    (repository / "a.txt").write_text("changed content")
+    vcs.read_vcs_info.cache_clear()
+    assert vcs.render("g{sha}{dirty}", str(repository)) == f"g{sha}.dirty"
+    with pytest.raises(ValueError, match="Unknown placeholder 'distance'"):
+        vcs.render("dev.{distance}", str(repository))
+
+
+def test_not_a_repository(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="need a git repository"):
+        vcs.render("{sha}", str(tmp_path))
+
+
+@pytest.mark.parametrize("engine", SemverScheme.ENGINES)
+def test_build_template(repository: Path, engine: str) -> None:
+    sha7 = git(repository, "rev-parse", "--short=7", "HEAD")
+    scheme = SemverScheme(str(repository), {"engine": engine})
+    assert scheme.update("build={sha7}", "1.2.3", {}) == f"1.2.3+{sha7}.1"
+    assert scheme.update("patch,build=g{sha7}", "1.2.3", {}) == f"1.2.4+g{sha7}.1"
+    assert scheme.update("build", "1.2.3", {}) == "1.2.3+build.1"
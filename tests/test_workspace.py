@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+
+
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from hatch_semver.cli import main
+from hatch_semver.workspace import bump_project, bump_workspace, find_projects
+
+
+def make_project(
+    root: Path, name: str, version: str, scheme: str = "semver", extra: str = ""
+) -> Path:
+    project = root / name
+    (project / "src" / name).mkdir(parents=True)
+    (project / "src" / name / "__about__.py").write_text(f'__version__ = "{version}"\n')
+    (project / "pyproject.toml").write_text(
+        "\n".join(
+            (
+                "[project]",
+                f'name = "{name}"',
+                "[tool.hatch.version]",
+                f'path = "src/{name}/__about__.py"',
+                f'scheme = "{scheme}"',
+                extra,
+            )
+        )
+    )
+    return project
+
+
+def read_version(project: Path) -> str:
+    name = project.name
+    return (project / "src" / name / "__about__.py").read_text().split('"')[1]
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> Path:
+    make_project(tmp_path, "alpha", "1.2.3")
+    make_project(tmp_path, "beta", "0.4.0-rc.1")
+    make_project(tmp_path, "gamma", "2.0.0", scheme="standard")
+    make_project(tmp_path / "nested", "delta", "3.1.4")
+    make_project(tmp_path / ".hidden", "epsilon", "1.0.0")
+    make_project(tmp_path, "zeta", "1.0.0", extra="validate-bump = false")
+    return tmp_path
+
+
+def test_find_projects(workspace: Path) -> None:
+    names = [Path(project).name for project in find_projects(str(workspace))]
+    assert names == ["alpha", "beta", "gamma", "delta", "zeta"]
+
+
+@pytest.mark.parametrize("jobs", (1, 2))
+def test_bump_workspace(workspace: Path, jobs: int) -> None:
+    results = {r.name: r for r in bump_workspace(str(workspace), "minor", jobs=jobs)}
+    assert (results["alpha"].old_version, results["alpha"].new_version) == ("1.2.3", "1.3.0")
+    assert results["beta"].new_version == "0.4.0"
+    assert results["gamma"].skipped
+    assert results["delta"].new_version == "3.2.0"
+    assert read_version(workspace / "alpha") == "1.3.0"
+    assert read_version(workspace / "gamma") == "2.0.0"
+
+
+def test_dry_run(workspace: Path) -> None:
+    results = bump_workspace(str(workspace), "major", jobs=1, dry_run=True)
+    assert {r.name: r.new_version for r in results}["alpha"] == "2.0.0"
+    assert read_version(workspace / "alpha") == "1.2.3"
+
+
+@pytest.mark.parametrize(
+    "instructions, error, expected_version",
+    (("1.0.0", "not higher", "1.2.3"), ("minor=4", "specifically", "1.2.3")),
+)
+def test_errors_are_reported(
+    workspace: Path, instructions: str, error: str, expected_version: Optional[str]
+) -> None:
+    result = bump_project(str(workspace / "alpha"), instructions)
+    assert error in result.error
+    assert result.new_version is None
+    assert read_version(workspace / "alpha") == expected_version
+
+
+def test_validate_bump_option(workspace: Path) -> None:
+    assert bump_project(str(workspace / "zeta"), "0.1.0").new_version == "0.1.0"
+
+
+def test_invalid_policy_is_reported(workspace: Path) -> None:
+    make_project(workspace, "eta", "1.0.0", extra="policy = true")
+    results = {r.name: r for r in bump_workspace(str(workspace), "minor", jobs=1)}
+    assert "`policy` must be a table" in results["eta"].error
+    assert results["alpha"].new_version == "1.3.0"
+
+
+def test_cli(workspace: Path, capsys: pytest.CaptureFixture) -> None:
+    assert main(["bump", "patch", "--root", str(workspace), "--dry-run", "-j", "1"]) == 0
+    out = capsys.readouterr().out
+    assert "alpha: 1.2.3 -> 1.2.4" in out
+    assert "dry run" in out
+    assert main(["bump", "0.0.1", "--root", str(workspace), "-j", "1"]) == 1